@@ -1,35 +1,336 @@
 # data/database.py
 from pathlib import Path
+from concurrent.futures import Future
+import atexit
+import os
+import queue
 import sqlite3
+import threading
+import time
 from logic.display_utils import is_mobile_device, find_current_monitor, get_monitor_info
 from kivy.core.window import Window
 
+
+class WriteBehindBuffer:
+    """
+    Отложенная запись настроек.
+
+    Записи по одному ключу (например, ('settings', 'color') или геометрия окна)
+    склеиваются: в базу попадает только последнее значение. Всё накопленное
+    записывается одной транзакцией через IDLE_DELAY секунд после последнего
+    изменения, либо сразу при flush()/закрытии базы.
+    """
+    IDLE_DELAY = 1.0
+
+    def __init__(self, service, idle_delay=None):
+        self.service = service
+        self.idle_delay = self.IDLE_DELAY if idle_delay is None else idle_delay
+        self._pending = {}  # ключ -> (sql, params)
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def put(self, key, sql, params):
+        """Запоминает запись по ключу и переносит сброс на IDLE_DELAY вперёд"""
+        with self._lock:
+            if key in self._pending:
+                self.service._count(coalesced=1)
+            self._pending[key] = (sql, tuple(params))
+            self.service._count(buffered=1)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.idle_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def get(self, key):
+        """Параметры ещё не записанного значения по ключу или None"""
+        with self._lock:
+            pending = self._pending.get(key)
+        return pending[1] if pending else None
+
+    def flush(self):
+        """
+        Записывает все накопленные значения одной транзакцией
+        Returns:
+            Future или None, если записывать нечего
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return None
+        # Одинаковые запросы объединяем в executemany
+        grouped = {}
+        for sql, params in pending.values():
+            grouped.setdefault(sql, []).append(params)
+        self.service._count(flushes=1)
+        return self.service.transaction([(sql, rows, True) for sql, rows in grouped.items()])
+
+
+class DatabaseService:
+    """
+    Одно соединение с SQLite на весь процесс.
+
+    - WAL и synchronous=NORMAL: коммит не ждёт fsync (fsync только при checkpoint),
+      чтение не блокируется записью
+    - кэш подготовленных выражений sqlite3 (cached_statements)
+    - все записи идут через одну очередь и выполняются потоком-писателем:
+      накопившиеся записи выполняются одной транзакцией с одним коммитом
+    - чтение дожидается записей, стоящих в очереди, поэтому сразу после
+      записи читаются уже новые данные
+    - настройки пишутся через WriteBehindBuffer (write_behind)
+    - счётчики запросов, коммитов и затраченного времени (stats)
+    """
+    CACHED_STATEMENTS = 256
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            cached_statements=self.CACHED_STATEMENTS
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.initialized = False
+        self._lock = threading.RLock()
+        self._queue = queue.Queue()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'queries': 0,
+            'query_time': 0.0,
+            'writes': 0,
+            'write_time': 0.0,
+            'commits': 0,
+            'commit_time': 0.0,
+            'read_waits': 0,
+            'buffered': 0,
+            'coalesced': 0,
+            'flushes': 0,
+        }
+        self.write_behind = WriteBehindBuffer(self)
+        self._writer = threading.Thread(target=self._writer_loop, name='sqlite-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def write(self, sql, params=(), many=False):
+        """
+        Ставит запись в очередь писателя
+        Returns:
+            Future: завершается после коммита (результат - rowcount)
+        """
+        return self.transaction([(sql, params, many)])
+
+    def transaction(self, statements):
+        """
+        Ставит в очередь несколько записей, которые выполняются в одной транзакции
+        Args:
+            statements: список (sql, params, many)
+        Returns:
+            Future: завершается после коммита (результат - rowcount последней записи)
+        """
+        future = Future()
+        if self._closed:
+            future.set_exception(sqlite3.ProgrammingError("database service is closed"))
+            return future
+        self._queue.put((statements, future))
+        return future
+
+    def flush(self):
+        """Дожидается выполнения всех записей из очереди"""
+        if threading.current_thread() is not self._writer:
+            self._queue.join()
+
+    def query(self, sql, params=(), with_columns=False):
+        """
+        Выполняет чтение и возвращает все строки
+        (или (колонки, строки) при with_columns=True)
+        """
+        if self._queue.unfinished_tasks:
+            self._count(read_waits=1)
+            self.flush()
+        started = time.perf_counter()
+        with self._lock:
+            cursor = self.connection.execute(sql, params)
+            rows = cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description or ()] if with_columns else []
+        self._count(queries=1, query_time=time.perf_counter() - started)
+        return (columns, rows) if with_columns else rows
+
+    def _writer_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # Забираем всё, что успело накопиться, чтобы закоммитить одной транзакцией
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            jobs = [job for job in batch if job is not None]
+            if jobs:
+                self._execute_batch(jobs)
+            for _ in batch:
+                self._queue.task_done()
+            if len(jobs) != len(batch):
+                return
+
+    def _execute_batch(self, jobs):
+        """
+        Выполняет задания одной транзакцией с одним коммитом.
+        Каждое задание - отдельная точка сохранения: при ошибке откатываются только
+        его записи. Если не удался коммит, откатывается вся транзакция и ошибку
+        получают все задания.
+        """
+        results = []
+        with self._lock:
+            started = time.perf_counter()
+            if not self.connection.in_transaction:
+                self.connection.execute('BEGIN')
+            for statements, future in jobs:
+                self.connection.execute('SAVEPOINT job')
+                try:
+                    rowcount = None
+                    for sql, params, many in statements:
+                        if many:
+                            rowcount = self.connection.executemany(sql, params).rowcount
+                        else:
+                            rowcount = self.connection.execute(sql, params).rowcount
+                    self.connection.execute('RELEASE job')
+                    results.append((future, rowcount, None))
+                except Exception as e:
+                    print(f"[DEBUG] database: ошибка записи: {e}")
+                    if self.connection.in_transaction:
+                        self.connection.execute('ROLLBACK TO job')
+                        self.connection.execute('RELEASE job')
+                    else:
+                        # SQLite уже откатил всю транзакцию - записи предыдущих заданий потеряны
+                        results = [(done, None, error or e) for done, _, error in results]
+                        self.connection.execute('BEGIN')
+                    results.append((future, None, e))
+            write_time = time.perf_counter() - started
+            started = time.perf_counter()
+            try:
+                self.connection.commit()
+            except Exception as e:
+                print(f"[DEBUG] database: ошибка коммита: {e}")
+                self.connection.rollback()
+                results = [(future, None, error or e) for future, _, error in results]
+            commit_time = time.perf_counter() - started
+        self._count(writes=len(jobs), write_time=write_time, commits=1, commit_time=commit_time)
+        for future, rowcount, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(rowcount)
+
+    def _count(self, **deltas):
+        """Увеличивает счётчики stats (их обновляют писатель, таймер и читающие потоки)"""
+        with self._stats_lock:
+            for key, delta in deltas.items():
+                self.stats[key] += delta
+
+    def close(self):
+        """Дописывает очередь и закрывает соединение (WAL переносится в основной файл)"""
+        if self._closed:
+            return
+        # Отложенные настройки должны попасть в базу до закрытия
+        self.write_behind.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join(timeout=10)
+        with self._lock:
+            self.connection.close()
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_database_service(db_path='data/settings.db'):
+    """Возвращает общий DatabaseService для файла базы (создаётся один раз)"""
+    key = os.path.abspath(db_path)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None or service._closed:
+            service = DatabaseService(db_path)
+            _services[key] = service
+        return service
+
+
 class SettingsDatabase:
     def __init__(self, db_path='data/settings.db'):
         # Создаем директорию data если её нет
         Path("data").mkdir(exist_ok=True)
         self.db_path = db_path
-        self.connection = sqlite3.connect(self.db_path)
-        self.cursor = self.connection.cursor()
-        self.init_database()
-    
+        self.service
+
+    @property
+    def service(self):
+        """
+        Общий DatabaseService для файла базы. Берётся из реестра при каждом обращении:
+        запись после закрытия базы (например, повторный on_stop) откроет её заново,
+        а не потеряется.
+        """
+        service = get_database_service(self.db_path)
+        if not service.initialized:
+            service.initialized = True
+            self.init_database()
+        return service
+
+    @property
+    def connection(self):
+        return self.service.connection
+
+    def execute(self, sql, params=()):
+        """Запись через очередь писателя (возвращает Future)"""
+        return self.service.write(sql, params)
+
+    def executemany(self, sql, rows):
+        """Пакетная запись через очередь писателя (возвращает Future)"""
+        return self.service.write(sql, rows, many=True)
+
+    def fetchone(self, sql, params=()):
+        rows = self.service.query(sql, params)
+        return rows[0] if rows else None
+
+    def fetchall(self, sql, params=(), with_columns=False):
+        return self.service.query(sql, params, with_columns=with_columns)
+
+    def write_behind(self, key, sql, params):
+        """Отложенная запись: повторные записи по key склеиваются (см. WriteBehindBuffer)"""
+        self.service.write_behind.put(key, sql, params)
+
+    def flush(self):
+        """Записывает отложенные настройки и дожидается записи всех изменений в базу"""
+        self.service.write_behind.flush()
+        self.service.flush()
+
+    def stats(self):
+        """Счётчики запросов, коммитов и времени общего соединения"""
+        service = self.service
+        with service._stats_lock:
+            return dict(service.stats)
+
     def init_database(self):
         """Инициализация базы данных"""
-        self.cursor.execute("""
+        self.execute("""
             CREATE TABLE IF NOT EXISTS settings (
                 key TEXT PRIMARY KEY,
                 value TEXT NOT NULL
             )
         """)
-        
+
         # Вставляем значение по умолчанию для цвета, если его нет
-        self.cursor.execute("""
-            INSERT OR IGNORE INTO settings (key, value) 
+        self.execute("""
+            INSERT OR IGNORE INTO settings (key, value)
             VALUES ('color', 'lime')
         """)
-        
+
         # Создаем таблицу для хранения параметров главного окна, если она не существует
-        self.cursor.execute('''
+        self.execute('''
             CREATE TABLE IF NOT EXISTS window_settings (
                 id INTEGER PRIMARY KEY,
                 width INTEGER,
@@ -38,9 +339,9 @@ class SettingsDatabase:
                 y INTEGER
             )
         ''')
-        
+
         # Создаем таблицу для хранения параметров окна настроек, если она не существует
-        self.cursor.execute('''
+        self.execute('''
             CREATE TABLE IF NOT EXISTS settings_window_settings (
                 id INTEGER PRIMARY KEY,
                 width INTEGER,
@@ -49,22 +350,22 @@ class SettingsDatabase:
                 y INTEGER
             )
         ''')
-        
-        self.connection.commit()
 
     def get_setting(self, key):
         """Получение значения настройки"""
-        self.cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-        result = self.cursor.fetchone()
+        pending = self.service.write_behind.get(('settings', key))
+        if pending is not None:
+            return pending[1]
+        result = self.fetchone("SELECT value FROM settings WHERE key = ?", (key,))
         return result[0] if result else None
-    
+
     def save_setting(self, key, value):
-        """Сохранение значения настройки"""
-        self.cursor.execute("""
-            INSERT OR REPLACE INTO settings (key, value) 
+        """Сохранение значения настройки (отложенное, см. WriteBehindBuffer)"""
+        self.write_behind(('settings', key), """
+            INSERT OR REPLACE INTO settings (key, value)
             VALUES (?, ?)
         """, (key, value))
-        self.connection.commit()
+
 
     def save_window_settings(self, width, height, x, y):
         """
@@ -72,12 +373,11 @@ class SettingsDatabase:
         """
         try:
             # Сохраняем абсолютные координаты
-            self.cursor.execute('''
+            self.write_behind(('window_settings',), '''
                 INSERT OR REPLACE INTO window_settings 
                 (id, width, height, x, y) 
                 VALUES (1, ?, ?, ?, ?)
             ''', (width, height, x, y))
-            self.connection.commit()
         except Exception as e:
             print(f"Ошибка при сохранении настроек главного окна: {e}")
             
@@ -87,12 +387,11 @@ class SettingsDatabase:
         """
         try:
             # Сохраняем абсолютные координаты
-            self.cursor.execute('''
+            self.write_behind(('settings_window_settings',), '''
                 INSERT OR REPLACE INTO settings_window_settings 
                 (id, width, height, x, y) 
                 VALUES (1, ?, ?, ?, ?)
             ''', (width, height, x, y))
-            self.connection.commit()
         except Exception as e:
             print(f"Ошибка при сохранении настроек окна настроек: {e}")
 
@@ -101,8 +400,9 @@ class SettingsDatabase:
         Загружает настройки главного окна из БД
         """
         try:
-            self.cursor.execute('SELECT width, height, x, y FROM window_settings WHERE id = 1')
-            settings = self.cursor.fetchone()
+            settings = self.service.write_behind.get(('window_settings',))
+            if settings is None:
+                settings = self.fetchone('SELECT width, height, x, y FROM window_settings WHERE id = 1')
             if settings:
                 return settings
         except Exception:
@@ -114,8 +414,9 @@ class SettingsDatabase:
         Загружает настройки окна настроек из БД
         """
         try:
-            self.cursor.execute('SELECT width, height, x, y FROM settings_window_settings WHERE id = 1')
-            settings = self.cursor.fetchone()
+            settings = self.service.write_behind.get(('settings_window_settings',))
+            if settings is None:
+                settings = self.fetchone('SELECT width, height, x, y FROM settings_window_settings WHERE id = 1')
             if settings:
                 return settings
         except Exception as e:
@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from datetime import timedelta
+from kivy.core.audio import SoundLoader
+from data.database import SettingsDatabase
+from logic.prayer_times import prayer_times_manager
+from logic.timeline_scheduler import timeline_scheduler
+from logic.time_source import time_source
+
+ADHAN_DIR = 'audio/adhan'
+# Выбор в окне настроек -> запись азана
+ADHAN_FILES = {
+    'Azan 1': 'AdhanMisharyRashidAlafasy.mp3',
+    'Azan 2': 'AdhanMansourAlZahrani.mp3',
+    'Azan 3': 'AdhanAhmedAlNufais.mp3',
+}
+# Для утренней молитвы у записи может быть отдельный вариант
+FAJR_FILES = {
+    'Azan 1': 'AdhanMisharyRashidAlafasyFajr.mp3',
+}
+# Молитвы, на которые звучит азан (Midnight и Sunrise - нет)
+ADHAN_PRAYERS = ('Fajr', 'Dhuhr', 'Asr', 'Maghrib', 'Isha')
+# Настройка, по которой выбирается азан
+SETTING_KEY = 'azan_spinner'
+
+
+class AdhanPlayer:
+    """
+    Воспроизведение азана точно в момент молитвы.
+
+    За PRELOAD_LEAD секунд до молитвы (событие 'pre_prayer' планировщика) рабочий поток
+    загружает выбранную запись: SDL2-провайдер Kivy декодирует файл целиком
+    в PCM-буфер в памяти, поэтому в момент молитвы остаётся только запустить канал
+    микшера. Тот же поток спит до момента молитвы (последние SPIN_WINDOW секунд -
+    короткими ожиданиями), вызывает play() и записывает задержку старта относительно
+    расчётного момента. Главный поток (часы, анимации) не блокируется ни декодированием,
+    ни ожиданием. Декодированные записи кэшируются по файлу.
+    Момент молитвы задаётся по настенным часам пояса time_source; после скачка
+    времени (сон системы, шаг NTP) ожидание перезапускается от нового времени.
+    """
+    PRELOAD_LEAD = 15 * 60
+    SPIN_WINDOW = 0.02
+    MAX_LATENCIES = 50
+
+    def __init__(self, db=None, loader=None):
+        self._db = db
+        self.loader = loader or SoundLoader.load
+        self._sounds = {}  # путь -> загруженный Sound
+        self._sounds_lock = threading.Lock()
+        self._armed = None  # (момент молитвы, ключ, путь)
+        self._cancel = None
+        self._thread = None
+        self._started = False
+        # Счётчики для отладки
+        self.preloads = 0
+        self.played = 0
+        self.latencies_ms = []
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = SettingsDatabase()
+        return self._db
+
+    def start(self):
+        """Подписывается на события планировщика и обновления времён молитв"""
+        if self._started:
+            return
+        self._started = True
+        timeline_scheduler.subscribe('pre_prayer', self.arm_next)
+        timeline_scheduler.subscribe('prayer', self.arm_next)
+        prayer_times_manager.add_update_listener(self.arm_next)
+        time_source.add_jump_listener(self.resync)
+        self.arm_next()
+
+    def stop(self):
+        """Отписывается и отменяет ожидающее воспроизведение"""
+        if self._started:
+            timeline_scheduler.unsubscribe('pre_prayer', self.arm_next)
+            timeline_scheduler.unsubscribe('prayer', self.arm_next)
+            prayer_times_manager.remove_update_listener(self.arm_next)
+            time_source.remove_jump_listener(self.resync)
+            self._started = False
+        self._disarm()
+        with self._sounds_lock:
+            for sound in self._sounds.values():
+                if sound.state == 'play':
+                    sound.stop()
+
+    def adhan_path(self, prayer_key):
+        """Путь к записи азана для молитвы по текущей настройке"""
+        choice = self.db.get_setting(SETTING_KEY) or 'Azan 1'
+        filename = ADHAN_FILES.get(choice, ADHAN_FILES['Azan 1'])
+        if prayer_key == 'Fajr':
+            filename = FAJR_FILES.get(choice, filename)
+        return os.path.join(ADHAN_DIR, filename)
+
+    def arm_next(self, *args):
+        """
+        Если следующая молитва с азаном ближе PRELOAD_LEAD, запускает поток,
+        который загрузит запись и включит её в момент молитвы
+        """
+        now = time_source.now()
+        upcoming = prayer_times_manager.get_daily_schedule().next(now)
+        if upcoming is None or upcoming.key not in ADHAN_PRAYERS or upcoming.time == '00:00':
+            self._disarm()
+            return
+        prayer_at = time_source.at(now.date() + timedelta(days=upcoming.day_offset), upcoming.minute)
+        if time_source.seconds_until(prayer_at) > self.PRELOAD_LEAD:
+            self._disarm()
+            return
+        path = self.adhan_path(upcoming.key)
+        armed = (prayer_at, upcoming.key, path)
+        if armed == self._armed:
+            return
+        self._disarm()
+        self._armed = armed
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(
+            target=self._play_at,
+            args=(prayer_at.timestamp(), upcoming.key, path, self._cancel),
+            name='adhan-player',
+            daemon=True
+        )
+        self._thread.start()
+        print(f"[DEBUG] adhan_player: {upcoming.key} в {prayer_at:%H:%M}, запись {path}")
+
+    def resync(self):
+        """
+        После скачка настенных часов ожидающий поток отменяется (он ждёт по монотонным
+        часам) и запускается заново; прошедшая за время скачка молитва не озвучивается
+        """
+        if self._cancel is not None:
+            self._cancel.set()
+        self._armed = None
+        self._cancel = None
+        self._thread = None
+        self.arm_next()
+
+    def _disarm(self):
+        # Уже наступившую молитву не отменяем: поток мог ещё не успеть вызвать play()
+        due = self._armed is not None and time_source.seconds_until(self._armed[0]) <= 0
+        if self._cancel is not None and not due:
+            self._cancel.set()
+        self._armed = None
+        self._cancel = None
+        self._thread = None
+
+    def preload(self, path):
+        """Загружает (декодирует) запись, если её ещё нет в кэше"""
+        with self._sounds_lock:
+            sound = self._sounds.get(path)
+            if sound is None:
+                started = time.perf_counter()
+                sound = self.loader(path)
+                if sound is None:
+                    print(f"[DEBUG] adhan_player: не удалось загрузить {path}")
+                    return None
+                self._sounds[path] = sound
+                self.preloads += 1
+                print(f"[DEBUG] adhan_player: {path} загружен за {(time.perf_counter() - started) * 1000:.0f} мс")
+            return sound
+
+    def _play_at(self, when, prayer_key, path, cancel):
+        """Рабочий поток: загрузка заранее, ожидание момента молитвы и запуск"""
+        sound = self.preload(path)
+        if sound is None:
+            return
+        # Длинное ожидание прерывается отменой, последние миллисекунды - короткими шагами
+        while not cancel.is_set():
+            remaining = when - time.time()
+            if remaining <= 0:
+                break
+            if remaining > self.SPIN_WINDOW:
+                cancel.wait(remaining - self.SPIN_WINDOW)
+            else:
+                time.sleep(0)
+        if cancel.is_set():
+            return
+        sound.play()
+        latency_ms = (time.time() - when) * 1000.0
+        self.played += 1
+        self.latencies_ms = (self.latencies_ms + [round(latency_ms, 2)])[-self.MAX_LATENCIES:]
+        print(f"[DEBUG] adhan_player: азан {prayer_key} запущен, задержка старта {latency_ms:.2f} мс")
+
+    def stats(self):
+        """Счётчики загрузок, воспроизведений и задержки старта"""
+        return {
+            'preloads': self.preloads,
+            'played': self.played,
+            'cached': len(self._sounds),
+            'latencies_ms': list(self.latencies_ms),
+            'last_latency_ms': self.latencies_ms[-1] if self.latencies_ms else None,
+        }
+
+
+# Создаем глобальный экземпляр для использования в других модулях
+adhan_player = AdhanPlayer()
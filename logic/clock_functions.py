@@ -1,6 +1,7 @@
 from kivy.uix.label import Label
 from kivy.core.window import Window
 from datetime import datetime
+from logic.font_fit import font_fit_solver, clock_template
 
 # Неразрывный пробел как константа
 NBSP = chr(0x00A0)
@@ -33,24 +34,13 @@ class BaseClockLabel(Label):
         aspect_ratio = width / height
         
         if aspect_ratio > 1:  # Альбомная ориентация
-            font_size = width / 3.5  # Начальный размер
+            # Размер подбирается без растеризации (см. FontFitSolver) и кэшируется
+            # по ширине окна, поэтому на ресайз нужна одна перерисовка текстуры
+            font_size = font_fit_solver.fit(self.font_name, clock_template(self.text), width)
             self.font_size = font_size
             self.text_size = (width, None)
             self.size = (width, height)
             self.texture_update()
-            
-            # Сначала уменьшаем, если текст больше окна
-            while self.texture_size[0] > width:
-                font_size *= 0.99  # Уменьшаем на 1%
-                self.font_size = font_size
-                self.texture_update()
-                
-            # Теперь увеличиваем, если текст меньше окна
-            while self.texture_size[0] < width:
-                font_size *= 1.001  # Увеличиваем на 0.1%
-                self.font_size = font_size
-                self.texture_update()
-                
             return font_size
             
         else:  # Портретная ориентация - не трогаем
@@ -85,7 +75,11 @@ class BaseClockLabel(Label):
     
     def toggle_colon_visibility(self):
         """Переключение видимости двоеточия"""
-        self.is_colon_visible = not self.is_colon_visible
+        self.set_colon_visibility(not self.is_colon_visible)
+
+    def set_colon_visibility(self, visible):
+        """Показывает или скрывает двоеточие (фаза задаётся снаружи)"""
+        self.is_colon_visible = visible
         self.text = get_formatted_time(self.is_colon_visible)
         
     def on_window_resize(self, instance, width, height):
@@ -2,7 +2,11 @@ from datetime import datetime
 from kivy.uix.label import Label
 from kivy.uix.gridlayout import GridLayout
 from kivy.core.window import Window
+from functools import partial
 from logic.hijri_date import hijri_date_manager
+from logic.widget_lifecycle import lifecycle_manager
+from logic.font_manager import font_manager
+from ui.date_line_label import DateLineLabel
 
 # Словари для конвертации в римские цифры
 WEEKDAY_TO_ROMAN = {
@@ -45,20 +49,22 @@ HIJRI_MONTH_TO_ROMAN = {
     12: 'XII'   # Зу-ль-хиджа
 }
 
-def get_formatted_dates():
+def get_formatted_dates(day=None):
     """
     Возвращает отформатированные даты
+    Args:
+        day (date): Дата или None для текущей
     Returns:
         dict: Словарь с частями даты и их шрифтами
     """
-    current_date = datetime.now()
+    current_date = day or datetime.now()
     
     # Григорианская дата в формате IV - 05.XII.2024
     weekday = current_date.weekday()
     month = current_date.month
     
     # Получаем дату хиджры
-    hijri_parts = hijri_date_manager.get_hijri_date()
+    hijri_parts = hijri_date_manager.get_hijri_date(current_date)
     
     # Части даты с указанием шрифтов и размеров
     date_parts = {
@@ -101,6 +107,9 @@ def get_formatted_dates():
             'font_size': 40
         }
     }
+
+    # Шрифты из разметки [font=...] регистрируются при первом использовании
+    font_manager.ensure(*{part['font'] for part in date_parts.values() if isinstance(part, dict)})
     
     return date_parts
 
@@ -144,33 +153,31 @@ def create_gregorian_date_label(base_font_size):
     
     return date_label
 
-def create_hijri_date_label(base_font_size):
+def hijri_date_line_markup(font_size, formatted_dates=None, day=None):
     """
-    Создает Label с датами хиджры и григорианской в одной строке
+    Текст с разметкой для строки с датами хиджры и григорианской
     
     Args:
-        base_font_size (float): Базовый размер шрифта
+        font_size (int): Размер шрифта всех частей
+        formatted_dates (dict): Результат get_formatted_dates() или None
+        day (date): Дата строки, если formatted_dates не передан (None - сегодня)
     
     Returns:
-        Label: Label с обеими датами в одной строке
+        str: Текст с разметкой [size][font]
     """
-    formatted_dates = get_formatted_dates()
-    
-    # Рассчитываем базовый размер на основе ширины окна
-    window_width = Window.width
-    adaptive_base_size = window_width * 0.04  # 4% от ширины окна
-    
-    # Получаем размеры для каждой части из словаря или используем адаптивные значения
-    hijri_day_size = int(adaptive_base_size * 1)    # чуть меньше базового
-    hijri_month_size = int(adaptive_base_size * 1.0)
-    hijri_year_size = int(adaptive_base_size * 1)   # чуть меньше базового
-    greg_weekday_size = int(adaptive_base_size * 1.0)
-    greg_day_size = int(adaptive_base_size * 1)      # для дня
-    greg_month_size = int(adaptive_base_size * 1.0)
-    greg_year_size = int(adaptive_base_size * 1)     # для года
-    
-    # Формируем текст с разметкой для обеих дат
-    marked_text = (
+    if formatted_dates is None:
+        formatted_dates = get_formatted_dates(day)
+    
+    # Размеры частей пока одинаковые, но заданы отдельно для каждой
+    hijri_day_size = int(font_size * 1)
+    hijri_month_size = int(font_size * 1.0)
+    hijri_year_size = int(font_size * 1)
+    greg_weekday_size = int(font_size * 1.0)
+    greg_day_size = int(font_size * 1)
+    greg_month_size = int(font_size * 1.0)
+    greg_year_size = int(font_size * 1)
+    
+    return (
         # Дата хиджры
         f'[size={hijri_year_size}][font=FontDSEG7-Light]{formatted_dates["hijri_year"]["text"]}[/font][/size]'
         f'[size={hijri_month_size}][font=GothicRegular]{formatted_dates["hijri_month"]["text"]}[/font][/size]'
@@ -181,59 +188,41 @@ def create_hijri_date_label(base_font_size):
         f'[size={greg_month_size}][font=GothicRegular]{formatted_dates["month"]["text"]}[/font][/size]'
         f'[size={greg_year_size}][font=FontDSEG7-Light]{formatted_dates["year"]["text"]}[/font][/size]'
     )
+
+def create_hijri_date_label(base_font_size):
+    """
+    Создает строку с датами хиджры и григорианской
+    (текстура строки кэшируется, см. DateLineLabel)
     
-    # Создаем Label с поддержкой разметки
-    date_label = Label(
-        text=marked_text,
-        markup=True,
+    Args:
+        base_font_size (float): Базовый размер шрифта
+    
+    Returns:
+        DateLineLabel: Виджет с обеими датами в одной строке
+    """
+    # Размер рассчитывается от ширины окна
+    window_width = Window.width
+    
+    date_label = DateLineLabel(
+        markup_provider=hijri_date_line_markup,
+        font_size=int(window_width * 0.04),  # 4% от ширины окна
         color=(1, 1, 0, 1),  # Желтый цвет для дат
         size_hint_x=1,
         size_hint_y=None,
-        height=window_width * 0.06,  # Высота тоже адаптивная
-        halign='center',
-        valign='middle',
-        text_size=(Window.width, window_width * 0.06)  # Задаем полный размер текста
+        height=window_width * 0.06  # Высота тоже адаптивная
     )
     
     # Привязываем обновление размеров к изменению размера окна
-    Window.bind(width=lambda *args: update_label_size(date_label))
+    # (привязка снимается, когда метку удаляют из дерева виджетов)
+    lifecycle_manager.for_widget(date_label).bind(Window, width=partial(update_label_size, date_label))
     
     return date_label
 
 def update_label_size(label, *args):
     """
-    Обновляет размеры метки при изменении размера окна
+    Обновляет размеры строки даты при изменении размера окна.
+    Текстура растеризуется заново только для нового размера шрифта.
     """
     window_width = Window.width
-    adaptive_base_size = window_width * 0.04
-    
-    # Обновляем высоту метки
     label.height = window_width * 0.06
-    label.text_size = (window_width, window_width * 0.06)
-    
-    # Рассчитываем новые размеры
-    hijri_day_size = int(adaptive_base_size * 1)
-    hijri_month_size = int(adaptive_base_size * 1)
-    hijri_year_size = int(adaptive_base_size * 1)
-    greg_weekday_size = int(adaptive_base_size * 1)
-    greg_day_size = int(adaptive_base_size * 1)
-    greg_month_size = int(adaptive_base_size * 1)
-    greg_year_size = int(adaptive_base_size * 1)
-    
-    # Получаем форматированные даты заново
-    formatted_dates = get_formatted_dates()
-    
-    # Обновляем текст с новыми размерами
-    marked_text = (
-        f'[size={hijri_year_size}][font=FontDSEG7-Light]{formatted_dates["hijri_year"]["text"]}[/font][/size]'
-        f'[size={hijri_month_size}][font=GothicRegular]{formatted_dates["hijri_month"]["text"]}[/font][/size]'
-        f'[size={hijri_day_size}][font=FontDSEG7-Light]{formatted_dates["hijri_day"]["text"]}[/font][/size]'
-        f'[size={greg_weekday_size}][font=DalekBold]{formatted_dates["weekday"]["text"]}[/font][/size]'
-        f'[size={greg_day_size}][font=FontDSEG7-Light]{formatted_dates["day"]["text"]}[/font][/size]'
-        f'[size={greg_month_size}][font=GothicRegular]{formatted_dates["month"]["text"]}[/font][/size]'
-        f'[size={greg_year_size}][font=FontDSEG7-Light]{formatted_dates["year"]["text"]}[/font][/size]'
-    )
-    
-    # Обновляем текст метки
-    label.text = marked_text
-    label.texture_update()
\ No newline at end of file
+    label.font_size = int(window_width * 0.04)
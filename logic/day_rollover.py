@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import partial
+from kivy.clock import Clock
+from logic.prayer_times import prayer_times_manager
+from logic.prayer_time_calculator import DailySchedule
+from logic.date_formatted import get_formatted_dates
+from ui.date_line_label import DateLineLabel
+
+# Подготовленное состояние дня: времена молитв на день и следующий, расписание
+NextDayState = namedtuple('NextDayState', 'day times tomorrow_times schedule')
+
+
+class DayRollover:
+    """
+    Смена дня в полночь без пауз в отрисовке.
+
+    Незадолго до полуночи (prepare) рабочий поток читает из базы (или рассчитывает)
+    времена молитв на новый день и следующий и строит DailySchedule. Затем в главном
+    потоке переводится дата хиджры, собираются строки дат и заранее растеризуются
+    текстуры всех строк даты для нового дня. В полночь swap только подставляет
+    готовое состояние: кэш времён молитв, расписание и текстуры - без SQL, сети
+    и пересоздания виджетов. Время подстановки сравнивается с длительностью кадра.
+    """
+    FRAME_BUDGET = 1.0 / 60
+
+    def __init__(self):
+        self._staged = None
+        self._worker = None
+        # Счётчики для отладки
+        self.prepared = 0
+        self.prerendered = 0
+        self.swaps = 0
+        self.fallbacks = 0
+        self.last_swap_ms = None
+
+    def prepare(self, day):
+        """Запускает фоновую подготовку состояния на день day"""
+        if self._staged is not None and self._staged.day == day:
+            return
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(
+            target=self._prepare_worker,
+            args=(day,),
+            name='day-rollover',
+            daemon=True
+        )
+        self._worker.start()
+
+    def _load(self, day):
+        times = prayer_times_manager.load_day_times(day)
+        tomorrow_times = prayer_times_manager.load_day_times(day + timedelta(days=1))
+        return NextDayState(day, times, tomorrow_times, DailySchedule(day, times, tomorrow_times))
+
+    def _prepare_worker(self, day):
+        """Рабочий поток: времена молитв и расписание нового дня"""
+        try:
+            state = self._load(day)
+        except Exception as e:
+            print(f"DayRollover: ошибка подготовки {day}: {e}")
+            return
+        Clock.schedule_once(partial(self._stage, state), 0)
+
+    def _stage(self, state, *args):
+        """Главный поток: дата хиджры, строки дат и текстуры строк даты нового дня"""
+        started = time.perf_counter()
+        get_formatted_dates(state.day)
+        rendered = sum(1 for label in list(DateLineLabel.instances) if label.prerender(state.day))
+        self._staged = state
+        self.prepared += 1
+        self.prerendered += rendered
+        print(f"[DEBUG] day_rollover: {state.day} подготовлен, текстур строки даты: {rendered} "
+              f"({(time.perf_counter() - started) * 1000:.1f} мс в главном потоке)")
+
+    def swap(self):
+        """
+        Подставляет подготовленное состояние текущего дня
+        Returns:
+            float: время подстановки в мс
+        """
+        started = time.perf_counter()
+        today = date.today()
+        state, self._staged = self._staged, None
+        if state is None or state.day != today:
+            # Подготовка не успела (например, запуск за секунды до полуночи) - загружаем сразу
+            self.fallbacks += 1
+            state = self._load(today)
+        prayer_times_manager.install_day(state.day, state.times, state.tomorrow_times, state.schedule)
+        DateLineLabel.refresh_all()
+        self.swaps += 1
+        self.last_swap_ms = (time.perf_counter() - started) * 1000.0
+        print(f"[DEBUG] day_rollover: смена дня на {today} за {self.last_swap_ms:.2f} мс "
+              f"(кадр {self.FRAME_BUDGET * 1000:.1f} мс)")
+        return self.last_swap_ms
+
+    def stats(self):
+        """Счётчики подготовок и подстановок, время последней подстановки"""
+        return {
+            'prepared': self.prepared,
+            'prerendered': self.prerendered,
+            'swaps': self.swaps,
+            'fallbacks': self.fallbacks,
+            'last_swap_ms': self.last_swap_ms,
+            'within_frame': self.last_swap_ms is not None and self.last_swap_ms < self.FRAME_BUDGET * 1000.0,
+        }
+
+
+# Создаем глобальный экземпляр для использования в других модулях
+day_rollover = DayRollover()
@@ -0,0 +1,145 @@
+from kivy.core.text import Label as CoreLabel
+from data.database import SettingsDatabase
+
+
+def clock_template(text):
+    """
+    Шаблон строки часов для подбора шрифта: все цифры заменяются на '8',
+    пробел на месте двоеточия - на ':'. Размер не зависит от текущего времени
+    и от мигания двоеточия.
+    """
+    return ''.join('8' if char.isdigit() else ':' if char in (chr(0x00A0), ' ') else char for char in text)
+
+
+class FontFitSolver:
+    """
+    Подбор размера шрифта, при котором строка помещается в заданную ширину.
+
+    Ширины глифов измеряются один раз на шрифт при опорном размере
+    (без растеризации, через get_extents). Ширина строки почти линейна по размеру
+    шрифта, поэтому размер сначала вычисляется по формуле, вокруг оценки строится
+    проверенная измерениями вилка (если оценка ошиблась больше чем на 10%, вилка
+    расширяется в GROWTH раз за шаг), а затем размер уточняется двоичным поиском
+    (из-за кернинга, хинтинга и округления).
+    Результат кэшируется по (шрифт, шаблон, ширина) в памяти и в settings.db.
+    """
+    REFERENCE_SIZE = 100
+    SEARCH_STEPS = 12
+    GROWTH = 1.25
+    MAX_EXPANSIONS = 24
+    MIN_SIZE = 1.0
+
+    def __init__(self, db=None):
+        self._db = db
+        self._table_ready = False
+        self._advances = {}  # (шрифт, символ) -> ширина при REFERENCE_SIZE
+        self._cache = {}     # (шрифт, шаблон, ширина) -> размер шрифта
+        # Счётчики для отладки
+        self.measurements = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = SettingsDatabase()
+        if not self._table_ready:
+            self._db.execute('''
+                CREATE TABLE IF NOT EXISTS font_fit_cache (
+                    font TEXT,
+                    template TEXT,
+                    width INTEGER,
+                    font_size REAL,
+                    PRIMARY KEY (font, template, width)
+                )
+            ''')
+            self._table_ready = True
+        return self._db
+
+    def _text_width(self, font_name, text, font_size):
+        """Ширина строки при заданном размере шрифта (без создания текстуры)"""
+        self.measurements += 1
+        return CoreLabel(font_name=font_name, font_size=font_size).get_extents(text)[0]
+
+    def _reference_width(self, font_name, template):
+        """Сумма ширин глифов шаблона при опорном размере (глифы меряются один раз)"""
+        total = 0
+        for char in template:
+            key = (font_name, char)
+            if key not in self._advances:
+                self._advances[key] = self._text_width(font_name, char, self.REFERENCE_SIZE)
+            total += self._advances[key]
+        return total
+
+    def solve(self, font_name, template, width):
+        """
+        Наибольший размер шрифта, при котором шаблон помещается в width
+        Returns:
+            float: размер шрифта в пикселях
+        """
+        reference = self._reference_width(font_name, template)
+        if reference <= 0 or width <= 0:
+            return float(self.REFERENCE_SIZE)
+        estimate = self.REFERENCE_SIZE * width / reference
+
+        # Вилка вокруг оценки: при low строка помещается, при high - уже нет
+        low, high = estimate * 0.9, estimate * 1.1
+        high_checked = False
+        for _ in range(self.MAX_EXPANSIONS):
+            if low <= self.MIN_SIZE or self._text_width(font_name, template, low) <= width:
+                break
+            high, low, high_checked = low, low / self.GROWTH, True
+        low = max(low, self.MIN_SIZE)
+        for _ in range(0 if high_checked else self.MAX_EXPANSIONS):
+            if self._text_width(font_name, template, high) > width:
+                break
+            low, high = high, high * self.GROWTH
+
+        # Уточнение внутри вилки: ширина строки не строго линейна
+        for _ in range(self.SEARCH_STEPS):
+            middle = (low + high) / 2
+            if self._text_width(font_name, template, middle) <= width:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def fit(self, font_name, template, width):
+        """Размер шрифта из кэша (память, затем settings.db) или через solve()"""
+        width = int(width)
+        key = (font_name, template, width)
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+
+        db = self.db
+        row = db.fetchone(
+            'SELECT font_size FROM font_fit_cache WHERE font = ? AND template = ? AND width = ?',
+            key
+        )
+        if row:
+            self.hits += 1
+            self._cache[key] = row[0]
+            return row[0]
+
+        self.misses += 1
+        font_size = self.solve(font_name, template, width)
+        self._cache[key] = font_size
+        db.execute(
+            'INSERT OR REPLACE INTO font_fit_cache (font, template, width, font_size) VALUES (?, ?, ?, ?)',
+            key + (font_size,)
+        )
+        return font_size
+
+    def stats(self):
+        """Счётчики кэша и измерений для отладки"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'measurements': self.measurements,
+            'cached': len(self._cache),
+        }
+
+
+# Создаем глобальный экземпляр для использования в других модулях
+font_fit_solver = FontFitSolver()
@@ -0,0 +1,160 @@
+import hashlib
+import os
+from pathlib import Path
+from kivy.core.text import LabelBase
+
+try:
+    # Необязательная зависимость: без fontTools регистрируются исходные файлы шрифтов
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+NBSP = chr(0x00A0)
+DIGITS = '0123456789'
+# Азербайджанский алфавит (латиница) поверх ASCII
+AZ_LETTERS = 'ƏəÇçĞğİıÖöŞşÜü'
+ASCII_TEXT = ''.join(chr(code) for code in range(0x20, 0x7F))
+
+# Все шрифты приложения: имя для font_name/[font=] -> файл
+FONTS = {
+    'FontSourceCodePro-ExtraLight': 'fonts/SourceCodePro/SourceCodePro-ExtraLight.ttf',
+    'FontSourceCodePro-Light': 'fonts/SourceCodePro/SourceCodePro-Light.ttf',
+    'FontSourceCodePro-Medium': 'fonts/SourceCodePro/SourceCodePro-Medium.ttf',
+    'FontSourceCodePro-Regular': 'fonts/SourceCodePro/SourceCodePro-Regular.ttf',
+    'FontSourceCodePro-SemiBold': 'fonts/SourceCodePro/SourceCodePro-SemiBold.ttf',
+    'FontSourceCodePro-Bold': 'fonts/SourceCodePro/SourceCodePro-Bold.ttf',
+    'FontSourceCodePro-ExtraBold': 'fonts/SourceCodePro/SourceCodePro-ExtraBold.ttf',
+    'FontSourceCodePro-Black': 'fonts/SourceCodePro/SourceCodePro-Black.ttf',
+    'FontDSEG7-Light': 'fonts/DSEG-Classic/DSEG7Classic-Light.ttf',
+    'FontDSEG7-Regular': 'fonts/DSEG-Classic/DSEG7Classic-Regular.ttf',
+    'FontDSEG7-Bold': 'fonts/DSEG-Classic/DSEG7Classic-Bold.ttf',
+    'FontDSEG14-Light': 'fonts/DSEG-Classic/DSEG14Classic-Light.ttf',
+    'FontDSEG14-Regular': 'fonts/DSEG-Classic/DSEG14Classic-Regular.ttf',
+    'FontDSEG14-Bold': 'fonts/DSEG-Classic/DSEG14Classic-Bold.ttf',
+    'DalekBold': 'fonts/RimFonts/DalekPinpointBold.ttf',
+    'GothicRegular': 'fonts/RimFonts/SawarabiGothic-Regular.ttf',
+}
+
+# Символы, которые интерфейс рисует каждым шрифтом: часы и даты (цифры, двоеточие,
+# точка, тире), римские номера дня недели и месяца, названия молитв и линии-разделители.
+# Шрифты без набора регистрируются целиком.
+GLYPH_SETS = {
+    'FontDSEG7-Light': DIGITS + ':.-/ ' + NBSP,
+    'FontDSEG7-Bold': DIGITS + ':.-/ ' + NBSP,
+    'DalekBold': 'IVX-/. ' + NBSP,
+    'GothicRegular': 'IVX-/. ' + NBSP,
+    'FontSourceCodePro-Regular': ASCII_TEXT + AZ_LETTERS + '―' + NBSP,
+}
+
+
+class FontManager:
+    """
+    Регистрация шрифтов при первом использовании.
+
+    font(name) регистрирует шрифт в LabelBase при первом обращении и возвращает имя.
+    Для шрифтов из GLYPH_SETS (если установлен fontTools) регистрируется не исходный
+    файл, а подмножество только с нужными глифами из CACHE_DIR: FreeType загружает
+    меньше данных, первая отрисовка быстрее. Имя файла подмножества содержит хэш
+    пути, размера и времени изменения исходного шрифта и набора символов, поэтому
+    изменение шрифта или набора приводит к пересборке, а старые файлы удаляются.
+    """
+    CACHE_DIR = 'data/font_cache'
+
+    def __init__(self, fonts=None, glyph_sets=None, cache_dir=None):
+        self.fonts = dict(FONTS if fonts is None else fonts)
+        self.glyph_sets = dict(GLYPH_SETS if glyph_sets is None else glyph_sets)
+        self.cache_dir = Path(cache_dir or self.CACHE_DIR)
+        self._registered = {}  # имя -> зарегистрированный файл
+        # Счётчики для отладки
+        self.subset_hits = 0
+        self.subset_builds = 0
+        self.subset_failures = 0
+        self._warned_no_subset = False
+
+    def font(self, name):
+        """
+        Регистрирует шрифт при первом обращении
+        Returns:
+            str: имя шрифта для font_name или [font=]
+        """
+        if name not in self._registered and name in self.fonts:
+            self._register(name)
+        return name
+
+    def ensure(self, *names):
+        """Регистрирует несколько шрифтов (например, перед разметкой [font=...])"""
+        for name in names:
+            self.font(name)
+
+    def _register(self, name):
+        source = self.fonts[name]
+        filename = self._subset_file(name, source) or source
+        LabelBase.register(name=name, fn_regular=filename)
+        self._registered[name] = filename
+        print(f"[DEBUG] font_manager: зарегистрирован {name} -> {filename}")
+
+    def _cache_key(self, name, source):
+        stat = os.stat(source)
+        text = ''.join(sorted(set(self.glyph_sets[name])))
+        payload = f"{os.path.abspath(source)}|{stat.st_size}|{stat.st_mtime_ns}|{text}"
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+    def _subset_file(self, name, source):
+        """
+        Путь к подмножеству шрифта (собирается при отсутствии в кэше)
+        Returns:
+            str или None, если подмножество не нужно или его не удалось собрать
+        """
+        if name not in self.glyph_sets or not os.path.exists(source):
+            return None
+        if font_subset is None:
+            if not self._warned_no_subset:
+                self._warned_no_subset = True
+                print("[WARNING] font_manager: fontTools не установлен - подмножества шрифтов "
+                      "не собираются, регистрируются исходные файлы (pip install fonttools)")
+            return None
+        try:
+            key = self._cache_key(name, source)
+            target = self.cache_dir / f"{name}-{key}{Path(source).suffix}"
+            if target.exists():
+                self.subset_hits += 1
+                return str(target)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._build_subset(source, target, self.glyph_sets[name])
+            self.subset_builds += 1
+            # Подмножества устаревших версий шрифта больше не нужны
+            for stale in self.cache_dir.glob(f"{name}-*"):
+                if stale != target:
+                    stale.unlink()
+            return str(target)
+        except Exception as e:
+            self.subset_failures += 1
+            print(f"[DEBUG] font_manager: не удалось собрать подмножество {name}: {e}")
+            return None
+
+    def _build_subset(self, source, target, text):
+        options = font_subset.Options()
+        options.layout_features = ['*']
+        options.name_IDs = ['*']
+        options.notdef_outline = True
+        font = font_subset.load_font(source, options)
+        subsetter = font_subset.Subsetter(options)
+        subsetter.populate(text=text)
+        subsetter.subset(font)
+        # Пишем во временный файл и переименовываем, чтобы не оставить обрезанный шрифт
+        temporary = target.with_name(target.name + '.tmp')
+        font_subset.save_font(font, str(temporary), options)
+        os.replace(temporary, target)
+
+    def stats(self):
+        """Зарегистрированные шрифты и счётчики кэша подмножеств"""
+        return {
+            'registered': len(self._registered),
+            'subset_hits': self.subset_hits,
+            'subset_builds': self.subset_builds,
+            'subset_failures': self.subset_failures,
+        }
+
+
+# Создаем глобальный экземпляр для использования в других модулях
+font_manager = FontManager()
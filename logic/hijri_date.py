@@ -1,86 +1,133 @@
-from datetime import datetime
-from datetime import datetime
-from hijri_converter import Gregorian
-from data.database import SettingsDatabase
-import locale
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime, date as date_cls, timedelta
+from hijri_converter import Gregorian, Hijri
+from logic.lazy_service import LazyService
+
+# Дата хиджры для григорианской даты
+HijriDay = namedtuple('HijriDay', 'date year month day')
+
 
 class HijriDateManager:
-    def __init__(self):
-        self.db = SettingsDatabase()
-        self._setup_database()
+    """
+    Календарь хиджры на таблице начал месяцев.
+
+    Один раз (и при выходе за пределы) строится таблица: для каждого месяца хиджры
+    в интервале [сегодня - span_before_days, сегодня + span_after_days] хранится
+    порядковый номер григорианского дня его начала. Дата переводится через bisect
+    по этой таблице - без обращений к базе, strptime и locale.setlocale.
+    """
+    def __init__(self, span_before_days=366, span_after_days=5 * 366):
+        self.span_before_days = span_before_days
+        self.span_after_days = span_after_days
+        self._starts = []  # ordinal первого дня месяца хиджры, по возрастанию
+        self._months = []  # (год, месяц) хиджры для каждого начала
+        self._end = 0      # ordinal первого дня после таблицы
+        # Счётчики для отладки
+        self.table_builds = 0
+        self.lookups = 0
+
+    def _covers(self, day):
+        return bool(self._starts) and self._starts[0] <= day.toordinal() < self._end
 
-    def _setup_database(self):
-        """Создает таблицу для хранения дат хиджры"""
-        self.db.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS hijri_dates (
-                date TEXT PRIMARY KEY,
-                hijri_date TEXT NOT NULL,
-                hijri_month TEXT NOT NULL,
-                hijri_year TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        self.db.connection.commit()
+    def _build_table(self, first_day, last_day):
+        """Строит таблицу начал месяцев, покрывающую даты от first_day до last_day"""
+        first = Gregorian.fromdate(first_day).to_hijri()
+        year, month = first.year, first.month
+        starts, months = [], []
+        while True:
+            start = Hijri(year, month, 1).to_gregorian().toordinal()
+            starts.append(start)
+            months.append((year, month))
+            if start > last_day.toordinal():
+                break
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+        # Последнее начало служит только концом предыдущего месяца
+        self._starts = starts[:-1]
+        self._months = months[:-1]
+        self._end = starts[-1]
+        self.table_builds += 1
+        print(f"[DEBUG] hijri_date: таблица из {len(self._starts)} месяцев "
+              f"({date_cls.fromordinal(self._starts[0])} - {date_cls.fromordinal(self._end - 1)})")
 
-    def _get_current_hijri_date(self):
-        """Получает текущую дату хиджры"""
-        hijri = Gregorian.today().to_hijri()
-        return hijri
+    def convert(self, day):
+        """
+        Переводит григорианскую дату в дату хиджры
+        Args:
+            day: date или datetime
+        Returns:
+            HijriDay
+        """
+        if isinstance(day, datetime):
+            day = day.date()
+        if not self._covers(day):
+            self._build_table(day - timedelta(days=self.span_before_days),
+                              day + timedelta(days=self.span_after_days))
+        self.lookups += 1
+        ordinal = day.toordinal()
+        index = bisect_right(self._starts, ordinal) - 1
+        year, month = self._months[index]
+        return HijriDay(day, year, month, ordinal - self._starts[index] + 1)
 
-    def _format_hijri_date(self, hijri_date):
+    def convert_range(self, start, end):
+        """
+        Переводит все даты от start до end включительно
+        Returns:
+            list[HijriDay]
+        """
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+        if end < start:
+            return []
+        # Таблица должна покрывать весь диапазон - иначе строим её заново один раз
+        if not (self._covers(start) and self._covers(end)):
+            self._build_table(start - timedelta(days=self.span_before_days),
+                              max(end, start + timedelta(days=self.span_after_days)))
+
+        result = []
+        ordinal = start.toordinal()
+        index = bisect_right(self._starts, ordinal) - 1
+        for offset in range((end - start).days + 1):
+            while index + 1 < len(self._starts) and self._starts[index + 1] <= ordinal:
+                index += 1
+            year, month = self._months[index]
+            result.append(HijriDay(start + timedelta(days=offset), year, month, ordinal - self._starts[index] + 1))
+            ordinal += 1
+        self.lookups += len(result)
+        return result
+
+    def _format_hijri_date(self, hijri_day):
         """Форматирует дату хиджры в нужном формате"""
-        locale.setlocale(locale.LC_TIME, 'en_US.UTF-8')
         return {
-            'day': str(hijri_date.day),  # День
-            'month': str(hijri_date.month),  # Месяц
-            'year': str(hijri_date.year),  # Год
-            'full_date': f"{hijri_date.day}/{hijri_date.month}/{hijri_date.year}"
+            'day': str(hijri_day.day),  # День
+            'month': str(hijri_day.month),  # Месяц
+            'year': str(hijri_day.year),  # Год
+            'full_date': f"{hijri_day.day}/{hijri_day.month}/{hijri_day.year}"
         }
 
     def get_hijri_date(self, date=None):
         """
         Получает дату хиджры для указанной даты или текущей
         Args:
-            date: datetime object или None для текущей даты
+            date: datetime/date или None для текущей даты
         Returns:
             dict: отформатированная дата хиджры
         """
         if date is None:
             date = datetime.now()
-            
-        date_str = date.strftime('%Y-%m-%d')
-        
-        # Проверяем, есть ли дата в базе
-        self.db.cursor.execute('SELECT * FROM hijri_dates WHERE date = ?', (date_str,))
-        result = self.db.cursor.fetchone()
-        
-        if result and self._is_valid_cache(result):
-            return {
-                'day': result[1],
-                'month': result[2],
-                'year': result[3],
-                'full_date': f"{result[1]}{result[2]}{result[3]}"
-            }
-        
-        # Если нет в базе или кэш устарел, вычисляем заново
-        hijri = self._get_current_hijri_date()
-        formatted = self._format_hijri_date(hijri)
-        
-        # Сохраняем в базу
-        self.db.cursor.execute('''
-            INSERT OR REPLACE INTO hijri_dates 
-            (date, hijri_date, hijri_month, hijri_year)
-            VALUES (?, ?, ?, ?)
-        ''', (date_str, formatted['day'], formatted['month'], formatted['year']))
-        self.db.connection.commit()
-        
-        return formatted
+        return self._format_hijri_date(self.convert(date))
 
-    def _is_valid_cache(self, db_result):
-        """Проверяет актуальность кэша в базе"""
-        # Пока простая проверка - кэш валиден 30 дней
-        created_at = datetime.strptime(db_result[4], '%Y-%m-%d %H:%M:%S')
-        return (datetime.now() - created_at).days < 30
+    def stats(self):
+        """Счётчики построений таблицы и переводов дат"""
+        return {
+            'table_builds': self.table_builds,
+            'months': len(self._starts),
+            'lookups': self.lookups,
+        }
 
 # Создаем глобальный экземпляр для использования в других модулях
-hijri_date_manager = HijriDateManager()
+hijri_date_manager = LazyService(HijriDateManager)
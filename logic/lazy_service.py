@@ -0,0 +1,43 @@
+import threading
+
+
+class LazyService:
+    """
+    Глобальный экземпляр, создаваемый при первом обращении.
+
+    Модуль может объявить `manager = LazyService(Manager)` вместо `manager = Manager()`:
+    импорт модуля тогда не открывает базу и не обращается к сети, а экземпляр
+    создаётся при первом обращении к любому его атрибуту. Вызывающий код
+    (`from logic.x import manager; manager.method()`) не меняется.
+    """
+    def __init__(self, factory):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def instance(self):
+        """Возвращает экземпляр, создавая его при первом вызове"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    print(f"[DEBUG] lazy_service: создаётся {self._factory.__name__}")
+                    instance = self._factory()
+                    object.__setattr__(self, '_instance', instance)
+        return instance
+
+    @property
+    def is_created(self):
+        """Создан ли уже экземпляр (без его создания)"""
+        return self._instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self.instance(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.instance(), name, value)
+
+    def __repr__(self):
+        state = repr(self._instance) if self._instance is not None else 'не создан'
+        return f"<LazyService {self._factory.__name__}: {state}>"
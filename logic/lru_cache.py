@@ -0,0 +1,57 @@
+from collections import OrderedDict
+
+
+class DateLRUCache:
+    """
+    Небольшой кэш в памяти с вытеснением давно не использованных записей (LRU).
+    Ключ - строка даты 'YYYY-MM-DD'. Считает попадания и промахи.
+    """
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Возвращает значение или None (промах)"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Сохраняет значение, вытесняя самую старую запись при переполнении"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key=None):
+        """Удаляет одну запись или весь кэш (key=None)"""
+        self.invalidations += 1
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Счётчики кэша для отладки"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
@@ -1,15 +1,28 @@
 from kivy.clock import Clock
-from datetime import datetime, timedelta
+from datetime import timedelta
+from logic.time_source import time_source
 
 class MidnightUpdateManager:
     """
     Менеджер автоматического обновления данных и UI ровно в полночь.
-    Позволяет регистрировать callback-функции, которые будут вызваны при наступлении нового дня.
+    Позволяет регистрировать callback-функции, которые будут вызваны при наступлении нового дня,
+    и callback-функции подготовки, которые вызываются за PREPARE_LEAD секунд до полуночи
+    с датой наступающего дня.
+    Полночь вычисляется по настенным часам пояса time_source; при скачке времени
+    (сон системы, шаг NTP, смена смещения пояса) событие перепланируется, а если
+    дата уже сменилась - callbacks вызываются сразу.
     """
+    PREPARE_LEAD = 10 * 60
+
     def __init__(self):
         self._callbacks = []
+        self._prepare_callbacks = []
         self._event = None
+        self._prepare_event = None
+        self._next_midnight = None
+        self._day = None
         self.schedule_next_midnight()
+        time_source.add_jump_listener(self.resync)
 
     def register_callback(self, callback):
         """
@@ -27,24 +40,80 @@ class MidnightUpdateManager:
         if callback in self._callbacks:
             self._callbacks.remove(callback)
 
+    def register_prepare_callback(self, callback):
+        """
+        Регистрирует функцию подготовки следующего дня.
+        Аргументы:
+            callback (callable): функция, принимающая date наступающего дня
+        """
+        if callback not in self._prepare_callbacks:
+            self._prepare_callbacks.append(callback)
+
+    def unregister_prepare_callback(self, callback):
+        """
+        Удаляет ранее зарегистрированный callback подготовки.
+        """
+        if callback in self._prepare_callbacks:
+            self._prepare_callbacks.remove(callback)
+
     def schedule_next_midnight(self):
         """
-        Планирует обновление на ближайшую полночь.
+        Планирует обновление на ближайшую полночь и подготовку к ней.
         """
-        now = datetime.now()
-        next_midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        seconds_until_midnight = (next_midnight - now).total_seconds()
+        now = time_source.now()
+        next_midnight = time_source.at(now.date() + timedelta(days=1))
+        seconds_until_midnight = max(0.0, time_source.seconds_until(next_midnight))
         if self._event:
             self._event.cancel()
+        if self._prepare_event:
+            self._prepare_event.cancel()
+        self._day = now.date()
+        self._next_midnight = next_midnight
         self._event = Clock.schedule_once(self._on_midnight, seconds_until_midnight)
+        self._prepare_event = Clock.schedule_once(
+            self._on_prepare, max(0.0, seconds_until_midnight - self.PREPARE_LEAD)
+        )
+
+    def _on_prepare(self, dt):
+        """
+        Вызывается незадолго до полуночи, передаёт callbacks дату наступающего дня.
+        """
+        day = self._next_midnight.date()
+        for callback in self._prepare_callbacks:
+            try:
+                callback(day)
+            except Exception as e:
+                print(f"Ошибка в callback подготовки к полуночи: {e}")
 
     def _on_midnight(self, dt):
         """
         Вызывается в полночь, вызывает все callbacks и планирует следующее обновление.
         """
+        # Clock может сработать на несколько миллисекунд раньше - тогда досыпаем до полуночи
+        remaining = time_source.seconds_until(self._next_midnight)
+        if remaining > 0:
+            self._event = Clock.schedule_once(self._on_midnight, remaining)
+            return
+        self._new_day()
+
+    def _new_day(self):
+        """
+        Вызывает все callbacks нового дня и планирует следующую полночь.
+        """
         for callback in self._callbacks:
             try:
                 callback()
             except Exception as e:
                 print(f"Ошибка в midnight callback: {e}")
         self.schedule_next_midnight()
+
+    def resync(self):
+        """
+        Вызывается после скачка настенных часов: если дата сменилась (в любую сторону),
+        сразу вызывает callbacks нового дня, иначе перепланирует полночь и подготовку.
+        """
+        if time_source.now().date() != self._day:
+            print(f"[DEBUG] midnight_update_manager: дата сменилась ({self._day} -> {time_source.now().date()})")
+            self._new_day()
+        else:
+            self.schedule_next_midnight()
@@ -0,0 +1,73 @@
+from kivy.clock import Clock
+from kivy.config import Config
+
+
+class PowerModeManager:
+    """
+    Режим энергосбережения для устройств на батарее и безвентиляторных панелей.
+
+    - 'normal': двоеточие мигает, часы обновляются каждые 0.5 секунды
+    - 'low': двоеточие не мигает, часы обновляются только на границе минуты,
+      главный цикл Kivy ограничен LOW_POWER_MAX_FPS кадрами в секунду
+
+    Сам выбор подписок планировщика делает главное окно (apply_power_mode),
+    здесь хранится только текущий режим и частота кадров главного цикла.
+
+    Kivy читает graphics/maxfps из Config только при создании Clock, публичного
+    способа поменять частоту работающего цикла нет. Поэтому значение пишется
+    и в Config (для всего, что читает настройку), и в Clock._max_fps - только
+    если такой атрибут есть в текущей версии Kivy.
+    """
+    MODES = ('normal', 'low')
+    LABELS = {
+        'normal': 'Normal',
+        'low': 'Enerjiyə qənaət',
+    }
+    # Частота кадров в режиме энергосбережения: реже будим процессор,
+    # но касания всё ещё обрабатываются с задержкой не более 0.25 с
+    LOW_POWER_MAX_FPS = 4
+
+    def __init__(self):
+        self.mode = 'normal'
+        self._normal_max_fps = None
+
+    @classmethod
+    def normalize(cls, mode):
+        """Возвращает корректный режим (неизвестные значения - 'normal')"""
+        return mode if mode in cls.MODES else 'normal'
+
+    @classmethod
+    def mode_from_label(cls, label):
+        """Находит режим по подписи из окна настроек"""
+        for mode, mode_label in cls.LABELS.items():
+            if mode_label == label:
+                return mode
+        return 'normal'
+
+    def is_low_power(self):
+        return self.mode == 'low'
+
+    def apply(self, mode):
+        """
+        Включает режим и меняет частоту кадров главного цикла Kivy.
+        Returns:
+            str: применённый режим
+        """
+        self.mode = self.normalize(mode)
+        if self._normal_max_fps is None:
+            self._normal_max_fps = Config.getint('graphics', 'maxfps')
+        if self.mode == 'low':
+            max_fps = min(self._normal_max_fps or self.LOW_POWER_MAX_FPS, self.LOW_POWER_MAX_FPS)
+        else:
+            max_fps = self._normal_max_fps
+        Config.set('graphics', 'maxfps', str(max_fps))
+        if hasattr(Clock, '_max_fps'):
+            Clock._max_fps = float(max_fps)
+        else:
+            print("[DEBUG] power_mode: Clock без _max_fps, частота кадров не меняется до перезапуска")
+        print(f"[DEBUG] power_mode: режим '{self.mode}', maxfps = {max_fps}")
+        return self.mode
+
+
+# Создаем глобальный экземпляр для использования в других модулях
+power_mode_manager = PowerModeManager()
@@ -0,0 +1,162 @@
+"""
+HTTP-клиент для api.aladhan.com.
+
+- Общая requests.Session с keep-alive (одно TCP-соединение на все запросы)
+- Повторы с экспоненциальной задержкой и случайным разбросом (full jitter)
+- Условные запросы (ETag / If-Modified-Since), 304 отдаёт сохранённый ответ
+- Circuit breaker: после серии ошибок запросы не выполняются до истечения паузы,
+  а вызывающий код использует данные из кэша
+
+Расписание повторов записывается в retry_log (последние RETRY_LOG_SIZE попыток),
+поэтому его можно проверить на локальном тестовом HTTP-сервере.
+"""
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Сколько последних попыток хранит retry_log (клиент живёт всё время работы приложения)
+RETRY_LOG_SIZE = 100
+
+
+class CircuitOpenError(Exception):
+    """Запрос не выполнен: circuit breaker открыт после серии ошибок"""
+
+
+class PrayerApiClient:
+    def __init__(self, timeout=10, max_retries=3, backoff_base=1.0, backoff_max=60.0,
+                 failure_threshold=3, cooldown=300.0, sleep=None, rng=None):
+        """
+        Args:
+            timeout: таймаут одного HTTP-запроса в секундах
+            max_retries: сколько раз повторять запрос после первой ошибки
+            backoff_base: базовая задержка перед повтором (секунды)
+            backoff_max: максимальная задержка перед повтором
+            failure_threshold: сколько неудачных вызовов подряд открывают circuit breaker
+            cooldown: сколько секунд breaker остаётся открытым
+            sleep: функция ожидания (по умолчанию прерываемое ожидание, см. close())
+            rng: генератор случайных чисел для jitter (random.Random)
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._closed = threading.Event()
+        self._sleep = sleep or self._closed.wait
+        self._rng = rng or random.Random()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Условные запросы: {(url, params): {'etag', 'last_modified', 'data'}}
+        self._conditional_cache = {}
+
+        # Состояние circuit breaker
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+
+        # Наблюдаемость: журнал попыток и счётчики
+        self.retry_log = deque(maxlen=RETRY_LOG_SIZE)
+        self.stats = {
+            'requests': 0,
+            'retries': 0,
+            'not_modified': 0,
+            'failures': 0,
+            'short_circuited': 0,
+        }
+
+    def backoff_delay(self, attempt):
+        """Задержка перед повтором номер attempt (0, 1, 2...) с full jitter"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return self._rng.uniform(0, ceiling)
+
+    def is_open(self):
+        """True, если breaker открыт и запросы сейчас не выполняются"""
+        return time.monotonic() < self._open_until
+
+    def get_json(self, url, params=None):
+        """
+        Выполняет GET с повторами и возвращает разобранный JSON.
+        Raises:
+            CircuitOpenError: breaker открыт, нужно использовать кэш
+            requests.RequestException / ValueError: все попытки завершились ошибкой
+        """
+        if self.is_open():
+            self.stats['short_circuited'] += 1
+            raise CircuitOpenError(f"circuit open for {self._open_until - time.monotonic():.0f} s")
+
+        key = (url, tuple(sorted((params or {}).items())))
+        cached = self._conditional_cache.get(key)
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            if self._closed.is_set():
+                break
+            headers = {}
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+            entry = {'url': url, 'attempt': attempt, 'time': time.monotonic(), 'status': None, 'delay': None}
+            self.retry_log.append(entry)
+            self.stats['requests'] += 1
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+                entry['status'] = response.status_code
+                if response.status_code == 304 and cached:
+                    self.stats['not_modified'] += 1
+                    self._record_success()
+                    return cached['data']
+                if response.status_code == 200:
+                    data = response.json()
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                    if etag or last_modified:
+                        self._conditional_cache[key] = {
+                            'etag': etag,
+                            'last_modified': last_modified,
+                            'data': data,
+                        }
+                    self._record_success()
+                    return data
+                # 4xx (кроме 429) повторять бессмысленно
+                if 400 <= response.status_code < 500 and response.status_code != 429:
+                    last_error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+                    break
+                last_error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            except (requests.RequestException, ValueError) as e:
+                entry['status'] = type(e).__name__
+                last_error = e
+
+            if attempt < self.max_retries:
+                delay = self.backoff_delay(attempt)
+                entry['delay'] = delay
+                self.stats['retries'] += 1
+                self._sleep(delay)
+
+        self._record_failure()
+        raise last_error or requests.RequestException("request cancelled")
+
+    def _record_success(self):
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+
+    def _record_failure(self):
+        self.stats['failures'] += 1
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.failure_threshold:
+            self._open_until = time.monotonic() + self.cooldown
+            print(f"[DEBUG] prayer_api_client: circuit breaker открыт на {self.cooldown:.0f} с")
+
+    def close(self):
+        """Прерывает ожидание между повторами и закрывает соединения"""
+        self._closed.set()
+        self.session.close()
@@ -1,5 +1,97 @@
-from datetime import datetime, timedelta, time
-from typing import Dict, Optional
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta, time, date
+from typing import Dict, List, Optional
+
+# Следующая молитва: ключ, время "HH:MM", минута суток и смещение дня (0 - сегодня, 1 - завтра)
+NextPrayer = namedtuple('NextPrayer', 'key time minute day_offset')
+
+
+def time_str_to_minutes(time_str: str) -> Optional[int]:
+    """Преобразует "HH:MM" в минуту суток (без strptime)"""
+    try:
+        hours, minutes = time_str[:5].split(':')
+        return int(hours) * 60 + int(minutes)
+    except (ValueError, AttributeError):
+        return None
+
+
+class DailySchedule:
+    """
+    Расписание молитв на один день, построенное один раз.
+    Хранит отсортированный массив минут суток и отвечает на вопросы
+    "текущая", "следующая" и "сколько осталось" через bisect.
+    После последней молитвы дня следующей считается первая молитва завтра.
+    """
+    def __init__(self, day: date, today_times: Dict[str, str], tomorrow_times: Optional[Dict[str, str]] = None):
+        self.day = day
+        self.times = dict(today_times)
+        entries = []
+        for key, time_str in today_times.items():
+            minute = time_str_to_minutes(time_str)
+            if minute is not None:
+                entries.append((minute, key))
+        entries.sort()
+        self.minutes: List[int] = [minute for minute, _ in entries]
+        self.keys: List[str] = [key for _, key in entries]
+
+        # Первая молитва завтрашнего дня (для перехода через полночь)
+        self._tomorrow_first = None
+        if tomorrow_times:
+            tomorrow_entries = sorted(
+                (minute, key) for key, minute in
+                ((key, time_str_to_minutes(value)) for key, value in tomorrow_times.items())
+                if minute is not None
+            )
+            if tomorrow_entries:
+                minute, key = tomorrow_entries[0]
+                self._tomorrow_first = NextPrayer(key, tomorrow_times[key][:5], minute, 1)
+
+    @staticmethod
+    def _now_seconds(now: Optional[datetime]) -> float:
+        if now is None:
+            now = datetime.now()
+        return now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+
+    def current(self, now: Optional[datetime] = None) -> Optional[str]:
+        """Ключ текущей молитвы (последней наступившей); до первой молитвы - последняя молитва дня"""
+        if not self.keys:
+            return None
+        index = bisect_right(self.minutes, int(self._now_seconds(now) // 60))
+        return self.keys[index - 1] if index else self.keys[-1]
+
+    def next(self, now: Optional[datetime] = None) -> Optional[NextPrayer]:
+        """Следующая молитва после текущего момента (с учётом перехода на завтра)"""
+        if not self.keys:
+            return None
+        index = bisect_right(self.minutes, int(self._now_seconds(now) // 60))
+        if index < len(self.keys):
+            key = self.keys[index]
+            return NextPrayer(key, self.times[key][:5], self.minutes[index], 0)
+        if self._tomorrow_first is not None:
+            return self._tomorrow_first
+        key = self.keys[0]
+        return NextPrayer(key, self.times[key][:5], self.minutes[0], 1)
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> Optional[int]:
+        """Сколько целых секунд осталось до следующей молитвы"""
+        upcoming = self.next(now)
+        if upcoming is None:
+            return None
+        target = upcoming.minute * 60 + upcoming.day_offset * 86400
+        return int(target - self._now_seconds(now))
+
+    def time_until_next(self, now: Optional[datetime] = None) -> str:
+        """Оставшееся время до следующей молитвы в формате HH:MM"""
+        seconds = self.seconds_until_next(now)
+        if seconds is None:
+            return '00:00'
+        return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}"
+
+    def is_before_next(self, window_seconds: int, now: Optional[datetime] = None) -> bool:
+        """True, если до следующей молитвы осталось не больше window_seconds (и больше 0)"""
+        seconds = self.seconds_until_next(now)
+        return seconds is not None and 0 < seconds <= window_seconds
 
 class PrayerTimeCalculator:
     def __init__(self):
@@ -0,0 +1,459 @@
+"""
+Локальный астрономический расчёт времён молитв.
+
+Вычисляет Fajr/Sunrise/Dhuhr/Asr/Maghrib/Isha/Midnight по координатам,
+часовому поясу и методу расчёта (номера методов совпадают с api.aladhan.com).
+Сеть не используется, поэтому год данных считается за миллисекунды.
+"""
+import math
+from datetime import datetime, timedelta
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    ZoneInfo = None
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy используется построчный расчёт
+    np = None
+
+# Методы расчёта: углы Fajr/Isha и поправки в минутах (как в aladhan)
+METHODS = {
+    1: {'name': 'Karachi', 'fajr': 18, 'isha': 18},
+    2: {'name': 'ISNA', 'fajr': 15, 'isha': 15},
+    3: {'name': 'MWL', 'fajr': 18, 'isha': 17},
+    4: {'name': 'Makkah', 'fajr': 18.5, 'isha_minutes': 90},
+    5: {'name': 'Egypt', 'fajr': 19.5, 'isha': 17.5},
+    7: {'name': 'Tehran', 'fajr': 17.7, 'isha': 14, 'maghrib': 4.5, 'midnight': 'Jafari'},
+    8: {'name': 'Gulf', 'fajr': 19.5, 'isha_minutes': 90},
+    9: {'name': 'Kuwait', 'fajr': 18, 'isha': 17.5},
+    10: {'name': 'Qatar', 'fajr': 18, 'isha_minutes': 90},
+    11: {'name': 'Singapore', 'fajr': 20, 'isha': 18},
+    12: {'name': 'France', 'fajr': 12, 'isha': 12},
+    13: {
+        'name': 'Diyanet',
+        'fajr': 18,
+        'isha': 17,
+        'offsets': {'Sunrise': -7, 'Dhuhr': 5, 'Asr': 4, 'Maghrib': 7},
+    },
+    14: {'name': 'Russia', 'fajr': 16, 'isha': 15},
+}
+
+# Названия методов для выбора по имени
+METHOD_NAMES = {params['name'].lower(): number for number, params in METHODS.items()}
+
+# Угол восхода/захода с учётом рефракции и радиуса диска
+SUNRISE_ANGLE = 0.833
+
+# Ближайшая широта (NearestLatitude): в дни без восхода/захода или Asr (полярный день
+# и ночь) времена по углам Солнца считаются для этой широты
+NEAREST_LATITUDE = 64.0
+
+
+def _sin(d):
+    return math.sin(math.radians(d))
+
+
+def _cos(d):
+    return math.cos(math.radians(d))
+
+
+def _tan(d):
+    return math.tan(math.radians(d))
+
+
+def _arcsin(x):
+    return math.degrees(math.asin(x))
+
+
+def _arccos(x):
+    return math.degrees(math.acos(x))
+
+
+def _arccot(x):
+    return math.degrees(math.atan(1 / x))
+
+
+def _arctan2(y, x):
+    return math.degrees(math.atan2(y, x))
+
+
+def _fix_angle(a):
+    return a - 360.0 * math.floor(a / 360.0)
+
+
+def _fix_hour(a):
+    if math.isnan(a):
+        return a
+    return a - 24.0 * math.floor(a / 24.0)
+
+
+def julian_day(year, month, day):
+    """Юлианская дата на полночь по Гринвичу"""
+    if month <= 2:
+        year -= 1
+        month += 12
+    a = year // 100
+    b = 2 - a + a // 4
+    return math.floor(365.25 * (year + 4716)) + math.floor(30.6001 * (month + 1)) + day + b - 1524.5
+
+
+def sun_position(jd):
+    """
+    Положение Солнца для юлианской даты
+    Returns:
+        tuple: (склонение в градусах, уравнение времени в часах)
+    """
+    d = jd - 2451545.0
+    g = _fix_angle(357.529 + 0.98560028 * d)
+    q = _fix_angle(280.459 + 0.98564736 * d)
+    l = _fix_angle(q + 1.915 * _sin(g) + 0.020 * _sin(2 * g))
+    e = 23.439 - 0.00000036 * d
+    ra = _arctan2(_cos(e) * _sin(l), _cos(l)) / 15.0
+    equation = q / 15.0 - _fix_hour(ra)
+    declination = _arcsin(_sin(e) * _sin(l))
+    return declination, equation
+
+
+def format_minutes(value):
+    """Переводит часы (float) в строку 'HH:MM' с округлением до минуты"""
+    if value is None or math.isnan(value):
+        return '00:00'
+    total = int(math.floor(_fix_hour(value + 0.5 / 60.0) * 60))
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+# Таблица строк 'HH:MM' для всех минут суток (быстрое форматирование массивов)
+HHMM_TABLE = [f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)]
+
+# Юлианская дата полуночи для date.toordinal() == 0
+ORDINAL_TO_JD = 1721424.5
+
+
+def sun_position_array(jd):
+    """Векторная версия sun_position для массива юлианских дат"""
+    d = jd - 2451545.0
+    g = np.mod(357.529 + 0.98560028 * d, 360.0)
+    q = np.mod(280.459 + 0.98564736 * d, 360.0)
+    l = np.mod(q + 1.915 * np.sin(np.radians(g)) + 0.020 * np.sin(np.radians(2 * g)), 360.0)
+    e = np.radians(23.439 - 0.00000036 * d)
+    l_rad = np.radians(l)
+    ra = np.degrees(np.arctan2(np.cos(e) * np.sin(l_rad), np.cos(l_rad))) / 15.0
+    equation = q / 15.0 - np.mod(ra, 24.0)
+    declination = np.degrees(np.arcsin(np.sin(e) * np.sin(l_rad)))
+    return declination, equation
+
+
+def resolve_method(method):
+    """Возвращает номер метода по номеру или названию ('Diyanet', 13, '13')"""
+    if isinstance(method, str):
+        if method.isdigit():
+            method = int(method)
+        else:
+            method = METHOD_NAMES.get(method.lower())
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод расчёта: {method}")
+    return method
+
+
+class PrayerTimeEngine:
+    """
+    Локальный движок расчёта времён молитв (алгоритм PrayTimes,
+    совместимый с api.aladhan.com).
+    """
+    prayer_times = [
+        "Midnight",
+        "Fajr",
+        "Sunrise",
+        "Dhuhr",
+        "Asr",
+        "Maghrib",
+        "Isha"
+    ]
+
+    def __init__(self, latitude, longitude, timezone, method=13, asr_factor=1, elevation=0):
+        """
+        Args:
+            latitude, longitude: координаты в градусах
+            timezone: имя IANA ('Asia/Baku') или смещение от UTC в часах
+            method: номер или название метода расчёта
+            asr_factor: 1 - стандартный Asr, 2 - ханафитский
+            elevation: высота над уровнем моря в метрах
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.timezone = timezone
+        self.method = resolve_method(method)
+        self.params = METHODS[self.method]
+        self.asr_factor = asr_factor
+        self.elevation = elevation
+        self._tz = ZoneInfo(timezone) if isinstance(timezone, str) and ZoneInfo else None
+
+    def utc_offset(self, day):
+        """Смещение часового пояса в часах для указанной даты (с учётом DST)"""
+        if self._tz is None:
+            return float(self.timezone)
+        noon = datetime(day.year, day.month, day.day, 12, tzinfo=self._tz)
+        return noon.utcoffset().total_seconds() / 3600.0
+
+    def _rise_set_angle(self):
+        return SUNRISE_ANGLE + 0.0347 * math.sqrt(self.elevation)
+
+    def _mid_day(self, jd, t):
+        _, equation = sun_position(jd + t)
+        return _fix_hour(12 - equation)
+
+    def _nearest_latitude(self):
+        return math.copysign(min(abs(self.latitude), NEAREST_LATITUDE), self.latitude)
+
+    def _sun_angle_time(self, jd, angle, t, ccw=False, latitude=None):
+        if latitude is None:
+            latitude = self.latitude
+        declination, _ = sun_position(jd + t)
+        noon = self._mid_day(jd, t)
+        cos_h = (-_sin(angle) - _sin(declination) * _sin(latitude)) / \
+            (_cos(declination) * _cos(latitude))
+        if cos_h < -1 or cos_h > 1:
+            return float('nan')
+        hour_angle = _arccos(cos_h) / 15.0
+        return noon - hour_angle if ccw else noon + hour_angle
+
+    def _asr_time(self, jd, t, latitude):
+        declination, _ = sun_position(jd + t)
+        angle = -_arccot(self.asr_factor + _tan(abs(latitude - declination)))
+        return self._sun_angle_time(jd, angle, t, latitude=latitude)
+
+    def _solar_hours(self, jd, latitude):
+        """
+        Времена по солнечному времени для широты latitude
+        Returns:
+            tuple: (fajr, sunrise, dhuhr, asr, sunset, maghrib, isha), NaN - угол не достигается
+        """
+        rise_set = self._rise_set_angle()
+        # Начальные приближения (доли суток), одна итерация как в PrayTimes
+        fajr = self._sun_angle_time(jd, self.params['fajr'], 5 / 24.0, ccw=True, latitude=latitude)
+        sunrise = self._sun_angle_time(jd, rise_set, 6 / 24.0, ccw=True, latitude=latitude)
+        dhuhr = self._mid_day(jd, 12 / 24.0)
+        asr = self._asr_time(jd, 13 / 24.0, latitude)
+        sunset = self._sun_angle_time(jd, rise_set, 18 / 24.0, latitude=latitude)
+        if 'maghrib' in self.params:
+            maghrib = self._sun_angle_time(jd, self.params['maghrib'], 18 / 24.0, latitude=latitude)
+        else:
+            maghrib = sunset
+        if 'isha' in self.params:
+            isha = self._sun_angle_time(jd, self.params['isha'], 18 / 24.0, latitude=latitude)
+        else:
+            isha = maghrib + self.params['isha_minutes'] / 60.0
+        return fajr, sunrise, dhuhr, asr, sunset, maghrib, isha
+
+    def compute_hours(self, day):
+        """
+        Вычисляет времена молитв в часах местного времени (float, без округления)
+        Args:
+            day: date или datetime
+        Returns:
+            dict: {prayer: часы}
+        """
+        jd = julian_day(day.year, day.month, day.day) - self.longitude / (15.0 * 24.0)
+        fajr, sunrise, dhuhr, asr, sunset, maghrib, isha = self._solar_hours(jd, self.latitude)
+        # Полярный день/ночь: восход, заход или Asr не существуют - NearestLatitude
+        if any(math.isnan(value) for value in (sunrise, asr, sunset)):
+            fajr, sunrise, dhuhr, asr, sunset, maghrib, isha = self._solar_hours(jd, self._nearest_latitude())
+
+        # Переводим из солнечного времени в местное
+        shift = self.utc_offset(day) - self.longitude / 15.0
+        fajr, sunrise, dhuhr, asr, sunset, maghrib, isha = (
+            value + shift for value in (fajr, sunrise, dhuhr, asr, sunset, maghrib, isha)
+        )
+
+        # Коррекция для высоких широт (AngleBased)
+        night = _fix_hour(sunrise - sunset)
+        fajr_portion = self.params['fajr'] / 60.0 * night
+        if math.isnan(fajr) or _fix_hour(sunrise - fajr) > fajr_portion:
+            fajr = sunrise - fajr_portion
+        if 'isha' in self.params:
+            isha_portion = self.params['isha'] / 60.0 * night
+            if math.isnan(isha) or _fix_hour(isha - sunset) > isha_portion:
+                isha = sunset + isha_portion
+        if 'maghrib' in self.params:
+            maghrib_portion = self.params['maghrib'] / 60.0 * night
+            if math.isnan(maghrib) or _fix_hour(maghrib - sunset) > maghrib_portion:
+                maghrib = sunset + maghrib_portion
+
+        # Полночь: середина между заходом и восходом (Jafari - между заходом и Fajr)
+        if self.params.get('midnight') == 'Jafari':
+            midnight = sunset + _fix_hour(fajr - sunset) / 2.0
+        else:
+            midnight = sunset + night / 2.0
+
+        hours = {
+            'Midnight': midnight,
+            'Fajr': fajr,
+            'Sunrise': sunrise,
+            'Dhuhr': dhuhr,
+            'Asr': asr,
+            'Maghrib': maghrib,
+            'Isha': isha,
+        }
+        for prayer, minutes in self.params.get('offsets', {}).items():
+            hours[prayer] += minutes / 60.0
+        return hours
+
+    def compute_day(self, day):
+        """
+        Вычисляет времена молитв на один день
+        Args:
+            day: date или datetime
+        Returns:
+            dict: {"Midnight": "HH:MM", "Fajr": "HH:MM", ...}
+        """
+        hours = self.compute_hours(day)
+        return {prayer: format_minutes(hours[prayer]) for prayer in self.prayer_times}
+
+    def _sun_angle_time_array(self, jd, angle, t, ccw=False, latitude=None):
+        if latitude is None:
+            latitude = self.latitude
+        declination, equation = sun_position_array(jd + t)
+        noon = np.mod(12 - equation, 24.0)
+        decl = np.radians(declination)
+        lat = math.radians(latitude)
+        cos_h = (-np.sin(np.radians(angle)) - np.sin(decl) * math.sin(lat)) / (np.cos(decl) * math.cos(lat))
+        with np.errstate(invalid='ignore'):
+            hour_angle = np.degrees(np.arccos(cos_h)) / 15.0
+        return noon - hour_angle if ccw else noon + hour_angle
+
+    def _solar_hours_array(self, jd, latitude):
+        """Векторная версия _solar_hours для массива юлианских дат"""
+        rise_set = self._rise_set_angle()
+        fajr = self._sun_angle_time_array(jd, self.params['fajr'], 5 / 24.0, ccw=True, latitude=latitude)
+        sunrise = self._sun_angle_time_array(jd, rise_set, 6 / 24.0, ccw=True, latitude=latitude)
+        dhuhr = np.mod(12 - sun_position_array(jd + 12 / 24.0)[1], 24.0)
+        asr_declination, _ = sun_position_array(jd + 13 / 24.0)
+        asr_angle = -np.degrees(np.arctan(
+            1 / (self.asr_factor + np.tan(np.radians(np.abs(latitude - asr_declination)))))
+        )
+        asr = self._sun_angle_time_array(jd, asr_angle, 13 / 24.0, latitude=latitude)
+        sunset = self._sun_angle_time_array(jd, rise_set, 18 / 24.0, latitude=latitude)
+        if 'maghrib' in self.params:
+            maghrib = self._sun_angle_time_array(jd, self.params['maghrib'], 18 / 24.0, latitude=latitude)
+        else:
+            maghrib = sunset
+        if 'isha' in self.params:
+            isha = self._sun_angle_time_array(jd, self.params['isha'], 18 / 24.0, latitude=latitude)
+        else:
+            isha = maghrib + self.params['isha_minutes'] / 60.0
+        return fajr, sunrise, dhuhr, asr, sunset, maghrib, isha
+
+    def compute_range_hours(self, start, end):
+        """
+        Векторно (NumPy) вычисляет времена молитв для диапазона дат.
+        Склонение, уравнение времени и часовые углы считаются массивами
+        сразу для всех дней, без цикла по дням.
+        Args:
+            start, end: первая и последняя дата включительно
+        Returns:
+            tuple: (список дат, {prayer: numpy-массив часов})
+        """
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+        count = (end - start).days + 1
+        if count <= 0:
+            return [], {prayer: np.empty(0) for prayer in self.prayer_times}
+        days = [start + timedelta(days=offset) for offset in range(count)]
+        jd = np.arange(count, dtype=float) + (start.toordinal() + ORDINAL_TO_JD) - self.longitude / 360.0
+        hours = self._solar_hours_array(jd, self.latitude)
+        # Полярный день/ночь: для этих дней - NearestLatitude, как в compute_hours
+        polar = np.isnan(hours[1]) | np.isnan(hours[3]) | np.isnan(hours[4])
+        if polar.any():
+            nearest = self._solar_hours_array(jd, self._nearest_latitude())
+            hours = tuple(np.where(polar, near, value) for near, value in zip(nearest, hours))
+        fajr, sunrise, dhuhr, asr, sunset, maghrib, isha = hours
+
+        # Смещение часового пояса меняется только на переходах DST
+        if self._tz is None:
+            offsets = float(self.timezone)
+        else:
+            offsets = np.array([self.utc_offset(day) for day in days])
+        shift = offsets - self.longitude / 15.0
+        fajr, sunrise, dhuhr, asr, sunset, maghrib, isha = (
+            value + shift for value in (fajr, sunrise, dhuhr, asr, sunset, maghrib, isha)
+        )
+
+        # Коррекция для высоких широт (AngleBased)
+        night = np.mod(sunrise - sunset, 24.0)
+        fajr_portion = self.params['fajr'] / 60.0 * night
+        with np.errstate(invalid='ignore'):
+            fajr = np.where(np.isnan(fajr) | (np.mod(sunrise - fajr, 24.0) > fajr_portion),
+                            sunrise - fajr_portion, fajr)
+            if 'isha' in self.params:
+                isha_portion = self.params['isha'] / 60.0 * night
+                isha = np.where(np.isnan(isha) | (np.mod(isha - sunset, 24.0) > isha_portion),
+                                sunset + isha_portion, isha)
+            if 'maghrib' in self.params:
+                maghrib_portion = self.params['maghrib'] / 60.0 * night
+                maghrib = np.where(np.isnan(maghrib) | (np.mod(maghrib - sunset, 24.0) > maghrib_portion),
+                                   sunset + maghrib_portion, maghrib)
+
+        if self.params.get('midnight') == 'Jafari':
+            midnight = sunset + np.mod(fajr - sunset, 24.0) / 2.0
+        else:
+            midnight = sunset + night / 2.0
+
+        hours = {
+            'Midnight': midnight,
+            'Fajr': fajr,
+            'Sunrise': sunrise,
+            'Dhuhr': dhuhr,
+            'Asr': asr,
+            'Maghrib': maghrib,
+            'Isha': isha,
+        }
+        for prayer, minutes in self.params.get('offsets', {}).items():
+            hours[prayer] = hours[prayer] + minutes / 60.0
+        return days, hours
+
+    def compute_range_rows(self, start, end):
+        """
+        Вычисляет строки для таблицы prayer_times на диапазон дат
+        Args:
+            start, end: первая и последняя дата включительно
+        Returns:
+            list: [(date_str, Midnight, Fajr, Sunrise, Dhuhr, Asr, Maghrib, Isha), ...]
+        """
+        if np is None:
+            if isinstance(start, datetime):
+                start = start.date()
+            if isinstance(end, datetime):
+                end = end.date()
+            data = self.compute_days(start, (end - start).days + 1)
+            return [(date_str,) + tuple(times[p] for p in self.prayer_times) for date_str, times in data.items()]
+
+        days, hours = self.compute_range_hours(start, end)
+        columns = []
+        for prayer in self.prayer_times:
+            values = hours[prayer]
+            minutes = np.floor(np.mod(np.nan_to_num(values) + 0.5 / 60.0, 24.0) * 60).astype(int) % (24 * 60)
+            minutes[np.isnan(values)] = 0
+            columns.append([HHMM_TABLE[m] for m in minutes.tolist()])
+        dates = [day.strftime('%Y-%m-%d') for day in days]
+        return list(zip(dates, *columns))
+
+    def compute_days(self, start, days):
+        """
+        Вычисляет времена молитв на несколько дней подряд
+        Args:
+            start: первая дата (date или datetime)
+            days: количество дней
+        Returns:
+            dict: {'YYYY-MM-DD': {prayer: 'HH:MM'}}
+        """
+        if isinstance(start, datetime):
+            start = start.date()
+        result = {}
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            result[day.strftime('%Y-%m-%d')] = self.compute_day(day)
+        return result
@@ -1,18 +1,47 @@
-import requests
-import json
-from datetime import datetime, timedelta
+import random
+import calendar
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date as date_cls, timedelta
 from data.database import SettingsDatabase
 from kivy.clock import Clock
-
-from kivy.clock import Clock
+from logic.prayer_time_engine import PrayerTimeEngine
+from logic.prayer_api_client import PrayerApiClient, CircuitOpenError
+from logic.lru_cache import DateLRUCache
+from logic.prayer_time_calculator import DailySchedule
+from logic.lazy_service import LazyService
 
 class PrayerTimesManager:
     def __init__(self):
         self._listeners = []
         self.api_url = "http://api.aladhan.com/v1/timingsByCity"
+        self.calendar_api_url = "http://api.aladhan.com/v1/calendarByCity"
         self.city = "baku"
         self.country = "AZ"
         self.method = 13  # Method 13 is for Azerbaijan
+        # Координаты и часовой пояс для локального расчёта (Баку)
+        self.latitude = 40.4093
+        self.longitude = 49.8671
+        self.timezone = 'Asia/Baku'
+        # API используется только для сверки с локальным расчётом
+        self.api_cross_check = False
+        self.engine = PrayerTimeEngine(self.latitude, self.longitude, self.timezone, self.method)
+        # Предзагрузка: месяц или год целиком, когда кэш вперёд меньше горизонта
+        self.prefetch_mode = 'month'  # 'month' или 'year'
+        self.prefetch_horizon_days = 7
+        self.use_api_calendar = False  # True - брать месяц/год из API calendar
+        self.cache_max_age_days = 400
+        self._calendar_request = None
+        # Сетевые запросы выполняются только в рабочем потоке
+        self.request_timeout = 10  # секунд на один HTTP-запрос
+        self.api_client = PrayerApiClient(timeout=self.request_timeout)
+        # Автообновление: экспоненциальная задержка с jitter вместо фиксированных 15 с
+        self.auto_update_base_delay = 15
+        self.auto_update_max_delay = 15 * 60
+        self._auto_update_attempt = 0
+        self._executor = None
+        self._pending_requests = set()
+        self._stop_event = threading.Event()
         self.prayer_times = [
             "Midnight",
             "Fajr",
@@ -22,8 +51,13 @@ class PrayerTimesManager:
             "Maghrib",
             "Isha"
         ]
+        # Кэш в памяти перед SQLite: сбрасывается при записи в базу и в полночь
+        self._times_cache = DateLRUCache(maxsize=32)
+        self._cache_day = None
+        self._schedule = None  # общий DailySchedule на текущий день
         self.db = SettingsDatabase()
         self._auto_update_event = None
+        self._started = False
         self._setup_database()
 
     def add_update_listener(self, callback):
@@ -45,7 +79,7 @@ class PrayerTimesManager:
 
     def _setup_database(self):
         """Создает таблицу для хранения времён молитв"""
-        self.db.cursor.execute('''
+        self.db.execute('''
             CREATE TABLE IF NOT EXISTS prayer_times (
                 date TEXT PRIMARY KEY,
                 Midnight TEXT,
@@ -58,9 +92,17 @@ class PrayerTimesManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        self.db.connection.commit()
         print("[DEBUG] prayer_times: таблица создана или уже существует")
-        # Сразу инициируем обновление времён после создания базы
+
+    def start(self):
+        """
+        Первичное обновление времён молитв. Приложение вызывает его после первого кадра,
+        чтобы создание менеджера не задерживало появление окна.
+        """
+        if self._started:
+            return
+        self._started = True
+        print("[DEBUG] prayer_times: start, первичное обновление")
         self.update_prayer_times()
         # Если после первого обновления в базе только нули — запустить автообновление
         today_times = self.get_prayer_times()
@@ -79,8 +121,7 @@ class PrayerTimesManager:
             date_str = date.strftime('%Y-%m-%d')
             
             # Проверяем наличие данных в базе
-            self.db.cursor.execute('SELECT * FROM prayer_times WHERE date = ?', (date_str,))
-            result = self.db.cursor.fetchone()
+            result = self.db.fetchone('SELECT * FROM prayer_times WHERE date = ?', (date_str,))
             
             if result and self._is_valid_cache(result):
                 # Данные есть в базе и они актуальны
@@ -98,8 +139,8 @@ class PrayerTimesManager:
             print("[DEBUG] prayer_times: данные за два дня найдены в базе, пропускаем запрос к API")
             return prayer_times_data
             
-        # Если данных нет или они устарели, запрашиваем из API
-        print("[DEBUG] prayer_times: запрашиваем данные из API")
+        # Если данных нет или они устарели, считаем локально (без сети)
+        print("[DEBUG] prayer_times: локальный расчёт времён молитв")
         for offset in range(2):  # 0 = сегодня, 1 = завтра
             date = today + timedelta(days=offset)
             date_str = date.strftime('%Y-%m-%d')
@@ -108,57 +149,136 @@ class PrayerTimesManager:
             if date_str in prayer_times_data:
                 continue
                 
-            params = {
-                'city': self.city,
-                'country': self.country,
-                'method': self.method,
-            }
-            api_date_str = date.strftime('%d-%m-%Y')
-            url = f"{self.api_url}/{api_date_str}"
-            print(f"[DEBUG] prayer_times: API url={url} params={params}")
+            current_times = self.engine.compute_day(date)
+            print(f"[DEBUG] prayer_times: локально {date_str} current_times={current_times}")
+            prayer_times_data[date_str] = current_times
+            if self.api_cross_check:
+                self._cross_check_with_api(date, current_times)
+                
+        return prayer_times_data
+
+    def _fetch_api_times(self, date):
+        """
+        Запрашивает времена молитв из API на одну дату
+        Returns:
+            dict или None: времена молитв или None при ошибке
+        """
+        params = {
+            'city': self.city,
+            'country': self.country,
+            'method': self.method,
+        }
+        api_date_str = date.strftime('%d-%m-%Y')
+        url = f"{self.api_url}/{api_date_str}"
+        print(f"[DEBUG] prayer_times: API url={url} params={params}")
+        try:
+            data = self.api_client.get_json(url, params)
+            if data['code'] == 200:
+                times = data['data']['timings']
+                return {prayer: times[prayer] for prayer in self.prayer_times}
+        except CircuitOpenError as e:
+            print(f"[DEBUG] prayer_times: API пропущен ({e}), используем кэш")
+        except Exception as e:
+            print(f"Error fetching prayer times for {date}: {str(e)}")
+        return None
+
+    def _run_in_background(self, func, on_done, *args):
+        """
+        Выполняет сетевую функцию в рабочем потоке, а результат передаёт
+        в on_done уже в главном потоке Kivy через Clock.schedule_once.
+        Returns:
+            Future или None, если менеджер остановлен
+        """
+        if self._stop_event.is_set():
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prayer-times-net')
+        future = self._executor.submit(func, *args)
+        self._pending_requests.add(future)
+
+        def _done(fut):
+            self._pending_requests.discard(fut)
+            if fut.cancelled() or self._stop_event.is_set():
+                return
             try:
-                response = requests.get(url, params=params)
-                print(f"[DEBUG] prayer_times: API {date_str} params={params} status_code={response.status_code}")
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"[DEBUG] prayer_times: API parsed response: {data}")
-                    if data['code'] == 200:
-                        times = data['data']['timings']
-                        current_times = {prayer: times[prayer] for prayer in self.prayer_times}
-                        print(f"[DEBUG] prayer_times: API {date_str} current_times={current_times}")
-                        prayer_times_data[date_str] = current_times
+                result = fut.result()
             except Exception as e:
-                print(f"Error fetching prayer times for {date}: {str(e)}")
+                print(f"PrayerTimesManager: ошибка в фоновом запросе: {e}")
+                result = None
+            Clock.schedule_once(lambda dt: on_done(result), 0)
+
+        future.add_done_callback(_done)
+        return future
+
+    def shutdown(self):
+        """Отменяет ожидающие запросы и останавливает рабочий поток (вызывается при закрытии приложения)"""
+        print(f"[DEBUG] prayer_times: shutdown, отменяем {len(self._pending_requests)} запросов")
+        self._stop_event.set()
+        self.stop_auto_update()
+        for future in list(self._pending_requests):
+            future.cancel()
+        self.api_client.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _cross_check_with_api(self, date, local_times):
+        """Запускает фоновую сверку локального расчёта с API"""
+        return self._run_in_background(
+            self._fetch_api_times,
+            lambda api_times: self._compare_with_api(date, local_times, api_times),
+            date
+        )
+
+    def _compare_with_api(self, date, local_times, api_times):
+        """
+        Сравнивает локальный расчёт с ответом API и выводит расхождения в минутах.
+        Returns:
+            dict или None: {prayer: разница в минутах} или None, если API недоступен
+        """
+        if api_times is None:
+            return None
+        differences = {}
+        for prayer in self.prayer_times:
+            try:
+                local_h, local_m = map(int, local_times[prayer][:5].split(':'))
+                api_h, api_m = map(int, api_times[prayer][:5].split(':'))
+            except (ValueError, KeyError):
                 continue
-                
-        return prayer_times_data
+            diff = (api_h * 60 + api_m) - (local_h * 60 + local_m)
+            diff = (diff + 720) % 1440 - 720  # переход через полночь
+            if diff:
+                differences[prayer] = diff
+        if differences:
+            print(f"[DEBUG] prayer_times: расхождение с API за {date.strftime('%Y-%m-%d')}: {differences}")
+        return differences
 
     def update_prayer_times(self):
         print("[DEBUG] prayer_times: вызван update_prayer_times")
         """Обновляет времена молитв в базе данных только на сегодня и завтра"""
+        self.ensure_prefetched()
         prayer_times_data = self._get_prayer_times_for_two_days()
         updated = False
         for date_str, times in prayer_times_data.items():
-            self.db.cursor.execute('SELECT * FROM prayer_times WHERE date = ?', (date_str,))
-            result = self.db.cursor.fetchone()
+            result = self.db.fetchone('SELECT * FROM prayer_times WHERE date = ?', (date_str,))
             if result:
                 # Обновляем только если что-то изменилось
                 need_update = any(result[i+1] != times[k] for i, k in enumerate(self.prayer_times))
                 if need_update:
-                    self.db.cursor.execute(
+                    self.db.execute(
                         'UPDATE prayer_times SET ' + ', '.join([f'{k} = ?' for k in self.prayer_times]) + ' WHERE date = ?',
                         [times[k] for k in self.prayer_times] + [date_str]
                     )
                     updated = True
             else:
                 # Нет записи — вставляем
-                self.db.cursor.execute(
+                self.db.execute(
                     'INSERT INTO prayer_times (date, ' + ', '.join(self.prayer_times) + ') VALUES (?, ' + ', '.join(['?']*len(self.prayer_times)) + ')',
                     [date_str] + [times[k] for k in self.prayer_times]
                 )
                 updated = True
-        self.db.connection.commit()
         if updated:
+            self.invalidate_cache()
             print("[DEBUG] prayer_times: вызван _notify_update из update_prayer_times")
             self._notify_update()
         # Проверяем, появились ли валидные данные — если да, останавливаем автообновление
@@ -166,12 +286,32 @@ class PrayerTimesManager:
         if any(v != '00:00' for v in today_times.values()):
             self.stop_auto_update()
 
+    def compute_range(self, start, end):
+        """
+        Рассчитывает времена молитв на диапазон дат одним векторным проходом
+        и сохраняет их в базу одной транзакцией (executemany).
+        Args:
+            start, end: datetime/date, первая и последняя дата включительно
+        Returns:
+            int: количество записанных дней
+        """
+        rows = self.engine.compute_range_rows(start, end)
+        if not rows:
+            return 0
+        columns = ['date'] + self.prayer_times
+        sql = f"INSERT OR REPLACE INTO prayer_times ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+        self.db.executemany(sql, rows)
+        print(f"[DEBUG] prayer_times: compute_range записал {len(rows)} дней ({rows[0][0]} - {rows[-1][0]})")
+        self.invalidate_cache()
+        self._notify_update()
+        return len(rows)
+
     def get_prayer_times(self, date=None):
-        print("[DEBUG] prayer_times: вызван get_prayer_times")
         """
         Получает времена молитв для указанной даты или текущей.
-        1. Сначала ищет в базе
-        2. Если нет — возвращает нули (обновление только через автообновление!)
+        1. Сначала ищет в кэше в памяти (без SQL)
+        2. Затем в базе
+        3. Если нет — возвращает нули (обновление только через автообновление!)
         Args:
             date: datetime object или None для текущей даты
         Returns:
@@ -181,20 +321,83 @@ class PrayerTimesManager:
             date = datetime.now()
         date_str = date.strftime('%Y-%m-%d')
 
-        # 1. Проверяем, есть ли времена молитв в базе
-        self.db.cursor.execute('SELECT * FROM prayer_times WHERE date = ?', (date_str,))
-        result = self.db.cursor.fetchone()
+        # В полночь кэш сбрасывается целиком
+        today_str = datetime.now().strftime('%Y-%m-%d')
+        if self._cache_day != today_str:
+            self._cache_day = today_str
+            self._times_cache.invalidate()
+
+        cached = self._times_cache.get(date_str)
+        if cached is not None:
+            return dict(cached)
+
+        print(f"[DEBUG] prayer_times: get_prayer_times промах кэша для {date_str}")
+        # Проверяем, есть ли времена молитв в базе
+        result = self.db.fetchone('SELECT * FROM prayer_times WHERE date = ?', (date_str,))
         if result and self._is_valid_cache(result):
-            return {k: result[i+1] for i, k in enumerate(self.prayer_times)}
+            times = {k: result[i+1] for i, k in enumerate(self.prayer_times)}
         else:
             # Не делаем никаких сетевых операций здесь!
-            return {k: '00:00' for k in self.prayer_times}
+            times = {k: '00:00' for k in self.prayer_times}
+        self._times_cache.put(date_str, times)
+        return dict(times)
+
+    def invalidate_cache(self):
+        """Сбрасывает кэш в памяти после записи в таблицу prayer_times"""
+        self._times_cache.invalidate()
+        self._schedule = None
+
+    def get_daily_schedule(self):
+        """
+        Возвращает общий для всех виджетов DailySchedule на сегодня.
+        Строится один раз в день (или после обновления данных).
+        """
+        today = datetime.now().date()
+        if self._schedule is None or self._schedule.day != today:
+            self._schedule = DailySchedule(
+                today,
+                self.get_prayer_times(today),
+                self.get_prayer_times(today + timedelta(days=1))
+            )
+        return self._schedule
+
+    def load_day_times(self, day):
+        """
+        Времена молитв на дату в обход кэша в памяти (можно вызывать из рабочего потока):
+        из базы, а если записи нет или она устарела - локальный расчёт
+        Args:
+            day: date или datetime
+        Returns:
+            dict: времена молитв для указанной даты
+        """
+        date_str = day.strftime('%Y-%m-%d')
+        result = self.db.fetchone('SELECT * FROM prayer_times WHERE date = ?', (date_str,))
+        if result and self._is_valid_cache(result):
+            return {k: result[i+1] for i, k in enumerate(self.prayer_times)}
+        return self.engine.compute_day(day)
+
+    def install_day(self, day, today_times, tomorrow_times, schedule=None):
+        """
+        Подставляет заранее подготовленные времена на день day и следующий:
+        кэш в памяти и DailySchedule заменяются целиком, без запросов к базе.
+        Подписчики получают обычное уведомление об обновлении.
+        """
+        self._cache_day = day.strftime('%Y-%m-%d')
+        self._times_cache.invalidate()
+        self._times_cache.put(self._cache_day, dict(today_times))
+        self._times_cache.put((day + timedelta(days=1)).strftime('%Y-%m-%d'), dict(tomorrow_times))
+        self._schedule = schedule or DailySchedule(day, today_times, tomorrow_times)
+        self._notify_update()
+
+    def cache_stats(self):
+        """Счётчики попаданий/промахов кэша времён молитв"""
+        return self._times_cache.stats()
 
     def start_auto_update(self):
         if not hasattr(self, '_auto_update_event') or self._auto_update_event is None:
             print('[DEBUG] prayer_times: старт автообновления')
-            from kivy.clock import Clock
-            self._auto_update_event = Clock.schedule_interval(self._auto_update_callback, 15)
+            self._auto_update_attempt = 0
+            self._schedule_auto_update()
 
     def stop_auto_update(self):
         if hasattr(self, '_auto_update_event') and self._auto_update_event:
@@ -202,39 +405,52 @@ class PrayerTimesManager:
             self._auto_update_event.cancel()
             self._auto_update_event = None
 
+    def _auto_update_delay(self, attempt):
+        """Задержка перед попыткой автообновления: экспонента с full jitter"""
+        ceiling = min(self.auto_update_max_delay, self.auto_update_base_delay * (2 ** attempt))
+        return random.uniform(self.auto_update_base_delay / 2, max(ceiling, self.auto_update_base_delay / 2))
+
+    def _schedule_auto_update(self):
+        delay = self._auto_update_delay(self._auto_update_attempt)
+        print(f'[DEBUG] prayer_times: следующее автообновление через {delay:.1f} с')
+        self._auto_update_event = Clock.schedule_once(self._auto_update_callback, delay)
+
     def _auto_update_callback(self, dt):
-        print('[DEBUG] prayer_times: автообновление из API...')
+        print('[DEBUG] prayer_times: автообновление...')
+        self._auto_update_event = None
         self.update_prayer_times()
-        # 3. Если и API не дал — возвращаем нули
-        return {prayer: '00:00' for prayer in self.prayer_times}
+        # Если данные так и не появились — повторяем с увеличенной задержкой
+        if self._auto_update_event is None and not self._stop_event.is_set():
+            today_times = self.get_prayer_times()
+            if all(v == '00:00' for v in today_times.values()):
+                self._auto_update_attempt += 1
+                self._schedule_auto_update()
 
     def _try_fetch_and_store_api_times(self, date, date_str):
-        """Пробует получить времена молитв из API, сохранить в базу и вернуть их. Если не получилось — вернуть None."""
-        params = {
-            'city': self.city,
-            'country': self.country,
-            'method': self.method,
-            'date': date.strftime('%d-%m-%Y')
-        }
-        try:
-            response = requests.get(self.api_url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                if data['code'] == 200:
-                    times = data['data']['timings']
-                    prayer_times = {prayer: times[prayer] for prayer in self.prayer_times}
-                    # Сохраняем в базу
-                    columns = ['date'] + self.prayer_times
-                    placeholders = ['?'] * (len(columns))
-                    values = [date_str] + [prayer_times.get(prayer, '') for prayer in self.prayer_times]
-                    sql = f"INSERT OR REPLACE INTO prayer_times ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-                    self.db.cursor.execute(sql, values)
-                    self.db.connection.commit()
-                    self._notify_update()
-                    return prayer_times
-        except Exception as e:
-            print(f"Error fetching prayer times from API for {date_str}: {str(e)}")
-        return None
+        """
+        Запрашивает времена молитв из API в рабочем потоке; сохранение в базу
+        и уведомление слушателей выполняются в главном потоке.
+        Returns:
+            Future или None, если менеджер остановлен
+        """
+        return self._run_in_background(
+            self._fetch_api_times,
+            lambda times: self._store_api_times(date_str, times),
+            date
+        )
+
+    def _store_api_times(self, date_str, prayer_times):
+        """Сохраняет полученные из API времена в базу (только из главного потока)"""
+        if not prayer_times:
+            return None
+        columns = ['date'] + self.prayer_times
+        placeholders = ['?'] * (len(columns))
+        values = [date_str] + [prayer_times.get(prayer, '') for prayer in self.prayer_times]
+        sql = f"INSERT OR REPLACE INTO prayer_times ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
+        self.db.execute(sql, values)
+        self.invalidate_cache()
+        self._notify_update()
+        return prayer_times
 
     def _get_days_with_data(self, days_ahead=7):
         """
@@ -245,32 +461,129 @@ class PrayerTimesManager:
             int: количество дней с данными
         """
         today = datetime.now()
-        self.db.cursor.execute('''
+        result = self.db.fetchone('''
             SELECT COUNT(*) FROM prayer_times 
             WHERE date BETWEEN ? AND ?
         ''', (
             today.strftime('%Y-%m-%d'),
             (today + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
         ))
-        result = self.db.cursor.fetchone()
         return result[0] if result else 0
 
-    def _load_month_in_background(self):
-        """Загружает данные на месяц в фоновом режиме"""
-        def _load_month(dt):
-            try:
-                self.update_prayer_times()
-            except Exception as e:
-                print(f"Error loading month data: {str(e)}")
+    def _first_missing_date(self, days_ahead):
+        """
+        Возвращает первую дату от сегодня до today + days_ahead, для которой в базе
+        нет актуальной записи (та же проверка _is_valid_cache, что и при чтении):
+        устаревшие записи загружаются заново
+        Returns:
+            date или None, если горизонт полностью заполнен
+        """
+        today = datetime.now().date()
+        end = today + timedelta(days=days_ahead)
+        rows = self.db.fetchall(
+            'SELECT date, created_at FROM prayer_times WHERE date BETWEEN ? AND ?',
+            (today.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+        )
+        cached = {row[0] for row in rows if self._is_valid_cache(row)}
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            if day.strftime('%Y-%m-%d') not in cached:
+                return day
+        return None
 
-        # Вызываем обновление через Clock.schedule_once
-        Clock.schedule_once(_load_month, 0)
+    def _prefetch_period(self, day):
+        """Первая и последняя дата месяца (или года) для предзагрузки"""
+        if self.prefetch_mode == 'year':
+            return date_cls(day.year, 1, 1), date_cls(day.year, 12, 31)
+        last_day = calendar.monthrange(day.year, day.month)[1]
+        return date_cls(day.year, day.month, 1), date_cls(day.year, day.month, last_day)
+
+    def ensure_prefetched(self):
+        """
+        Загружает месяц (или год) целиком, если в кэше меньше
+        prefetch_horizon_days дней вперёд.
+        Returns:
+            bool: True, если запущена предзагрузка
+        """
+        missing = self._first_missing_date(self.prefetch_horizon_days)
+        if missing is None:
+            return False
+        if self.use_api_calendar:
+            month = None if self.prefetch_mode == 'year' else missing.month
+            return self._load_month_in_background(missing.year, month)
+        start, end = self._prefetch_period(missing)
+        print(f"[DEBUG] prayer_times: предзагрузка {self.prefetch_mode} {start} - {end}")
+        self.compute_range(start, end)
+        return True
+
+    def _fetch_calendar(self, year, month=None):
+        """
+        Запрашивает календарь времён молитв за месяц (или год, если month=None)
+        одним запросом. Выполняется в рабочем потоке, базу не трогает.
+        Returns:
+            list или None: строки для таблицы prayer_times
+        """
+        params = {
+            'city': self.city,
+            'country': self.country,
+            'method': self.method,
+        }
+        url = f"{self.calendar_api_url}/{year}" if month is None else f"{self.calendar_api_url}/{year}/{month}"
+        print(f"[DEBUG] prayer_times: calendar API url={url} params={params}")
+        try:
+            data = self.api_client.get_json(url, params)
+            if data.get('code') != 200:
+                return None
+            # За месяц приходит список дней, за год - словарь {месяц: список дней}
+            days = data['data']
+            if isinstance(days, dict):
+                days = [day for key in sorted(days, key=int) for day in days[key]]
+            rows = []
+            for day in days:
+                day_date = datetime.strptime(day['date']['gregorian']['date'], '%d-%m-%Y')
+                timings = day['timings']
+                # Времена приходят в виде "04:12 (+04)"
+                rows.append(
+                    (day_date.strftime('%Y-%m-%d'),) +
+                    tuple(timings[prayer].split(' ')[0][:5] for prayer in self.prayer_times)
+                )
+            return rows
+        except CircuitOpenError as e:
+            print(f"[DEBUG] prayer_times: calendar API пропущен ({e}), используем кэш")
+            return None
+        except Exception as e:
+            print(f"Error fetching prayer calendar for {year}/{month}: {str(e)}")
+            return None
+
+    def _store_calendar(self, rows):
+        """Сохраняет месяц/год из API одной транзакцией (только из главного потока)"""
+        self._calendar_request = None
+        if not rows:
+            return 0
+        columns = ['date'] + self.prayer_times
+        sql = f"INSERT OR REPLACE INTO prayer_times ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+        self.db.executemany(sql, rows)
+        print(f"[DEBUG] prayer_times: из календаря API записано {len(rows)} дней")
+        self.invalidate_cache()
+        self._notify_update()
+        return len(rows)
+
+    def _load_month_in_background(self, year, month=None):
+        """
+        Загружает месяц (или год) из calendar API в фоновом потоке.
+        Returns:
+            bool: True, если запрос запущен
+        """
+        if self._calendar_request is not None and not self._calendar_request.done():
+            return False
+        self._calendar_request = self._run_in_background(self._fetch_calendar, self._store_calendar, year, month)
+        return self._calendar_request is not None
 
     def _is_valid_cache(self, db_result):
         """Проверяет актуальность кэша в базе"""
-        # Пока простая проверка - кэш валиден 30 дней
+        # Кэш валиден cache_max_age_days (предзагрузка может покрывать год вперёд)
         created_at = datetime.strptime(db_result[-1], '%Y-%m-%d %H:%M:%S')
-        return (datetime.now() - created_at).days < 30
+        return (datetime.now() - created_at).days < self.cache_max_age_days
 
 # Создаем глобальный экземпляр для использования в других модулях
-prayer_times_manager = PrayerTimesManager()
+prayer_times_manager = LazyService(PrayerTimesManager)
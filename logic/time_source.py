@@ -0,0 +1,127 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    ZoneInfo = None
+
+
+def system_zone():
+    """
+    Часовой пояс системы как ZoneInfo (из TZ или ссылки /etc/localtime)
+    Returns:
+        ZoneInfo или None, если пояс не определить
+    """
+    if ZoneInfo is None:
+        return None
+    name = os.environ.get('TZ', '').lstrip(':')
+    if not name and os.path.islink('/etc/localtime'):
+        path = os.path.realpath('/etc/localtime')
+        if 'zoneinfo/' in path:
+            name = path.split('zoneinfo/', 1)[1]
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        return None
+
+
+class TimeSource:
+    """
+    Настенные часы для событий расписания и сторож скачков времени.
+
+    Полночь, начало молитвы и окно перед молитвой задаются как aware datetime
+    в часовом поясе системы (zoneinfo), а задержки для Clock считаются как разность
+    меток времени (timestamp), поэтому переход на летнее/зимнее время их не сдвигает.
+    Без zoneinfo используется naive локальное время с тем же расчётом задержек.
+
+    Clock Kivy отсчитывает задержки по монотонным часам: после сна системы, шага NTP
+    или ручной установки времени запланированные пробуждения срабатывают не в то
+    настенное время. check() вызывается на каждом тике планировщика и сравнивает,
+    сколько прошло по монотонным и по настенным часам с прошлой проверки, а также
+    смещение пояса от UTC. При расхождении больше JUMP_THRESHOLD секунд или смене
+    смещения вызываются подписчики (функции без аргументов) - они перепланируют события.
+    """
+    JUMP_THRESHOLD = 2.0
+
+    def __init__(self, tz=None):
+        self.tz = tz
+        self._listeners = []
+        self._mono = time.monotonic()
+        self._wall = time.time()
+        self._offset = time.localtime().tm_gmtoff
+        # Счётчики для отладки
+        self.checks = 0
+        self.jumps = 0
+        self.last_jump = None
+
+    def add_jump_listener(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_jump_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def now(self):
+        """Текущее настенное время (aware в поясе tz, если он известен)"""
+        return datetime.now(self.tz) if self.tz is not None else datetime.now()
+
+    def localize(self, moment):
+        """Привязывает naive настенное время к поясу tz"""
+        if self.tz is None or moment.tzinfo is not None:
+            return moment
+        return moment.replace(tzinfo=self.tz)
+
+    def at(self, day, minutes=0):
+        """Момент day + minutes минут по настенным часам пояса"""
+        return self.localize(datetime(day.year, day.month, day.day) + timedelta(minutes=minutes))
+
+    def seconds_until(self, moment):
+        """Сколько реальных секунд осталось до момента (отрицательно - если прошёл)"""
+        return self.localize(moment).timestamp() - time.time()
+
+    def check(self):
+        """
+        Сравнивает ход монотонных и настенных часов с прошлой проверки
+        Returns:
+            bool: True, если обнаружен скачок (подписчики уже вызваны)
+        """
+        mono, wall, offset = time.monotonic(), time.time(), time.localtime().tm_gmtoff
+        skew = (wall - self._wall) - (mono - self._mono)
+        offset_change = offset - self._offset
+        self._mono, self._wall, self._offset = mono, wall, offset
+        self.checks += 1
+        if abs(skew) < self.JUMP_THRESHOLD and not offset_change:
+            return False
+
+        self.jumps += 1
+        self.last_jump = {
+            'at': datetime.fromtimestamp(wall).isoformat(timespec='seconds'),
+            'skew': round(skew, 3),
+            'utc_offset_change': offset_change,
+        }
+        print(f"[DEBUG] time_source: скачок времени {skew:+.1f} с, смещение пояса {offset_change:+d} с, "
+              f"перепланирование ({len(self._listeners)} подписчиков)")
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"TimeSource: ошибка в callback: {e}")
+        return True
+
+    def stats(self):
+        """Счётчики проверок и скачков времени"""
+        return {
+            'tz': str(self.tz) if self.tz is not None else None,
+            'checks': self.checks,
+            'jumps': self.jumps,
+            'last_jump': self.last_jump,
+        }
+
+
+# Создаем глобальный экземпляр для использования в других модулях
+time_source = TimeSource(system_zone())
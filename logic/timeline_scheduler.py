@@ -0,0 +1,216 @@
+from collections import deque
+from datetime import timedelta
+from kivy.clock import Clock
+from logic.time_source import time_source
+
+
+class TimelineScheduler:
+    """
+    Центральный планировщик UI-событий.
+    Вместо нескольких Clock.schedule_interval вычисляет ближайший значимый момент
+    (переключение двоеточия, смена минуты, начало молитвы, начало 15-минутного окна
+    перед молитвой, полночь) и ставит ровно одно пробуждение Clock.schedule_once.
+
+    Подписчики - функции без аргументов, как у PrayerTimesManager и MidnightUpdateManager.
+
+    Моменты вычисляются по настенным часам в поясе time_source (zoneinfo). На каждом
+    пробуждении time_source сверяет монотонные и настенные часы: после сна системы,
+    шага NTP или смены смещения пояса пробуждение перепланируется от нового времени.
+
+    Каждое пробуждение планируется заново от абсолютной границы по настенным часам,
+    поэтому ошибка не накапливается (в отличие от schedule_interval). Фаза двоеточия
+    тоже берётся из настенных часов (colon_visible), а не переключается на каждом
+    тике: пропущенный тик не сдвигает её, и несколько панелей мигают синхронно.
+    Для каждого события хранится опоздание вызова подписчиков относительно границы
+    (tick_lateness: p50/p99 в мс).
+    """
+    KINDS = ('colon', 'minute', 'prayer', 'pre_prayer', 'midnight')
+    # Clock.schedule_once допускает срабатывание на 5 мс раньше срока
+    CLOCK_EARLY_MARGIN = 0.005
+    # Сколько последних опозданий хранить для каждого события
+    LATENESS_SAMPLES = 1000
+
+    def __init__(self, schedule_provider=None, pre_prayer_window=15 * 60, colon_period=0.5):
+        """
+        Args:
+            schedule_provider: функция, возвращающая DailySchedule на сегодня
+            pre_prayer_window: длительность окна перед молитвой в секундах
+            colon_period: период мигания двоеточия в секундах
+        """
+        self.schedule_provider = schedule_provider
+        self.pre_prayer_window = pre_prayer_window
+        self.colon_period = colon_period
+        self._subscribers = {kind: [] for kind in self.KINDS}
+        self._event = None
+        self._planned = None  # (datetime, set(kinds))
+        # Счётчики для отладки
+        self.wakeups = 0
+        self.early_wakeups = 0
+        self.jumps = 0
+        self.dispatched = {kind: 0 for kind in self.KINDS}
+        self._lateness = {kind: deque(maxlen=self.LATENESS_SAMPLES) for kind in self.KINDS}
+
+    def subscribe(self, kind, callback):
+        """Подписывает callback на событие kind и перепланирует пробуждение"""
+        if kind not in self._subscribers:
+            raise ValueError(f"Неизвестное событие планировщика: {kind}")
+        if callback not in self._subscribers[kind]:
+            self._subscribers[kind].append(callback)
+        self.rearm()
+
+    def unsubscribe(self, kind, callback):
+        """Отписывает callback; без подписчиков пробуждения не планируются"""
+        if callback in self._subscribers.get(kind, []):
+            self._subscribers[kind].remove(callback)
+        self.rearm()
+
+    def colon_visible(self, now=None):
+        """
+        Видно ли двоеточие в момент now: в первой половине каждого периода мигания,
+        начиная с границы секунды настенных часов
+        """
+        now = now or time_source.now()
+        period_us = int(self.colon_period * 1_000_000)
+        return (now.microsecond // period_us) % 2 == 0
+
+    def _active_kinds(self):
+        return [kind for kind in self.KINDS if self._subscribers[kind]]
+
+    def next_instant(self, now=None):
+        """
+        Вычисляет ближайший значимый момент после now
+        Returns:
+            tuple: (datetime, set событий) или (None, set()), если подписчиков нет
+        """
+        now = time_source.localize(now) if now is not None else time_source.now()
+        candidates = []
+        active = self._active_kinds()
+
+        if 'colon' in active:
+            period_us = int(self.colon_period * 1_000_000)
+            second_start = now.replace(microsecond=0)
+            phase = now.microsecond - now.microsecond % period_us + period_us
+            candidates.append((second_start + timedelta(microseconds=phase), 'colon'))
+
+        if 'minute' in active:
+            candidates.append((now.replace(second=0, microsecond=0) + timedelta(minutes=1), 'minute'))
+
+        if 'midnight' in active:
+            candidates.append((time_source.at(now.date() + timedelta(days=1)), 'midnight'))
+
+        if ('prayer' in active or 'pre_prayer' in active) and self.schedule_provider:
+            schedule = self.schedule_provider()
+            upcoming = schedule.next(now) if schedule else None
+            if upcoming is not None:
+                prayer_at = time_source.at(now.date() + timedelta(days=upcoming.day_offset), upcoming.minute)
+                if 'prayer' in active:
+                    candidates.append((prayer_at, 'prayer'))
+                window_at = prayer_at - timedelta(seconds=self.pre_prayer_window)
+                if 'pre_prayer' in active and window_at > now:
+                    candidates.append((window_at, 'pre_prayer'))
+
+        if not candidates:
+            return None, set()
+        when = min(at for at, _ in candidates)
+        # События, совпадающие по времени (например, начало молитвы и смена минуты), объединяем
+        tolerance = timedelta(milliseconds=5)
+        kinds = {kind for at, kind in candidates if at - when <= tolerance}
+        return when, kinds
+
+    def rearm(self, *args, after=None):
+        """
+        Отменяет текущее пробуждение и планирует одно новое на ближайший момент
+        Args:
+            after: момент, после которого искать событие (по умолчанию - сейчас)
+        """
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        now = time_source.now()
+        when, kinds = self.next_instant(max(now, after) if after else now)
+        self._planned = (when, kinds) if when else None
+        if when is None:
+            return
+        delay = max(0.0, time_source.seconds_until(when))
+        # Clock отсчитывает задержку от начала текущего кадра, а не от реального времени,
+        # поэтому добавляем уже прошедшую часть кадра и допуск раннего срабатывания
+        delay += max(0.0, Clock.time() - Clock.get_time()) + self.CLOCK_EARLY_MARGIN
+        self._event = Clock.schedule_once(self._on_wakeup, delay)
+
+    def _on_wakeup(self, dt):
+        self._event = None
+        self.wakeups += 1
+        planned = self._planned
+        if planned is None:
+            return
+        when, kinds = planned
+        # Настенные часы скачком ушли от монотонных - план устарел, считаем заново
+        if time_source.check():
+            self.jumps += 1
+            self.rearm()
+            return
+        # Clock может сработать чуть раньше - тогда просто досыпаем,
+        # иначе подписчики увидят ещё старую минуту
+        if time_source.now() < when:
+            self.early_wakeups += 1
+            self.rearm()
+            return
+        lateness = -time_source.seconds_until(when)
+        for kind in self.KINDS:
+            if kind not in kinds:
+                continue
+            self.dispatched[kind] += 1
+            self._lateness[kind].append(lateness)
+            for callback in list(self._subscribers[kind]):
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"TimelineScheduler: ошибка в callback '{kind}': {e}")
+        # Следующее событие ищем строго после только что разосланного
+        self.rearm(after=when)
+
+    def stop(self):
+        """Отменяет запланированное пробуждение"""
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        self._planned = None
+
+    def tick_lateness(self):
+        """
+        Опоздание вызова подписчиков относительно расчётной границы по событиям
+        Returns:
+            dict: {событие: {'samples', 'p50_ms', 'p99_ms', 'max_ms'}} для событий с замерами
+        """
+        result = {}
+        for kind, samples in self._lateness.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            result[kind] = {
+                'samples': len(ordered),
+                'p50_ms': round(ordered[len(ordered) // 2] * 1000.0, 2),
+                'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000.0, 2),
+                'max_ms': round(ordered[-1] * 1000.0, 2),
+            }
+        return result
+
+    def stats(self):
+        """Счётчики пробуждений и разосланных событий"""
+        return {
+            'wakeups': self.wakeups,
+            'early_wakeups': self.early_wakeups,
+            'jumps': self.jumps,
+            'dispatched': dict(self.dispatched),
+            'lateness': self.tick_lateness(),
+            'subscribers': {kind: len(callbacks) for kind, callbacks in self._subscribers.items()},
+        }
+
+
+def _current_schedule():
+    from logic.prayer_times import prayer_times_manager
+    return prayer_times_manager.get_daily_schedule()
+
+
+# Создаем глобальный экземпляр для использования в других модулях
+timeline_scheduler = TimelineScheduler(schedule_provider=_current_schedule)
@@ -0,0 +1,129 @@
+from weakref import WeakKeyDictionary
+from kivy.clock import Clock
+
+
+class ViewLifecycle:
+    """
+    Ресурсы одного виджета: события Clock, привязки bind() и подписки на менеджеры.
+    Всё, что зарегистрировано здесь, освобождается одним вызовом dispose().
+    """
+    def __init__(self, name=''):
+        self.name = name
+        self._events = []
+        self._bindings = []   # (объект, kwargs)
+        self._disposers = []  # функции отписки
+        self._cleanups = []   # остановка анимаций и т.п. перед отпиской
+        self.disposed = False
+
+    def _prune_events(self):
+        # Отработавшие schedule_once больше не нужны - не копим их
+        self._events = [event for event in self._events if event.is_triggered]
+
+    def track(self, event):
+        """Регистрирует уже созданное событие Clock"""
+        self._prune_events()
+        self._events.append(event)
+        return event
+
+    def schedule_once(self, callback, timeout=0):
+        return self.track(Clock.schedule_once(callback, timeout))
+
+    def schedule_interval(self, callback, timeout):
+        return self.track(Clock.schedule_interval(callback, timeout))
+
+    def bind(self, obj, **kwargs):
+        """obj.bind(**kwargs) с автоматическим unbind при dispose()"""
+        obj.bind(**kwargs)
+        self._bindings.append((obj, kwargs))
+
+    def listen(self, add, remove, *args):
+        """
+        Подписка через пару функций add/remove, например
+        listen(prayer_times_manager.add_update_listener,
+               prayer_times_manager.remove_update_listener, callback)
+        """
+        add(*args)
+        self._disposers.append(lambda: remove(*args))
+
+    def on_dispose(self, callback):
+        """Функция без аргументов, вызываемая при dispose() (остановка анимаций и т.п.)"""
+        self._cleanups.append(callback)
+
+    def live_timers(self):
+        self._prune_events()
+        return len(self._events)
+
+    def counts(self):
+        return {
+            'timers': self.live_timers(),
+            'bindings': len(self._bindings),
+            'listeners': len(self._disposers),
+        }
+
+    def dispose(self):
+        """Отменяет события, снимает привязки и отписывается от менеджеров"""
+        for cleanup in self._cleanups:
+            try:
+                cleanup()
+            except Exception as e:
+                print(f"ViewLifecycle[{self.name}]: ошибка при очистке: {e}")
+        for event in self._events:
+            event.cancel()
+        for obj, kwargs in self._bindings:
+            obj.unbind(**kwargs)
+        for remove in self._disposers:
+            try:
+                remove()
+            except Exception as e:
+                print(f"ViewLifecycle[{self.name}]: ошибка при отписке: {e}")
+        self._events = []
+        self._bindings = []
+        self._disposers = []
+        self._cleanups = []
+        self.disposed = True
+
+
+class LifecycleManager:
+    """
+    Реестр ресурсов виджетов.
+    on_parent(None) срабатывает только у виджета, который удалили напрямую,
+    поэтому при удалении поддерева вызывается detach(root): он освобождает
+    ресурсы всех зарегистрированных виджетов внутри.
+    """
+    def __init__(self):
+        self._views = WeakKeyDictionary()
+        self.disposed_views = 0
+
+    def for_widget(self, widget):
+        """Возвращает (или создаёт) ViewLifecycle виджета"""
+        lifecycle = self._views.get(widget)
+        if lifecycle is None:
+            lifecycle = ViewLifecycle(type(widget).__name__)
+            self._views[widget] = lifecycle
+        return lifecycle
+
+    def dispose(self, widget):
+        """Освобождает ресурсы одного виджета"""
+        lifecycle = self._views.pop(widget, None)
+        if lifecycle is not None:
+            lifecycle.dispose()
+            self.disposed_views += 1
+
+    def detach(self, root):
+        """Освобождает ресурсы всех виджетов поддерева root"""
+        for widget in list(root.walk(restrict=True)):
+            self.dispose(widget)
+
+    def stats(self):
+        """Счётчики живых представлений, таймеров, привязок и подписок для отладки"""
+        totals = {'views': 0, 'timers': 0, 'bindings': 0, 'listeners': 0}
+        for lifecycle in list(self._views.values()):
+            totals['views'] += 1
+            for key, value in lifecycle.counts().items():
+                totals[key] += value
+        totals['disposed_views'] = self.disposed_views
+        return totals
+
+
+# Создаем глобальный экземпляр для использования в других модулях
+lifecycle_manager = LifecycleManager()
@@ -1,6 +1,7 @@
 import kivy
 from datetime import datetime
 import math
+import time
 from kivy.animation import Animation
 kivy.require('2.2.1')
 
@@ -19,49 +20,63 @@ from kivy.uix.anchorlayout import AnchorLayout
 from ui.settings_window import SettingsWindow
 from ui.settings_manager import SettingsManager
 from ui.clock_widget import ClockWidget
+from ui.atlas_clock_label import AtlasClockLabel
 from data.database import SettingsDatabase
 from logic.clock_functions import get_formatted_time
-from ui.main_portrait import create_portrait_widgets
+from ui.main_portrait import create_portrait_widgets, rescale_portrait_widgets
 from ui.main_landscape import create_landscape_prayer_times_table
 from ui.main_square import create_square_prayer_times_table
 from logic.display_utils import is_mobile_device
-from logic.fonts_registration import register_fonts
 from logic.prayer_time_calculator import prayer_time_calculator
-from logic.hijri_date import hijri_date_manager
 from logic.midnight_update_manager import MidnightUpdateManager
 from logic.prayer_times import prayer_times_manager
+from logic.timeline_scheduler import timeline_scheduler
+from logic.power_mode import power_mode_manager
+from logic.widget_lifecycle import lifecycle_manager
+from logic.adhan_player import adhan_player
+from logic.day_rollover import day_rollover
 
 class MainWindowApp(App):
+    # Через сколько секунд после полуночи сверять времена молитв в базе
+    NEW_DAY_REFRESH_DELAY = 30
+
     def on_new_day(self):
         """
-        Метод вызывается в полночь для пересчёта и обновления всех данных, зависящих от даты.
-        - Проверяет и обновляет данные в базе (молитвы, хиджра и т.д.)
-        - Обновляет все связанные с датой элементы UI
-        - Запускает все необходимые проверки для нового дня
+        Метод вызывается в полночь для обновления всех данных, зависящих от даты.
+        - Подставляет состояние нового дня, подготовленное заранее (day_rollover):
+          времена молитв, расписание, дату хиджры и текстуры строки даты
+        - Обновляет заголовок
+        - Сверку данных в базе откладывает на NEW_DAY_REFRESH_DELAY секунд после полуночи
         """
-        # Принудительно обновляем дату хиджры (пересчёт и кэширование)
-        hijri_date_manager.get_hijri_date()
-
-        # Принудительно обновляем времена молитв (запрос к API и обновление базы)
-        print("[DEBUG] on_new_day: вызываю update_prayer_times() ДО пересоздания layout")
-        prayer_times_manager.update_prayer_times()
+        day_rollover.swap()
 
-        # Пересоздаём/обновляем UI для нового дня
-        if hasattr(self, 'layout'):
-            self.on_window_resize(Window, Window.width, Window.height)
-            print(f"[DEBUG] on_new_day: self.prayer_times_box = {getattr(self, 'prayer_times_box', None)}, type = {type(getattr(self, 'prayer_times_box', None))}")
-            if hasattr(self, 'prayer_times_box') and self.prayer_times_box:
-                print("[DEBUG] on_new_day: вызываю refresh_prayer_times() у self.prayer_times_box (после update_prayer_times и пересоздания layout)")
-                self.prayer_times_box.refresh_prayer_times()
-        
         # Обновляем заголовок (время)
         if hasattr(self, 'title_label'):
             self.title_label.text = self.get_current_time(self.is_colon_visible)
 
+        # Обновляем времена молитв в базе (локальный расчёт, сеть только в фоновом потоке)
+        Clock.schedule_once(lambda dt: prayer_times_manager.update_prayer_times(), self.NEW_DAY_REFRESH_DELAY)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.current_window = 'main'
+        # Текущее тело окна (таблица молитв) и ориентация, для которой оно построено
+        self.main_window_body = None
+        self.body_orientation = None
+        # Счётчики перестроений layout при изменении размера окна
+        self.layout_stats = {
+            'resize_events': 0,
+            'relayouts': 0,
+            'rebuilds': 0,
+            'rescales': 0,
+            'rebuild_time': 0.0,
+            'rescale_time': 0.0,
+        }
+        self._gesture_start_stats = None
+        # Изменения размера окна объединяются: не больше одного пересчёта за кадр,
+        # итог жеста (серии событий) выводится после паузы
+        self._relayout_trigger = Clock.create_trigger(self._relayout)
+        self._resize_gesture_trigger = Clock.create_trigger(self._report_resize_gesture, 0.5)
         # Инициализируем базу данных настроек
         self.settings_db = SettingsDatabase()
         
@@ -81,6 +96,7 @@ class MainWindowApp(App):
         # --- MidnightUpdateManager ---
         self.midnight_update_manager = MidnightUpdateManager()
         self.midnight_update_manager.register_callback(self.on_new_day)
+        self.midnight_update_manager.register_prepare_callback(day_rollover.prepare)
         # --- END MidnightUpdateManager ---
         # Пытаемся применить сохраненные настройки окна
         if not is_mobile_device():
@@ -89,9 +105,6 @@ class MainWindowApp(App):
         # Создаем менеджер настроек перед применением цвета
         self.settings_manager = SettingsManager(None, self)
         
-        # Регистрация шрифтов
-        register_fonts()
-        
         # Создаем глобальный экземпляр для вычисления времени молитв
         self.prayer_time_calculator = prayer_time_calculator
         
@@ -108,8 +121,9 @@ class MainWindowApp(App):
             padding=0
         )
         
-        # Создаем заголовок
-        self.title_label = Label(
+        # Создаем заголовок (часы из атласа глифов: на тике меняются только
+        # текстурные координаты, а не вся текстура строки)
+        self.title_label = AtlasClockLabel(
             text=self.get_current_time(), 
             font_name="fonts/DSEG-Classic/DSEG7Classic-Bold.ttf",
             color=(0, 1, 0, 1),  # Зеленый цвет для часов
@@ -131,30 +145,13 @@ class MainWindowApp(App):
         self.layout.add_widget(self.title_label)
 
         # Определение ориентации и создание соответствующей таблицы молитв
-        current_orientation = self.get_current_orientation()
-        
-        if current_orientation == 'portrait':
-            portrait_layout = GridLayout(
-                cols=1,
-                spacing=dp(0),
-                size_hint=(1, 1)
-            )
-            
-            # Создаем и заполняем портретный layout
-            portrait_layout = self.create_portrait_widgets(portrait_layout)
-            main_window_body = portrait_layout
-        elif current_orientation == 'landscape':
-            main_window_body = create_landscape_prayer_times_table(self)
-        else:  # square
-            main_window_body = create_square_prayer_times_table(self)
-        
-        # Добавление таблицы молитв, если она не None
-        if main_window_body:
-            self.layout.add_widget(main_window_body)
+        self.rebuild_layout()
 
-        # Запускаем таймер обновления времени и мигания точек каждые 0.5 секунды
+        # Обновление времени и мигание точек по событиям планировщика
+        # (одно пробуждение на ближайший значимый момент вместо нескольких таймеров)
         self.is_colon_visible = True
-        Clock.schedule_interval(self.update_time_with_colon, 0.5)
+        self.apply_power_mode(self.settings_db.get_setting('power_mode'))
+        prayer_times_manager.add_update_listener(timeline_scheduler.rearm)
 
         # Устанавливаем текущее окно
         self.current_window = 'main'
@@ -164,6 +161,22 @@ class MainWindowApp(App):
         
         return self.layout
 
+    def on_start(self):
+        """
+        Обновление данных (расчёт/сверка времён молитв) запускается только после
+        первого кадра, чтобы окно появлялось сразу
+        """
+        Window.bind(on_flip=self._on_first_frame)
+
+    def _on_first_frame(self, *args):
+        Window.unbind(on_flip=self._on_first_frame)
+        Clock.schedule_once(self.start_data_refresh, 0)
+
+    def start_data_refresh(self, *args):
+        """Первичное обновление времён молитв после показа окна"""
+        prayer_times_manager.start()
+        adhan_player.start()
+
     def get_current_orientation(self):
         """
         Точное определение ориентации экрана
@@ -225,12 +238,36 @@ class MainWindowApp(App):
         """
         return get_formatted_time(show_colon)
     
-    def update_time_with_colon(self, dt):
+    def update_time_with_colon(self, *args):
         """
         Обновляем время с мигающим двоеточием
+        (в режиме энергосбережения двоеточие не мигает)
+        """
+        if power_mode_manager.is_low_power():
+            self.is_colon_visible = True
+        else:
+            # Фаза мигания привязана к границам секунд настенных часов
+            self.is_colon_visible = timeline_scheduler.colon_visible()
+        text = self.get_current_time(self.is_colon_visible)
+        # Перерисовываем заголовок только при реальном изменении текста
+        if text != self.title_label.text:
+            self.title_label.text = text
+
+    def apply_power_mode(self, mode):
+        """
+        Включает обычный режим или режим энергосбережения
+        Args:
+            mode: 'normal' или 'low'
         """
-        self.is_colon_visible = not self.is_colon_visible
-        self.title_label.text = self.get_current_time(self.is_colon_visible)
+        mode = power_mode_manager.apply(mode)
+        if mode == 'low':
+            # Одно пробуждение в минуту вместо двух в секунду
+            timeline_scheduler.unsubscribe('colon', self.update_time_with_colon)
+            timeline_scheduler.subscribe('minute', self.update_time_with_colon)
+        else:
+            timeline_scheduler.unsubscribe('minute', self.update_time_with_colon)
+            timeline_scheduler.subscribe('colon', self.update_time_with_colon)
+        self.update_time_with_colon()
 
     def _on_clock_widget_created(self, clock_widget=None):
         """
@@ -374,8 +411,42 @@ class MainWindowApp(App):
 
     def on_window_resize(self, instance, width, height):
         """
-        Обработчик изменения размера окна
+        Обработчик изменения размера окна.
+        Только планирует пересчёт layout на следующий кадр: серия событий
+        при перетаскивании окна даёт не больше одного пересчёта за кадр.
+        """
+        stats = self.layout_stats
+        stats['resize_events'] += 1
+        if self._gesture_start_stats is None:
+            self._gesture_start_stats = dict(stats)
+        self._relayout_trigger()
+        self._resize_gesture_trigger.cancel()
+        self._resize_gesture_trigger()
+
+    def _relayout(self, *args):
         """
+        Пересчёт layout после изменения размера окна.
+        Дерево виджетов пересоздаётся только при смене класса ориентации,
+        иначе существующие виджеты масштабируются.
+        """
+        self.layout_stats['relayouts'] += 1
+        current_orientation = self.get_current_orientation()
+        if current_orientation != self.body_orientation:
+            self.rebuild_layout()
+            return
+
+        started = time.perf_counter()
+        if current_orientation == 'portrait' and self.main_window_body is not None:
+            rescale_portrait_widgets(self, self.main_window_body)
+        self.layout_stats['rescales'] += 1
+        self.layout_stats['rescale_time'] += time.perf_counter() - started
+
+    def rebuild_layout(self):
+        """
+        Полностью пересоздаёт тело окна для текущей ориентации
+        (при смене ориентации и в полночь)
+        """
+        started = time.perf_counter()
         # Отменяем запланированные события
         if hasattr(self, '_blink_event'):
             self._blink_event.cancel()
@@ -392,6 +463,9 @@ class MainWindowApp(App):
         if hasattr(self, 'layout'):
             for child in self.layout.children[:]:
                 if isinstance(child, (GridLayout, Label)) and child != self.title_label:
+                    # Вложенные виджеты не получают on_parent(None) - освобождаем их таймеры
+                    # и подписки явно
+                    lifecycle_manager.detach(child)
                     self.layout.remove_widget(child)
         
         # Создаем новый layout в зависимости от ориентации
@@ -405,6 +479,26 @@ class MainWindowApp(App):
         # Добавляем таблицу, если она не None
         if main_window_body and hasattr(self, 'layout'):
             self.layout.add_widget(main_window_body)
+        self.main_window_body = main_window_body
+        self.body_orientation = current_orientation
+
+        self.layout_stats['rebuilds'] += 1
+        self.layout_stats['rebuild_time'] += time.perf_counter() - started
+
+    def _report_resize_gesture(self, *args):
+        """Выводит итог жеста изменения размера: сколько было событий, пересчётов и пересозданий"""
+        start = self._gesture_start_stats
+        self._gesture_start_stats = None
+        if start is None:
+            return
+        stats = self.layout_stats
+        delta = {key: stats[key] - start[key] for key in stats}
+        print(
+            f"[DEBUG] resize: событий {delta['resize_events']}, пересчётов {delta['relayouts']}, "
+            f"пересозданий {delta['rebuilds']} ({delta['rebuild_time'] * 1000:.1f} мс), "
+            f"масштабирований {delta['rescales']} ({delta['rescale_time'] * 1000:.1f} мс)"
+        )
+        print(f"[DEBUG] lifecycle: {lifecycle_manager.stats()}")
 
     def classify_block_orientation(self, block):
         """
@@ -467,6 +561,16 @@ class MainWindowApp(App):
             x=Window.left,
             y=Window.top
         )
+        # Отменяем фоновые сетевые запросы и пробуждения планировщика
+        adhan_player.stop()
+        # Менеджер, который так и не понадобился, не создаём ради остановки
+        if prayer_times_manager.is_created:
+            prayer_times_manager.shutdown()
+        timeline_scheduler.stop()
+        # Дописываем очередь записи и закрываем общее соединение с базой
+        print(f"[DEBUG] main: опоздание тиков планировщика: {timeline_scheduler.tick_lateness()}")
+        print(f"[DEBUG] main: статистика базы: {self.settings_db.stats()}")
+        self.settings_db.service.close()
 
 if __name__ == "__main__":
     MainWindowApp().run()
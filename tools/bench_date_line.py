@@ -0,0 +1,89 @@
+"""
+Бенчмарк строки даты: Label с разметкой против кэшированной текстуры (DateLineLabel).
+
+Имитирует серию изменений ширины окна, при которой размер шрифта строки даты
+ходит по нескольким значениям туда и обратно, и для каждого варианта выводит
+стоимость одного обновления (среднее, p50, p99 в мс) и число растеризаций.
+- markup: как раньше в update_label_size - новый текст с разметкой + texture_update()
+- cached: DateLineLabel.font_size = ...; растеризация только при промахе кэша
+
+Запуск из корня проекта:
+    python tools/bench_date_line.py --updates 300
+Без дисплея:
+    SDL_VIDEODRIVER=offscreen KIVY_GL_BACKEND=mock python tools/bench_date_line.py
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Сравнение стоимости обновления строки даты")
+    parser.add_argument('--updates', type=int, default=300, help="количество обновлений на вариант")
+    parser.add_argument('--sizes', type=int, default=4, help="сколько разных размеров шрифта чередуется")
+    return parser.parse_args()
+
+
+def summarize(name, samples, renders):
+    ordered = sorted(samples)
+    return {
+        'variant': name,
+        'updates': len(samples),
+        'mean_ms': round(statistics.mean(samples) * 1000.0, 3),
+        'p50_ms': round(ordered[len(ordered) // 2] * 1000.0, 3),
+        'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000.0, 3),
+        'renders': renders,
+    }
+
+
+def main():
+    args = parse_args()
+
+    from kivy.core.window import Window
+    from kivy.uix.label import Label
+    from logic.date_formatted import get_formatted_dates, hijri_date_line_markup
+    from ui.date_line_label import DateLineLabel
+
+    sizes = [int(Window.width * 0.04) + step * 2 for step in range(args.sizes)]
+    sequence = [sizes[index % len(sizes)] for index in range(args.updates)]
+
+    # Вариант до изменений: разметка пересобирается и раскладывается на каждое обновление
+    markup_label = Label(markup=True, color=(1, 1, 0, 1), halign='center', valign='middle')
+    markup_samples = []
+    for font_size in sequence:
+        started = time.perf_counter()
+        markup_label.text_size = (Window.width, font_size * 1.5)
+        markup_label.text = hijri_date_line_markup(font_size, get_formatted_dates())
+        markup_label.texture_update()
+        markup_samples.append(time.perf_counter() - started)
+
+    DateLineLabel.cache.invalidate()
+    cached_label = DateLineLabel(markup_provider=hijri_date_line_markup, color=(1, 1, 0, 1),
+                                 font_size=sequence[0] + 1)
+    renders_before = cached_label.renders
+    cached_samples = []
+    for font_size in sequence:
+        started = time.perf_counter()
+        cached_label.font_size = font_size
+        cached_samples.append(time.perf_counter() - started)
+
+    results = [
+        summarize('markup', markup_samples, len(markup_samples)),
+        summarize('cached', cached_samples, cached_label.renders - renders_before),
+    ]
+    print()
+    print(f"{'вариант':>8} | {'обновлений':>10} | {'среднее, мс':>11} | {'p50, мс':>8} | {'p99, мс':>8} | {'растеризаций':>12}")
+    for result in results:
+        print(f"{result['variant']:>8} | {result['updates']:>10} | {result['mean_ms']:>11.3f} | "
+              f"{result['p50_ms']:>8.3f} | {result['p99_ms']:>8.3f} | {result['renders']:>12}")
+    print(json.dumps({'sizes': sizes, 'results': results, 'cache': DateLineLabel.cache.stats()}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
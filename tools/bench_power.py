@@ -0,0 +1,103 @@
+"""
+Бенчмарк режима энергосбережения.
+
+Запускает приложение, принудительно включает выбранный режим (без записи в базу)
+и через заданное время выводит:
+- пробуждения планировщика в минуту (цель для 'low': меньше 2)
+- кадры главного цикла Kivy в минуту: в 'low' цикл всё равно просыпается
+  4 раза в секунду (ограничение maxfps), поэтому пробуждения планировщика -
+  не все пробуждения процесса
+- перерисовки заголовка с часами в минуту
+- загрузку процессора процессом в процентах (цель для 'low': меньше 1%)
+Для 'low' замер завершается с ошибкой, если превышен любой из двух порогов.
+
+Запуск из корня проекта:
+    python tools/bench_power.py --mode low --seconds 120
+Без дисплея:
+    SDL_VIDEODRIVER=offscreen KIVY_GL_BACKEND=mock python tools/bench_power.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MAX_WAKEUPS_PER_MINUTE = 2
+MAX_CPU_PERCENT = 1.0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Замер пробуждений и загрузки CPU в разных режимах питания")
+    parser.add_argument('--mode', choices=('low', 'normal'), default='low')
+    parser.add_argument('--seconds', type=float, default=120.0, help="длительность замера")
+    parser.add_argument('--warmup', type=float, default=5.0, help="пропуск запуска приложения")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    from kivy.clock import Clock
+    import main as app_module
+    from logic.timeline_scheduler import timeline_scheduler
+
+    app = app_module.MainWindowApp()
+    counters = {'redraws': 0}
+    marks = {}
+
+    def on_title_text(*_):
+        counters['redraws'] += 1
+
+    def start_measurement(dt):
+        app.apply_power_mode(args.mode)
+        app.title_label.bind(text=on_title_text)
+        marks['wall'] = time.monotonic()
+        marks['cpu'] = time.process_time()
+        marks['frames'] = Clock.frames
+        marks['wakeups'] = timeline_scheduler.wakeups
+        Clock.schedule_once(stop_measurement, args.seconds)
+
+    def stop_measurement(dt):
+        wall = time.monotonic() - marks['wall']
+        cpu = time.process_time() - marks['cpu']
+        minutes = wall / 60.0
+        result = {
+            'mode': args.mode,
+            'seconds': round(wall, 2),
+            'scheduler_wakeups_per_minute': round((timeline_scheduler.wakeups - marks['wakeups']) / minutes, 2),
+            'frames_per_minute': round((Clock.frames - marks['frames']) / minutes, 2),
+            'redraws_per_minute': round(counters['redraws'] / minutes, 2),
+            'cpu_percent': round(100.0 * cpu / wall, 2),
+        }
+        marks['result'] = result
+        app.stop()
+
+    Clock.schedule_once(start_measurement, args.warmup)
+    app.run()
+
+    result = marks.get('result')
+    if result is None:
+        print("Замер не завершён")
+        return 1
+
+    print()
+    for key, value in result.items():
+        print(f"{key:>28}: {value}")
+    print(json.dumps(result))
+
+    if args.mode != 'low':
+        return 0
+    failed = False
+    if result['scheduler_wakeups_per_minute'] >= MAX_WAKEUPS_PER_MINUTE:
+        print(f"FAIL: больше {MAX_WAKEUPS_PER_MINUTE} пробуждений планировщика в минуту")
+        failed = True
+    if result['cpu_percent'] >= MAX_CPU_PERCENT:
+        print(f"FAIL: загрузка CPU {result['cpu_percent']}% (порог {MAX_CPU_PERCENT}%)")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Бенчмарк запуска приложения по этапам.
+
+Каждый прогон запускает приложение в отдельном процессе (без дисплея по умолчанию)
+и записывает моменты от запуска процесса:
+- interpreter  - интерпретатор запущен, выполняется первая строка скрипта
+- imports      - импортирован main со всеми модулями
+- db_open      - открыто соединение с settings.db
+- prayer_load  - первые времена молитв прочитаны (кэш/база)
+- build        - build() вернул корневой виджет
+- first_frame  - первый кадр выведен на экран
+- populated_frame - первый кадр после первичного обновления данных (start_data_refresh)
+
+Выводит таблицу (медиана по прогонам, мс от запуска и длительность этапа) и JSON.
+
+Запуск из корня проекта:
+    python tools/bench_startup.py --runs 5
+С настоящим окном:
+    python tools/bench_startup.py --window
+"""
+import time
+
+PROCESS_START = time.time()
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STAGES = (
+    'interpreter',
+    'imports',
+    'db_open',
+    'prayer_load',
+    'build',
+    'first_frame',
+    'populated_frame',
+)
+RESULT_PREFIX = 'BENCH_STARTUP '
+HEADLESS_ENV = {
+    'SDL_VIDEODRIVER': 'offscreen',
+    'KIVY_GL_BACKEND': 'mock',
+    'KIVY_NO_ARGS': '1',
+    'KIVY_NO_CONSOLELOG': '1',
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Замер времени запуска приложения по этапам")
+    parser.add_argument('--runs', type=int, default=3, help="количество прогонов")
+    parser.add_argument('--window', action='store_true', help="запускать с настоящим окном")
+    parser.add_argument('--timeout', type=float, default=120.0, help="предел одного прогона, секунд")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def run_child():
+    """Один запуск приложения с отметками этапов (выполняется в дочернем процессе)"""
+    spawned = float(os.environ.get('BENCH_STARTUP_SPAWNED', PROCESS_START))
+    marks = {'interpreter': PROCESS_START}
+
+    def mark(stage):
+        marks.setdefault(stage, time.time())
+
+    def wrap(owner, name, stage):
+        original = getattr(owner, name)
+
+        def wrapper(*args, **kwargs):
+            result = original(*args, **kwargs)
+            mark(stage)
+            return result
+        setattr(owner, name, wrapper)
+
+    import main as app_module
+    mark('imports')
+
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    from data.database import DatabaseService
+    from logic.prayer_times import PrayerTimesManager
+
+    wrap(DatabaseService, '__init__', 'db_open')
+    wrap(PrayerTimesManager, 'get_prayer_times', 'prayer_load')
+    wrap(app_module.MainWindowApp, 'build', 'build')
+
+    app = app_module.MainWindowApp()
+    refresh_done = {}
+
+    def on_flip(*args):
+        mark('first_frame')
+        if refresh_done and 'populated_frame' not in marks:
+            mark('populated_frame')
+            Window.unbind(on_flip=on_flip)
+            Clock.schedule_once(lambda dt: app.stop(), 0)
+
+    original_refresh = app.start_data_refresh
+
+    def start_data_refresh(*args):
+        original_refresh(*args)
+        refresh_done['at'] = time.time()
+        # Кадр после обновления данных рисуется, только если что-то изменилось
+        Window.canvas.ask_update()
+    app.start_data_refresh = start_data_refresh
+
+    Window.bind(on_flip=on_flip)
+    app.run()
+
+    result = {stage: round((marks[stage] - spawned) * 1000.0, 1) for stage in STAGES if stage in marks}
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+    return 0
+
+
+def run_once(args):
+    """Запускает дочерний процесс и возвращает его отметки (мс от запуска)"""
+    env = dict(os.environ)
+    if not args.window:
+        for key, value in HEADLESS_ENV.items():
+            env.setdefault(key, value)
+    env['BENCH_STARTUP_SPAWNED'] = repr(time.time())
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child'],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=args.timeout
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    print(completed.stdout[-2000:])
+    print(completed.stderr[-2000:])
+    return None
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        return run_child()
+
+    runs = []
+    for index in range(args.runs):
+        marks = run_once(args)
+        if marks is None:
+            print(f"Прогон {index + 1}: приложение не дошло до заполненного кадра")
+            return 1
+        runs.append(marks)
+        print(f"Прогон {index + 1}: первый кадр {marks.get('first_frame')} мс, "
+              f"заполненный {marks.get('populated_frame')} мс")
+
+    median = {}
+    for stage in STAGES:
+        values = [marks[stage] for marks in runs if stage in marks]
+        if values:
+            median[stage] = round(statistics.median(values), 1)
+
+    print()
+    print(f"{'этап':>16} | {'от запуска, мс':>14} | {'этап, мс':>9}")
+    previous = 0.0
+    for stage in STAGES:
+        if stage not in median:
+            print(f"{stage:>16} | {'-':>14} | {'-':>9}")
+            continue
+        print(f"{stage:>16} | {median[stage]:>14.1f} | {median[stage] - previous:>9.1f}")
+        previous = median[stage]
+    print(json.dumps({'runs': len(runs), 'median_ms': median, 'samples': runs}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Бенчмарк точности тиков часов.
+
+Запускает приложение и в течение заданного времени замеряет, насколько позже
+расчётной границы по настенным часам вызываются подписчики планировщика
+(мигание двоеточия и смена минуты), и выводит p50/p99/max опоздания в мс.
+Дополнительно проверяет фазу двоеточия: при каждом изменении текста часов
+двоеточие должно быть видно в первой половине секунды и скрыто во второй.
+Несколько панелей в одном зале с одинаковыми p99 меняют минуту в пределах этого
+опоздания друг от друга (при синхронизированных часах системы).
+
+Запуск из корня проекта:
+    python tools/bench_ticks.py --seconds 60
+Без дисплея:
+    SDL_VIDEODRIVER=offscreen KIVY_GL_BACKEND=mock python tools/bench_ticks.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Опоздание тиков часов относительно границ секунд")
+    parser.add_argument('--mode', choices=('low', 'normal'), default='normal')
+    parser.add_argument('--seconds', type=float, default=60.0, help="длительность замера")
+    parser.add_argument('--warmup', type=float, default=5.0, help="пропуск запуска приложения")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    from kivy.clock import Clock
+    import main as app_module
+    from logic.timeline_scheduler import timeline_scheduler
+    from logic.time_source import time_source
+
+    app = app_module.MainWindowApp()
+    counters = {'changes': 0, 'phase_errors': 0}
+    marks = {}
+
+    def on_title_text(label, text):
+        counters['changes'] += 1
+        if args.mode == 'normal' and (':' in text) != timeline_scheduler.colon_visible(time_source.now()):
+            counters['phase_errors'] += 1
+
+    def start_measurement(dt):
+        app.apply_power_mode(args.mode)
+        for samples in timeline_scheduler._lateness.values():
+            samples.clear()
+        app.title_label.bind(text=on_title_text)
+        marks['wall'] = time.monotonic()
+        Clock.schedule_once(stop_measurement, args.seconds)
+
+    def stop_measurement(dt):
+        marks['result'] = {
+            'mode': args.mode,
+            'seconds': round(time.monotonic() - marks['wall'], 2),
+            'title_changes': counters['changes'],
+            'colon_phase_errors': counters['phase_errors'],
+            'lateness': timeline_scheduler.tick_lateness(),
+        }
+        app.stop()
+
+    Clock.schedule_once(start_measurement, args.warmup)
+    app.run()
+
+    result = marks.get('result')
+    if result is None:
+        print("Замер не завершён")
+        return 1
+
+    print()
+    print(f"{'событие':>8} | {'тиков':>6} | {'p50, мс':>8} | {'p99, мс':>8} | {'max, мс':>8}")
+    for kind, values in result['lateness'].items():
+        print(f"{kind:>8} | {values['samples']:>6} | {values['p50_ms']:>8.2f} | "
+              f"{values['p99_ms']:>8.2f} | {values['max_ms']:>8.2f}")
+    print(f"изменений часов: {result['title_changes']}, ошибок фазы двоеточия: {result['colon_phase_errors']}")
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
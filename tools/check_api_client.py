@@ -0,0 +1,158 @@
+"""
+Проверка PrayerApiClient на локальном тестовом HTTP-сервере.
+
+Поднимает http.server на 127.0.0.1 со сценарием ответов (5xx, 200 с ETag, 304, 404)
+и проверяет:
+- расписание повторов: задержки совпадают с backoff_delay при том же seed (full jitter),
+  ожидание идёт через переданный sleep, статусы попыток записаны в retry_log
+- условный запрос: повтор отправляет If-None-Match, ответ 304 возвращает сохранённые данные
+- 4xx (кроме 429) не повторяется
+- circuit breaker: открывается после failure_threshold неудачных вызовов, в открытом
+  состоянии запрос до сервера не доходит, после cooldown снова закрывается
+
+Запуск из корня проекта:
+    python tools/check_api_client.py
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ETAG = '"timings-1"'
+BODY = {'code': 200, 'data': {'timings': {'Fajr': '05:12'}}}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Проверка повторов, 304 и circuit breaker клиента API")
+    parser.add_argument('--seed', type=int, default=7, help="seed генератора jitter")
+    return parser.parse_args()
+
+
+class StubServer:
+    """Тестовый сервер: отвечает по очереди из script, запоминает заголовки запросов"""
+    def __init__(self):
+        self.script = []
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(dict(self.headers))
+                status = stub.script.pop(0) if stub.script else 500
+                body = json.dumps(BODY).encode() if status == 200 else b''
+                self.send_response(status)
+                if status in (200, 304):
+                    self.send_header('ETag', ETAG)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/timingsByCity"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def run(self, script):
+        self.script = list(script)
+        self.requests = []
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    args = parse_args()
+
+    from logic.prayer_api_client import PrayerApiClient, CircuitOpenError
+
+    stub = StubServer()
+    checks = []
+
+    def check(name, ok, details):
+        checks.append({'check': name, 'ok': bool(ok), 'details': details})
+
+    # Повторы: 500, 502, затем 200 с ETag
+    sleeps = []
+    client = PrayerApiClient(timeout=2, max_retries=3, backoff_base=1.0, backoff_max=60.0,
+                             failure_threshold=3, cooldown=300.0,
+                             sleep=sleeps.append, rng=random.Random(args.seed))
+    expected = PrayerApiClient(backoff_base=1.0, backoff_max=60.0, rng=random.Random(args.seed))
+    expected_delays = [expected.backoff_delay(attempt) for attempt in range(2)]
+    stub.run([500, 502, 200])
+    data = client.get_json(stub.url, {'city': 'baku'})
+    statuses = [entry['status'] for entry in client.retry_log]
+    check('retry_schedule', sleeps == expected_delays and statuses == [500, 502, 200] and data == BODY,
+          {'sleeps': [round(delay, 4) for delay in sleeps],
+           'expected': [round(delay, 4) for delay in expected_delays],
+           'statuses': statuses})
+    check('backoff_ceiling', all(0 <= delay <= 2 ** attempt for attempt, delay in enumerate(sleeps)),
+          {'ceilings': [2 ** attempt for attempt in range(len(sleeps))]})
+
+    # Условный запрос: If-None-Match с сохранённым ETag, 304 -> сохранённые данные
+    stub.run([304])
+    data = client.get_json(stub.url, {'city': 'baku'})
+    sent_etag = stub.requests[0].get('If-None-Match') if stub.requests else None
+    check('not_modified_reuse', data == BODY and sent_etag == ETAG and client.stats['not_modified'] == 1,
+          {'if_none_match': sent_etag, 'not_modified': client.stats['not_modified']})
+
+    # 4xx не повторяется
+    sleeps.clear()
+    stub.run([404])
+    try:
+        client.get_json(stub.url, {'city': 'nowhere'})
+        failed = False
+    except Exception:
+        failed = True
+    check('no_retry_on_4xx', failed and len(stub.requests) == 1 and not sleeps,
+          {'requests': len(stub.requests)})
+
+    # Circuit breaker: два неудачных вызова открывают, после cooldown закрывается
+    breaker = PrayerApiClient(timeout=2, max_retries=0, failure_threshold=2, cooldown=0.3,
+                              sleep=lambda delay: None, rng=random.Random(args.seed))
+    stub.run([500, 500])
+    for _ in range(2):
+        try:
+            breaker.get_json(stub.url)
+        except Exception:
+            pass
+    opened = breaker.is_open()
+    served_before = len(stub.requests)
+    try:
+        breaker.get_json(stub.url)
+        short_circuited = False
+    except CircuitOpenError:
+        short_circuited = True
+    check('breaker_opens', opened and short_circuited and len(stub.requests) == served_before,
+          {'open': opened, 'requests': len(stub.requests), 'short_circuited': breaker.stats['short_circuited']})
+
+    time.sleep(0.35)
+    stub.run([200])
+    closed = not breaker.is_open()
+    data = breaker.get_json(stub.url)
+    check('breaker_closes', closed and data == BODY and not breaker.is_open(),
+          {'open_after_cooldown': not closed, 'requests': len(stub.requests)})
+
+    client.close()
+    breaker.close()
+    stub.close()
+
+    print()
+    print(f"{'проверка':>20} | результат")
+    for item in checks:
+        print(f"{item['check']:>20} | {'OK' if item['ok'] else 'FAIL'}")
+    print(json.dumps({'seed': args.seed, 'checks': checks}))
+    return 0 if all(item['ok'] for item in checks) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
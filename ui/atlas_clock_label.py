@@ -0,0 +1,143 @@
+from kivy.uix.widget import Widget
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, Rectangle
+from kivy.properties import StringProperty, NumericProperty, ColorProperty
+from logic.clock_functions import NBSP
+
+
+class AtlasClockLabel(Widget):
+    """
+    Часы семисегментным шрифтом, собранные из атласа глифов.
+
+    Цифры 0-9 и двоеточие растеризуются одной строкой в одну текстуру-атлас
+    (только при смене шрифта или размера). Строка времени рисуется прямоугольниками,
+    которые ссылаются на этот атлас: на тике у них меняются только текстурные
+    координаты, поэтому в установившемся режиме новые текстуры не создаются.
+    Пробел на месте двоеточия (NBSP из get_formatted_time) рисуется пустым
+    прямоугольником шириной двоеточия, чтобы цифры не сдвигались.
+
+    Повторяет свойства Label, которые использует главное окно:
+    text, font_name, font_size, color, halign.
+    """
+    GLYPHS = '0123456789:'
+    BLANKS = (NBSP, ' ')
+
+    text = StringProperty('')
+    font_name = StringProperty('fonts/DSEG-Classic/DSEG7Classic-Bold.ttf')
+    font_size = NumericProperty('15sp')
+    color = ColorProperty([1, 1, 1, 1])
+    halign = StringProperty('center')
+
+    def __init__(self, **kwargs):
+        self._atlas = None
+        self._glyphs = {}  # символ -> (tex_coords, ширина)
+        self._glyph_height = 0
+        self._rects = []
+        self._layout_key = None
+        # Счётчик пересборок атласа для отладки (в установившемся режиме не растёт)
+        self.atlas_builds = 0
+        super().__init__(**kwargs)
+
+        with self.canvas:
+            self._color_instruction = Color(rgba=self.color)
+
+        self.bind(
+            font_name=self._rebuild_atlas,
+            font_size=self._rebuild_atlas,
+            text=self._update_glyphs,
+            pos=self._relayout,
+            size=self._relayout,
+            halign=self._relayout,
+            color=self._update_color,
+        )
+        self._rebuild_atlas()
+
+    def _update_color(self, *args):
+        self._color_instruction.rgba = self.color
+
+    def _rebuild_atlas(self, *args):
+        """Растеризует все глифы одной строкой и запоминает их области в атласе"""
+        core = CoreLabel(text=self.GLYPHS, font_name=self.font_name, font_size=self.font_size)
+        core.refresh()
+        atlas = core.texture
+        if atlas is None:
+            return
+        total_width = core.get_extents(self.GLYPHS)[0] or atlas.width
+        scale = atlas.width / float(total_width)
+        height = atlas.height
+
+        glyphs = {}
+        left = 0
+        for index, char in enumerate(self.GLYPHS):
+            right = int(round(core.get_extents(self.GLYPHS[:index + 1])[0] * scale))
+            width = max(1, right - left)
+            glyphs[char] = (tuple(atlas.get_region(left, 0, width, height).tex_coords), width)
+            left = right
+
+        self._atlas = atlas
+        self._glyphs = glyphs
+        self._glyph_height = height
+        self.atlas_builds += 1
+        for rect in self._rects:
+            rect.texture = atlas
+        self._layout_key = None
+        self._update_glyphs()
+
+    def _glyph_width(self, char):
+        if char in self._glyphs:
+            return self._glyphs[char][1]
+        if char in self.BLANKS and ':' in self._glyphs:
+            return self._glyphs[':'][1]
+        return self._glyphs['0'][1] if '0' in self._glyphs else 0
+
+    def _update_glyphs(self, *args):
+        """Меняет текстурные координаты прямоугольников под новый текст"""
+        if self._atlas is None:
+            return
+        text = self.text
+        # Прямоугольники создаются только при изменении длины строки
+        while len(self._rects) < len(text):
+            with self.canvas:
+                self._rects.append(Rectangle(texture=self._atlas, size=(0, 0)))
+        while len(self._rects) > len(text):
+            self.canvas.remove(self._rects.pop())
+
+        layout_key = tuple(self._glyph_width(char) for char in text)
+        if layout_key != self._layout_key:
+            self._layout_key = layout_key
+            self._relayout()
+            return
+
+        for rect, char in zip(self._rects, text):
+            glyph = self._glyphs.get(char)
+            if glyph is not None:
+                rect.tex_coords = glyph[0]
+                rect.size = (glyph[1], self._glyph_height)
+            else:
+                # Пробел занимает место, но ничего не рисует
+                rect.size = (rect.size[0], 0)
+
+    def _relayout(self, *args):
+        """Расставляет прямоугольники по ширине глифов"""
+        if self._atlas is None:
+            return
+        widths = [self._glyph_width(char) for char in self.text]
+        total = sum(widths)
+        # center_x/right здесь ещё могут быть старыми (алиасы обновляются после
+        # обработчиков size/pos), поэтому считаем от x, y, width, height
+        if self.halign == 'left':
+            x = self.x
+        elif self.halign == 'right':
+            x = self.x + self.width - total
+        else:
+            x = self.x + (self.width - total) / 2.0
+        # Целые координаты, чтобы глифы не размывались при выборке из атласа
+        x = int(round(x))
+        y = int(round(self.y + (self.height - self._glyph_height) / 2.0))
+        for rect, char, width in zip(self._rects, self.text, widths):
+            glyph = self._glyphs.get(char)
+            if glyph is not None:
+                rect.tex_coords = glyph[0]
+            rect.pos = (x, y)
+            rect.size = (width, self._glyph_height) if glyph is not None else (width, 0)
+            x += width
@@ -2,6 +2,8 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.clock import Clock
 from kivy.properties import BooleanProperty
 from logic.clock_functions import BaseClockLabel
+from logic.timeline_scheduler import timeline_scheduler
+from logic.widget_lifecycle import lifecycle_manager
 
 class ClockWidget(GridLayout):
     colors = {
@@ -24,12 +26,14 @@ class ClockWidget(GridLayout):
         self.clock_widget = BaseClockLabel()
         self.add_widget(self.clock_widget)
         
-        # Запускаем обновление времени
-        Clock.schedule_interval(self.update_time, 0.5)
+        # Запускаем обновление времени по событиям планировщика
+        # (подписка снимается через lifecycle при удалении виджета)
+        self.lifecycle = lifecycle_manager.for_widget(self)
+        self.lifecycle.listen(timeline_scheduler.subscribe, timeline_scheduler.unsubscribe, 'colon', self.update_time)
 
-    def update_time(self, dt):
+    def update_time(self, *args):
         """Обновляем время и мигание двоеточия"""
-        self.clock_widget.toggle_colon_visibility()
+        self.clock_widget.set_colon_visibility(timeline_scheduler.colon_visible())
 
     def update_color(self, color_name):
         """Обновляем цвет часов"""
@@ -40,3 +44,8 @@ class ClockWidget(GridLayout):
     def bind_on_clock_widget_created(self, callback):
         """Вызываем коллбэк с виджетом часов"""
         callback(self.clock_widget)
+
+    def on_parent(self, widget, parent):
+        # Отписываемся от планировщика при удалении виджета
+        if parent is None:
+            lifecycle_manager.dispose(self)
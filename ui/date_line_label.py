@@ -0,0 +1,114 @@
+import weakref
+from datetime import date
+from kivy.uix.widget import Widget
+from kivy.core.text.markup import MarkupLabel
+from kivy.graphics import Color, Rectangle
+from kivy.properties import NumericProperty, ColorProperty, ObjectProperty
+from logic.lru_cache import DateLRUCache
+
+
+class DateLineLabel(Widget):
+    """
+    Строка даты (несколько шрифтов через разметку), отрисованная в текстуру один раз.
+
+    Разметка [size][font] - один из самых медленных путей Label, поэтому текст
+    раскладывается и растеризуется только при промахе кэша: текстура хранится
+    по ключу (дата, размер шрифта, цвет) в общем LRU-кэше на несколько записей.
+    До полуночи и до изменения размера виджет просто рисует готовую текстуру;
+    после смены даты или размера старые текстуры вытесняются из кэша.
+
+    markup_provider(font_size, day=None) возвращает текст с разметкой для заданного
+    размера и даты (None - сегодня). Текстуры следующего дня можно растеризовать
+    заранее (prerender), тогда в полночь refresh_all только подставляет их.
+    """
+    font_size = NumericProperty(15)
+    color = ColorProperty([1, 1, 1, 1])
+    markup_provider = ObjectProperty(None, allownone=True)
+
+    # Общий для всех строк даты кэш текстур
+    cache = DateLRUCache(maxsize=8)
+    # Живые строки даты (для подготовки и смены дня)
+    instances = weakref.WeakSet()
+
+    def __init__(self, **kwargs):
+        self._texture = None
+        # Счётчик растеризаций для отладки (растёт только при промахах кэша)
+        self.renders = 0
+        super().__init__(**kwargs)
+        with self.canvas:
+            Color(1, 1, 1, 1)  # цвет уже в текстуре (как у Label с markup)
+            self._rect = Rectangle(size=(0, 0))
+        self.bind(
+            font_size=self.refresh,
+            color=self.refresh,
+            markup_provider=self.refresh,
+            pos=self._relayout,
+            size=self._relayout,
+        )
+        self.refresh()
+        DateLineLabel.instances.add(self)
+
+    @classmethod
+    def refresh_all(cls):
+        """Обновляет все строки даты (после смены дня)"""
+        for label in list(cls.instances):
+            label.refresh()
+
+    def _cache_key(self, day=None):
+        day = day or date.today()
+        return (day.isoformat(), int(self.font_size), tuple(self.color))
+
+    def prerender(self, day):
+        """
+        Растеризует строку для даты day с текущими размером и цветом и кладёт в кэш
+        Returns:
+            bool: True, если текстура растеризована (а не уже была в кэше)
+        """
+        if self.markup_provider is None:
+            return False
+        key = self._cache_key(day)
+        if self.cache.get(key) is not None:
+            return False
+        texture = self._render(day)
+        if texture is None:
+            return False
+        self.cache.put(key, texture)
+        return True
+
+    def refresh(self, *args):
+        """Берёт текстуру из кэша или растеризует строку заново"""
+        if self.markup_provider is None:
+            return
+        key = self._cache_key()
+        texture = self.cache.get(key)
+        if texture is None:
+            texture = self._render()
+            if texture is None:
+                return
+            self.cache.put(key, texture)
+        if texture is not self._texture:
+            self._texture = texture
+            self._rect.texture = texture
+            self._relayout()
+
+    def _render(self, day=None):
+        label = MarkupLabel(
+            text=self.markup_provider(int(self.font_size), day=day),
+            font_size=int(self.font_size),
+            color=self.color,
+        )
+        label.refresh()
+        self.renders += 1
+        return label.texture
+
+    def _relayout(self, *args):
+        """Центрирует текстуру в виджете (как halign='center', valign='middle')"""
+        texture = self._texture
+        if texture is None:
+            return
+        width, height = texture.size
+        self._rect.size = (width, height)
+        self._rect.pos = (
+            int(round(self.x + (self.width - width) / 2.0)),
+            int(round(self.y + (self.height - height) / 2.0)),
+        )
@@ -1,23 +1,25 @@
-from kivy.uix.label import Label
+from kivy.uix.widget import Widget
 from kivy.uix.gridlayout import GridLayout
 from kivy.core.window import Window
-import locale
 from ui.main_portrait_prayer_times import create_prayer_times_layout, PrayerTimesBox
 from ui.next_prayer_time_box import NextPrayerTimeBox
 from logic.date_formatted import create_gregorian_date_label, create_hijri_date_label, get_formatted_dates
+from logic.font_manager import font_manager
+from ui.static_layer import StaticLayer, StaticSlot
 
 def create_line_label(base_font_size):
-    return Label(
+    # Линия рисуется слоем StaticLayer портретного layout
+    return StaticSlot(
         text='―' * 150,  # Много тире для линии
-        font_name='FontSourceCodePro-Regular',
+        font_name=font_manager.font('FontSourceCodePro-Regular'),
         color=(0.6, 0.5, 0.0, 1),  # Темно-желтый цвет для линий
         height=base_font_size * 0.1, # Фиксированная высота
         size_hint_y=None,  # Нужно для фиксированной высоты
     )
 
 def create_space_label(base_font_size):
-    return Label(
-        text=' ', 
+    # Пустое место: виджет без текста и текстуры
+    return Widget(
         height=base_font_size * 0.02,  # Фиксированная высота
         size_hint_y=None  # Нужно для фиксированной высоты
     )
@@ -32,9 +34,6 @@ def create_portrait_widgets(self, portrait_layout):
     Returns:
         GridLayout: Layout с добавленными виджетами
     """
-    # Устанавливаем локаль для корректного отображения даты
-    locale.setlocale(locale.LC_TIME, 'en_US.UTF-8')
-    
     # Расчет базового размера шрифта
     base_font_size = self.calculate_font_size(scale_factor=0.15)
 
@@ -44,13 +43,16 @@ def create_portrait_widgets(self, portrait_layout):
     # Создаем виджет с временем до следующей молитвы (автообновляется каждую минуту)
     next_time_widget = NextPrayerTimeBox(base_font_size=base_font_size, app=self)
 
+    space_labels = [create_space_label(base_font_size)]
+    line_labels = [create_line_label(base_font_size) for _ in range(3)]
+
     # Добавляем виджеты в layout в нужном порядке
-    portrait_layout.add_widget(create_space_label(base_font_size))  # Пустое пространство
-    portrait_layout.add_widget(create_line_label(base_font_size))   # Линия-разделитель
+    portrait_layout.add_widget(space_labels[0])                     # Пустое пространство
+    portrait_layout.add_widget(line_labels[0])                      # Линия-разделитель
     portrait_layout.add_widget(date_hijri_label)                    # Метка с датой Хиджры
-    portrait_layout.add_widget(create_line_label(base_font_size))   # Линия-разделитель
+    portrait_layout.add_widget(line_labels[1])                      # Линия-разделитель
     portrait_layout.add_widget(next_time_widget)                    # Виджет с временем до следующей молитвы
-    portrait_layout.add_widget(create_line_label(base_font_size))   # Линия-разделитель
+    portrait_layout.add_widget(line_labels[2])                      # Линия-разделитель
     
     # Создаем реактивный layout с временами молитв
     self.prayer_times_box = PrayerTimesBox(base_font_size=base_font_size)
@@ -63,4 +65,39 @@ def create_portrait_widgets(self, portrait_layout):
     # Добавляем виджет в layout
     portrait_layout.add_widget(self.prayer_times_box)
     
+    # Ссылки для масштабирования без пересоздания (rescale_portrait_widgets)
+    portrait_layout.portrait_widgets = {
+        'base_font_size': base_font_size,
+        'space_labels': space_labels,
+        'line_labels': line_labels,
+        'next_time_widget': next_time_widget,
+        'prayer_times_box': self.prayer_times_box,
+    }
+
+    # Линии и названия молитв рисуются одним Fbo, перерисовываемым только при изменении layout
+    portrait_layout.static_layer = StaticLayer(portrait_layout)
+    portrait_layout.static_layer.collect()
+    
     return portrait_layout
+
+def rescale_portrait_widgets(self, portrait_layout):
+    """
+    Масштабирует уже созданные виджеты портретного layout под новый размер окна.
+    Дерево виджетов не пересоздаётся: меняются только высоты и размеры шрифтов.
+    
+    Args:
+        portrait_layout (GridLayout): Layout, созданный create_portrait_widgets
+    """
+    widgets = getattr(portrait_layout, 'portrait_widgets', None)
+    if widgets is None:
+        return
+    base_font_size = self.calculate_font_size(scale_factor=0.15)
+    if base_font_size == widgets['base_font_size']:
+        return
+    widgets['base_font_size'] = base_font_size
+    for label in widgets['space_labels']:
+        label.height = base_font_size * 0.02
+    for label in widgets['line_labels']:
+        label.height = base_font_size * 0.1
+    widgets['next_time_widget'].set_base_font_size(base_font_size)
+    widgets['prayer_times_box'].set_base_font_size(base_font_size)
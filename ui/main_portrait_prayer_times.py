@@ -3,7 +3,10 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.animation import Animation
 from kivy.clock import Clock
 from logic.prayer_times import prayer_times_manager
-from logic.prayer_time_calculator import prayer_time_calculator
+from logic.font_manager import font_manager
+from ui.static_layer import StaticSlot
+from logic.timeline_scheduler import timeline_scheduler
+from logic.widget_lifecycle import lifecycle_manager
 from datetime import datetime
 
 class PrayerTimesBox(GridLayout):
@@ -32,30 +35,44 @@ class PrayerTimesBox(GridLayout):
         self._next_prayer_blink_event = None
         self._is_next_prayer_blinking = False
         
+        # Таймеры и подписки регистрируются в lifecycle и снимаются при удалении виджета
+        self.lifecycle = lifecycle_manager.for_widget(self)
+        self.lifecycle.on_dispose(self._stop_all_animations)
+        
         self._build_layout()
-        prayer_times_manager.add_update_listener(self.refresh_prayer_times)
+        self.lifecycle.listen(
+            prayer_times_manager.add_update_listener,
+            prayer_times_manager.remove_update_listener,
+            self.refresh_prayer_times
+        )
         self.refresh_prayer_times()
         
-        # Запускаем таймер для обновления активной молитвы каждую секунду для более точного отслеживания
-        self._update_event = Clock.schedule_interval(lambda dt: self.refresh_prayer_times(), 1)
+        # Обновляем активную молитву по смене минуты (начала молитв и 15-минутные окна
+        # всегда приходятся на границу минуты)
+        self.lifecycle.listen(
+            timeline_scheduler.subscribe,
+            timeline_scheduler.unsubscribe,
+            'minute', self.refresh_prayer_times
+        )
 
     def _build_layout(self):
         prayer_times_data = prayer_times_manager.get_prayer_times()
         for prayer_name, api_key in self.prayer_mapping.items():
-            prayer_name_label = Label(
+            # Название не меняется: его рисует StaticLayer портретного layout,
+            # здесь остаются только цвет и прозрачность
+            prayer_name_label = StaticSlot(
                 text=prayer_name,
-                font_name='FontSourceCodePro-Regular',
+                font_name=font_manager.font('FontSourceCodePro-Regular'),
                 font_size=self.base_font_size * 0.4,
                 color=(0.6, 0.5, 0.0, 1),  # Темно-желтый для текста молитв
                 halign='left',
-                text_size=(self.width * 0.6, None),
+                tinted=True,  # цвет и прозрачность анимируются
                 size_hint_x=0.75
             )
-            prayer_name_label.bind(size=prayer_name_label.setter('text_size'))
             prayer_time = prayer_times_data.get(api_key, '00:00')
             prayer_time_label = Label(
                 text=prayer_time,
-                font_name='FontDSEG7-Bold',
+                font_name=font_manager.font('FontDSEG7-Bold'),
                 font_size=self.base_font_size * 0.45,
                 color=(0.6, 0.5, 0.0, 1),  # Темно-желтый для текста молитв
                 halign='right',
@@ -70,21 +87,17 @@ class PrayerTimesBox(GridLayout):
                 'name_label': prayer_name_label
             }
 
-    def _is_within_15_minutes_before_prayer(self, prayer_time, current_time):
-        """Проверяет, осталось ли до времени намаза 15 минут или меньше"""
-        if not prayer_time or not current_time:
-            return False
-            
-        # Преобразуем время в datetime для удобства вычислений
-        prayer_dt = datetime.combine(datetime.today(), prayer_time)
-        current_dt = datetime.combine(datetime.today(), current_time)
-        
-        # Вычисляем разницу во времени
-        time_diff = (prayer_dt - current_dt).total_seconds()
-        
-        # Возвращаем True, если до намаза осталось от 0 до 15 минут
-        return 0 <= time_diff <= 900  # 900 секунд = 15 минут
-    
+    def set_base_font_size(self, base_font_size):
+        """Масштабирует существующие Label-ы под новый базовый размер без пересоздания"""
+        if base_font_size == self.base_font_size:
+            return
+        self.base_font_size = base_font_size
+        self.height = base_font_size * 4.0
+        self.padding = (base_font_size * 0.15, 0)
+        for labels in self.prayer_labels.values():
+            labels['name_label'].font_size = base_font_size * 0.4
+            labels['time_label'].font_size = base_font_size * 0.45
+
     def _start_next_prayer_blink(self, next_prayer_key):
         """Запускает анимацию мигания для следующего намаза"""
         if self._is_next_prayer_blinking:
@@ -133,58 +146,26 @@ class PrayerTimesBox(GridLayout):
         labels['name_label'].opacity = new_opacity
         
         # Запускаем следующее обновление через 0.5 секунды
-        self._next_prayer_blink_event = Clock.schedule_once(
+        self._next_prayer_blink_event = self.lifecycle.schedule_once(
             self._update_next_prayer_blink, 0.5
         )
     
     def refresh_prayer_times(self):
-        prayer_times_data = prayer_times_manager.get_prayer_times()
-        current_time = datetime.now().time()
-        
-        # Получаем текущую активную молитву
-        current_prayer = None
-        prayer_times_list = []
-        
-        # Собираем все времена молитв и сортируем их
-        for api_key, time_str in prayer_times_data.items():
-            if api_key in self.prayer_mapping.values():
-                try:
-                    prayer_time = datetime.strptime(time_str, '%H:%M').time()
-                    prayer_times_list.append((api_key, prayer_time))
-                except (ValueError, TypeError):
-                    continue
-        
-        # Сортируем времена молитв
-        prayer_times_list.sort(key=lambda x: x[1])
-        
-        # Находим текущую активную молитву (последняя молитва, время которой прошло)
-        # и следующую молитву
-        current_prayer = None
-        next_prayer = None
-        next_prayer_time = None
-        
-        for i, (api_key, prayer_time) in enumerate(prayer_times_list):
-            if prayer_time > current_time:
-                next_prayer = api_key
-                next_prayer_time = prayer_time
-                break
-            current_prayer = api_key
-        
-        # Если текущее время позже последней молитвы, то активной считается последняя молитва дня,
-        # а следующей - первая молитва следующего дня
-        if current_prayer is None and prayer_times_list:
-            current_prayer = prayer_times_list[-1][0]
-        if next_prayer is None and prayer_times_list:
-            next_prayer = prayer_times_list[0][0]
-            next_prayer_time = prayer_times_list[0][1]
-        
-        # Проверяем, нужно ли запускать мигание для следующей молитвы
-        if next_prayer_time and next_prayer:
-            if self._is_within_15_minutes_before_prayer(next_prayer_time, current_time):
-                if not self._is_next_prayer_blinking or getattr(self, '_next_prayer_key', None) != next_prayer:
-                    self._start_next_prayer_blink(next_prayer)
-            else:
-                self._stop_next_prayer_blink()
+        # Общее расписание на день (строится один раз, поиск через bisect)
+        schedule = prayer_times_manager.get_daily_schedule()
+        prayer_times_data = schedule.times
+        now = datetime.now()
+        
+        # Текущая активная молитва (последняя наступившая) и следующая,
+        # после последней молитвы дня следующая - первая молитва завтра
+        current_prayer = schedule.current(now)
+        upcoming = schedule.next(now)
+        next_prayer = upcoming.key if upcoming else None
+        
+        # Проверяем, нужно ли запускать мигание для следующей молитвы (15 минут = 900 секунд)
+        if next_prayer and schedule.is_before_next(900, now):
+            if not self._is_next_prayer_blinking or getattr(self, '_next_prayer_key', None) != next_prayer:
+                self._start_next_prayer_blink(next_prayer)
         else:
             self._stop_next_prayer_blink()
         
@@ -213,11 +194,18 @@ class PrayerTimesBox(GridLayout):
 
     def on_parent(self, widget, parent):
         # Автоматическая отписка при удалении с экрана
+        # (при удалении родителя ресурсы освобождает lifecycle_manager.detach)
         if parent is None:
-            prayer_times_manager.remove_update_listener(self.refresh_prayer_times)
-            if hasattr(self, '_update_event') and self._update_event:
-                self._update_event.cancel()
-            self.stop_animation()
+            lifecycle_manager.dispose(self)
+
+    def _stop_all_animations(self):
+        """Останавливает анимации перед освобождением виджета"""
+        self._stop_next_prayer_blink()
+        if self._is_animating:
+            self._is_animating = False
+            for labels in self.prayer_labels.values():
+                Animation.cancel_all(labels['time_label'])
+                Animation.cancel_all(labels['name_label'])
             
     def start_animation(self):
         """Запускаем анимацию: делаем все молитвы прозрачными, кроме текущей"""
@@ -249,7 +237,7 @@ class PrayerTimesBox(GridLayout):
         self._update_animation()
         
         # Останавливаем анимацию через 60 секунд
-        self._animation_event = Clock.schedule_once(self.stop_animation, 60)
+        self._animation_event = self.lifecycle.schedule_once(self.stop_animation, 60)
     
     def stop_animation(self, *args):
         """Останавливаем анимацию и обновляем цвета в соответствии с текущим временем"""
@@ -282,34 +270,7 @@ class PrayerTimesBox(GridLayout):
     
     def _get_current_prayer(self):
         """Возвращает ключ текущей активной молитвы"""
-        prayer_times_data = prayer_times_manager.get_prayer_times()
-        current_time = datetime.now().time()
-        
-        # Собираем все времена молитв и сортируем их
-        prayer_times_list = []
-        for api_key, time_str in prayer_times_data.items():
-            if api_key in self.prayer_mapping.values():
-                try:
-                    prayer_time = datetime.strptime(time_str, '%H:%M').time()
-                    prayer_times_list.append((api_key, prayer_time))
-                except (ValueError, TypeError):
-                    continue
-        
-        # Сортируем времена молитв
-        prayer_times_list.sort(key=lambda x: x[1])
-        
-        # Находим текущую активную молитву (последняя молитва, время которой прошло)
-        current_prayer = None
-        for api_key, prayer_time in prayer_times_list:
-            if prayer_time > current_time:
-                break
-            current_prayer = api_key
-        
-        # Если текущее время позже последней молитвы, то активной считается последняя молитва дня
-        if current_prayer is None and prayer_times_list:
-            current_prayer = prayer_times_list[-1][0]
-            
-        return current_prayer
+        return prayer_times_manager.get_daily_schedule().current()
     
     def _update_animation(self):
         """Обновляет анимацию мигания активной молитвы"""
@@ -335,7 +296,7 @@ class PrayerTimesBox(GridLayout):
         anim.start(labels['name_label'])
         
         # Запускаем следующее обновление через 1.5 секунды (длительность полного цикла)
-        Clock.schedule_once(lambda dt: self._update_animation(), 1.5)
+        self.lifecycle.schedule_once(lambda dt: self._update_animation(), 1.5)
 
 def create_prayer_times_layout(self, base_font_size):
     """Создает layout для отображения времён молитв"""
@@ -370,7 +331,7 @@ def create_prayer_times_layout(self, base_font_size):
         # Label для названия молитвы
         prayer_name_label = Label(
             text=prayer_name,
-            font_name='FontSourceCodePro-Regular',
+            font_name=font_manager.font('FontSourceCodePro-Regular'),
             font_size=base_font_size * 0.4,  # Маленький размер
             color=(0.6, 0.5, 0.0, 1),  # Темно-желтый для текста молитв
             halign='left',
@@ -384,7 +345,7 @@ def create_prayer_times_layout(self, base_font_size):
         
         prayer_time_label = Label(
             text=prayer_time,
-            font_name='FontDSEG7-Bold',
+            font_name=font_manager.font('FontDSEG7-Bold'),
             font_size=base_font_size * 0.45,  # Большой размер шрифта
             color=(0.6, 0.5, 0.0, 1),  # Темно-желтый для текста молитв
             halign='right',
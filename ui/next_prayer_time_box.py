@@ -8,7 +8,9 @@ from kivy.animation import Animation
 from datetime import datetime, timedelta
 from kivy.core.text import LabelBase
 from logic.prayer_times import prayer_times_manager
-from logic.prayer_time_calculator import prayer_time_calculator
+from logic.font_manager import font_manager
+from logic.timeline_scheduler import timeline_scheduler
+from logic.widget_lifecycle import lifecycle_manager
 
 class NextPrayerTimeBox(GridLayout):
     """
@@ -34,11 +36,13 @@ class NextPrayerTimeBox(GridLayout):
         self.height = base_font_size * 0.7  # Увеличили высоту контейнера
         self.padding = [0, base_font_size * 0, 0, base_font_size * 0]  # Добавили отступы сверху и снизу
         
+        # Таймеры и подписки регистрируются в lifecycle и снимаются при удалении виджета
+        self.lifecycle = lifecycle_manager.for_widget(self)
+        self._stop_event = None
+        
         # Для анимации мигания времени следующего намаза
         self._is_time_blinking = False
-        self._blink_event = None
-        self._blink_opacity = 1.0
-        self._blink_direction = -1  # Направление изменения прозрачности
+        self._blink_anim = None
         
         # Цвета для анимации иконок
         self.normal_icon_color = (0.6, 0.5, 0.0, 1)  # Темно-желтый
@@ -57,7 +61,7 @@ class NextPrayerTimeBox(GridLayout):
         
         self.time_label = Label(
             text='00:00',
-            font_name='FontDSEG7-Bold',
+            font_name=font_manager.font('FontDSEG7-Bold'),
             font_size=base_font_size * 0.55,
             color=(1, 0, 0, 1),  # Красный для времени следующей молитвы
             halign='center',
@@ -76,16 +80,23 @@ class NextPrayerTimeBox(GridLayout):
         self.add_widget(self.time_label)
         self.add_widget(self.prayer_icon_right)
         
-        # Запускаем обновление каждую минуту
-        self._update_event = None
-        
         # Немедленное обновление времени при создании виджета
         self.update_time()
         
-    def on_kv_post(self, *args):
-        # Запускаем таймер после инициализации виджета в дереве
-        self._update_event = Clock.schedule_interval(lambda dt: self.update_time(), 5)  # Обновляем каждую секунду
+        # Дальше обновляемся по смене минуты (остаток до молитвы меняется только на границе минуты)
+        self.lifecycle.listen(timeline_scheduler.subscribe, timeline_scheduler.unsubscribe, 'minute', self.update_time)
+        self.lifecycle.on_dispose(self._stop_all_animations)
         
+    def set_base_font_size(self, base_font_size):
+        """Масштабирует виджет под новый базовый размер без пересоздания"""
+        if base_font_size == self.base_font_size:
+            return
+        self.base_font_size = base_font_size
+        self.height = base_font_size * 0.7
+        self.prayer_icon_left.font_size = base_font_size * 0.5
+        self.time_label.font_size = base_font_size * 0.55
+        self.prayer_icon_right.font_size = base_font_size * 0.5
+
     def animate_icons(self, *args):
         """Анимация изменения цвета иконок"""
         print("[DEBUG] Запуск анимации иконок")
@@ -125,7 +136,7 @@ class NextPrayerTimeBox(GridLayout):
         # Запускаем анимации
         print("[DEBUG] Запуск анимаций иконок")
         self._anim_left.start(self.prayer_icon_left)
-        Clock.schedule_once(lambda dt: self._anim_right.start(self.prayer_icon_right), 0.25)
+        self.lifecycle.schedule_once(lambda dt: self._anim_right.start(self.prayer_icon_right), 0.25)
         
         # Запускаем анимацию часов, если доступно приложение
         if self.app and hasattr(self.app, 'start_clock_animation'):
@@ -142,7 +153,7 @@ class NextPrayerTimeBox(GridLayout):
         
         # Останавливаем анимацию через 1 минуту
         print("[DEBUG] Планируем остановку анимации через 60 секунд")
-        Clock.schedule_once(self.stop_animation, 60)
+        self._stop_event = self.lifecycle.schedule_once(self.stop_animation, 60)
     
     def stop_animation(self, *args):
         """Останавливаем анимацию иконок"""
@@ -186,26 +197,6 @@ class NextPrayerTimeBox(GridLayout):
         # Останавливаем мигание времени, если оно активно
         self._stop_time_blink()
     
-    def _update_time_blink(self, dt):
-        """Обновление анимации мигания времени следующего намаза"""
-        if not self._is_time_blinking:
-            return
-            
-        # Изменяем прозрачность
-        self._blink_opacity += self._blink_direction * 0.1
-        
-        # Меняем направление, если достигли границ
-        if self._blink_opacity <= 0.3:
-            self._blink_opacity = 0.3
-            self._blink_direction = 1
-        elif self._blink_opacity >= 1.0:
-            self._blink_opacity = 1.0
-            self._blink_direction = -1
-            
-        # Применяем прозрачность к метке времени
-        if hasattr(self, 'time_label'):
-            self.time_label.opacity = self._blink_opacity
-    
     def _start_time_blink(self):
         """Запуск анимации мигания времени следующего намаза"""
         if self._is_time_blinking:
@@ -213,11 +204,12 @@ class NextPrayerTimeBox(GridLayout):
             
         print("[DEBUG] Запуск мигания времени следующего намаза")
         self._is_time_blinking = True
-        self._blink_opacity = 1.0
-        self._blink_direction = -1
         
-        # Запускаем обновление анимации каждые 100 мс
-        self._blink_event = Clock.schedule_interval(self._update_time_blink, 0.1)
+        # Плавное мигание между 1.0 и 0.3 (как у иконок) без отдельного таймера-опроса
+        self.time_label.opacity = 1.0
+        self._blink_anim = Animation(opacity=0.3, duration=0.7) + Animation(opacity=1.0, duration=0.7)
+        self._blink_anim.repeat = True
+        self._blink_anim.start(self.time_label)
     
     def _stop_time_blink(self):
         """Остановка анимации мигания времени следующего намаза"""
@@ -227,42 +219,15 @@ class NextPrayerTimeBox(GridLayout):
         print("[DEBUG] Остановка мигания времени следующего намаза")
         self._is_time_blinking = False
         
-        # Отменяем запланированное обновление
-        if self._blink_event:
-            self._blink_event.cancel()
-            self._blink_event = None
+        # Останавливаем анимацию мигания
+        if self._blink_anim:
+            self._blink_anim.cancel(self.time_label)
+            self._blink_anim = None
             
         # Восстанавливаем полную видимость
         if hasattr(self, 'time_label'):
             self.time_label.opacity = 1.0
     
-    def _is_within_15_minutes_before_prayer(self, current_time, next_prayer_time_str):
-        """Проверяет, осталось ли до намаза 15 минут или меньше"""
-        try:
-            # Преобразуем строку времени в объект datetime
-            next_prayer_time = datetime.strptime(next_prayer_time_str, '%H:%M').time()
-            
-            # Получаем текущую дату
-            current_date = datetime.now().date()
-            
-            # Создаем объекты datetime для сравнения
-            prayer_dt = datetime.combine(current_date, next_prayer_time)
-            current_dt = datetime.combine(current_date, current_time)
-            
-            # Если время намаза уже прошло сегодня, проверяем на завтра
-            if prayer_dt <= current_dt:
-                prayer_dt = datetime.combine(current_date + timedelta(days=1), next_prayer_time)
-            
-            # Вычисляем разницу во времени
-            time_until = prayer_dt - current_dt
-            
-            # Проверяем, осталось ли до намаза 15 минут или меньше и больше 0 минут
-            return timedelta(seconds=0) < time_until <= timedelta(minutes=15)
-            
-        except Exception as e:
-            print(f"[ERROR] Ошибка при проверке времени до намаза: {e}")
-            return False
-    
     def update_time(self):
         """Обновляет отображаемое время до следующей молитвы"""
         try:
@@ -270,34 +235,14 @@ class NextPrayerTimeBox(GridLayout):
             now = datetime.now()
             current_time = now.time()
             
-            # Получаем времена молитв
-            prayer_times_data = prayer_times_manager.get_prayer_times()
-            
-            # Находим следующую молитву
-            next_prayer_time_str = prayer_time_calculator.get_next_prayer_time(
-                current_time, 
-                prayer_times_data
-            )
+            # Общее расписание на день: следующая молитва и остаток через bisect
+            schedule = prayer_times_manager.get_daily_schedule()
+            upcoming = schedule.next(now)
+            next_prayer_time_str = upcoming.time if upcoming else '00:00'
+            time_until_str = schedule.time_until_next(now)
             
-            # Вычисляем оставшееся время
-            time_until_str = prayer_time_calculator.get_time_until_next_prayer(
-                current_time,
-                next_prayer_time_str
-            )
-            
-            # Проверяем, наступило ли уже время следующего намаза
-            next_prayer_time = datetime.strptime(next_prayer_time_str, '%H:%M').time()
-            current_date = now.date()
-            prayer_dt = datetime.combine(current_date, next_prayer_time)
-            current_dt = datetime.combine(current_date, current_time)
-            
-            # Если время намаза уже наступило, останавливаем мигание
-            if current_dt >= prayer_dt:
-                if self._is_time_blinking:
-                    print(f"[DEBUG] Время намаза {next_prayer_time_str} наступило, останавливаем мигание")
-                    self._stop_time_blink()
-            # Иначе проверяем, нужно ли запускать мигание (осталось 15 минут или меньше)
-            elif self._is_within_15_minutes_before_prayer(current_time, next_prayer_time_str):
+            # Мигание, если до намаза осталось 15 минут или меньше (и время ещё не наступило)
+            if schedule.is_before_next(15 * 60, now):
                 if not self._is_time_blinking:
                     print(f"[DEBUG] До намаза {next_prayer_time_str} осталось 15 минут или меньше, запускаем мигание")
                     self._start_time_blink()
@@ -332,6 +277,17 @@ class NextPrayerTimeBox(GridLayout):
             print(f"[ERROR] Error updating next prayer time: {e}")
     
     def on_parent(self, widget, parent):
-        # Отписываемся от таймера при удалении виджета
-        if parent is None and hasattr(self, '_update_event') and self._update_event:
-            self._update_event.cancel()
+        # Отписываемся от планировщика и таймеров при удалении виджета
+        # (при удалении родителя ресурсы освобождает lifecycle_manager.detach)
+        if parent is None:
+            lifecycle_manager.dispose(self)
+
+    def _stop_all_animations(self):
+        """Останавливает анимации иконок и мигание перед освобождением виджета"""
+        self._stop_time_blink()
+        if self.is_animating:
+            self.is_animating = False
+            if hasattr(self, '_anim_left'):
+                self._anim_left.cancel(self.prayer_icon_left)
+            if hasattr(self, '_anim_right'):
+                self._anim_right.cancel(self.prayer_icon_right)
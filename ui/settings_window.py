@@ -32,6 +32,8 @@ from ui.settings_color import ColorButton
 
 # Импортируем базу данных и утилиты
 from data.database import SettingsDatabase
+from logic.power_mode import PowerModeManager
+from logic.widget_lifecycle import lifecycle_manager
 from logic.display_utils import is_mobile_device
 
 logger = logging.getLogger(__name__)
@@ -169,6 +171,9 @@ class SettingsWindow(ModalView):
         """
         super().__init__(**kwargs)
         
+        # Привязки к Window снимаются при закрытии окна (on_dismiss)
+        self.lifecycle = lifecycle_manager.for_widget(self)
+        
         # Сохраняем начальные значения
         self.db = db
         self.main_window = main_window
@@ -201,6 +206,9 @@ class SettingsWindow(ModalView):
             self.selected_azan_dropdown = 'Azan 1'
         if self.selected_azan_popup not in valid_azans:
             self.selected_azan_popup = 'Azan 1'
+        
+        # Режим энергосбережения
+        self.selected_power_mode = PowerModeManager.normalize(self.db.get_setting('power_mode'))
         self.active_button = None  # Инициализируем как None
         
         # Настройка размеров окна
@@ -289,7 +297,7 @@ class SettingsWindow(ModalView):
             color_title.text_size = (Window.width - dp(40), None)
             color_title.texture_update()
         
-        Window.bind(width=update_color_title_size)
+        self.lifecycle.bind(Window, width=update_color_title_size)
         Clock.schedule_once(update_color_title_size)
         
         # Сетка цветов (в один ряд)
@@ -321,6 +329,53 @@ class SettingsWindow(ModalView):
         color_section.add_widget(color_title)  # Добавляем заголовок
         color_section.add_widget(colors_grid)  # Добавляем сетку цветов
         
+        # Блок выбора режима энергосбережения
+        power_section = GridLayout(
+            cols=1,
+            size_hint_y=None,
+            height=dp(110),  # Такая же высота, как у остальных блоков
+            padding=[dp(20), dp(15), dp(20), dp(20)],
+            spacing=dp(10),
+            size_hint=(1, None)
+        )
+        
+        # Адаптивный заголовок блока режима энергосбережения
+        power_title = Label(
+            text='Enerji rejimi',
+            color=(1, 1, 1, 1),
+            font_size=sp(22),
+            size_hint=(1, None),
+            height=dp(30),
+            halign='left',
+            valign='middle',
+            text_size=(Window.width - dp(40), None),
+            padding=(0, dp(5)),
+            shorten=True,
+            shorten_from='right'
+        )
+        
+        def update_power_title_size(*args):
+            power_title.text_size = (Window.width - dp(40), None)
+            power_title.texture_update()
+        
+        self.lifecycle.bind(Window, width=update_power_title_size)
+        Clock.schedule_once(update_power_title_size)
+        
+        # Выпадающий список режимов
+        self.power_spinner = Spinner(
+            text=PowerModeManager.LABELS[self.selected_power_mode],
+            values=tuple(PowerModeManager.LABELS[mode] for mode in PowerModeManager.MODES),
+            size_hint_y=None,
+            height=dp(40),
+            background_color=(0.3, 0.3, 0.3, 1),
+            color=(1, 1, 1, 1),
+            font_size=sp(18)
+        )
+        self.power_spinner.bind(text=self.on_power_mode_selected)
+        
+        power_section.add_widget(power_title)
+        power_section.add_widget(self.power_spinner)
+        
         # Блок выбора азана
         azan_section = GridLayout(
             cols=1,
@@ -350,7 +405,7 @@ class SettingsWindow(ModalView):
             azan_title.text_size = (Window.width - dp(40), None)
             azan_title.texture_update()
         
-        Window.bind(width=update_azan_title_size)
+        self.lifecycle.bind(Window, width=update_azan_title_size)
         Clock.schedule_once(update_azan_title_size)
         
         # Выпадающий список для выбора азана
@@ -400,7 +455,7 @@ class SettingsWindow(ModalView):
             dropdown_title.text_size = (Window.width - dp(40), None)
             dropdown_title.texture_update()
         
-        Window.bind(width=update_dropdown_title_size)
+        self.lifecycle.bind(Window, width=update_dropdown_title_size)
         Clock.schedule_once(update_dropdown_title_size)
         
         # Кнопка для вызова DropDown
@@ -462,7 +517,7 @@ class SettingsWindow(ModalView):
             popup_title.text_size = (Window.width - dp(40), None)
             popup_title.texture_update()
         
-        Window.bind(width=update_popup_title_size)
+        self.lifecycle.bind(Window, width=update_popup_title_size)
         Clock.schedule_once(update_popup_title_size)
         
         # Кнопка для вызова Popup
@@ -482,6 +537,7 @@ class SettingsWindow(ModalView):
         
         # Инициализируем ссылки на виджеты для доступа из других методов
         self.color_section = color_section
+        self.power_section = power_section
         self.azan_section = azan_section
         self.dropdown_section = dropdown_section
         self.popup_section = popup_section
@@ -492,6 +548,8 @@ class SettingsWindow(ModalView):
         # Добавляем блоки с отступами
         content_container.add_widget(color_section)
         content_container.add_widget(Widget(size_hint_y=None, height=dp(10)))  # Разделитель
+        content_container.add_widget(power_section)
+        content_container.add_widget(Widget(size_hint_y=None, height=dp(10)))  # Разделитель
         content_container.add_widget(azan_section)
         content_container.add_widget(Widget(size_hint_y=None, height=dp(10)))  # Разделитель
         content_container.add_widget(dropdown_section)
@@ -629,6 +687,10 @@ class SettingsWindow(ModalView):
         except Exception as e:
             logger.error(f"Error in _on_color_button_press: {e}")
 
+    def on_power_mode_selected(self, spinner, text):
+        """Обработчик выбора режима энергосбережения"""
+        self.selected_power_mode = PowerModeManager.mode_from_label(text)
+
     def on_azan_selected(self, spinner, text):
         """Обработчик выбора азана в Spinner"""
         self.selected_azan_spinner = text
@@ -929,18 +991,12 @@ class SettingsWindow(ModalView):
             tomorrow_str = tomorrow.strftime(date_format)
             
             # Получаем данные из базы для сегодня и завтра
-            cursor = prayer_times_manager.db.connection.cursor()
-            cursor.execute('''
+            # Вместе со строками получаем заголовки колонок
+            columns, rows = prayer_times_manager.db.fetchall('''
                 SELECT * FROM prayer_times 
                 WHERE date = ? OR date = ?
                 ORDER BY date ASC
-            ''', (today_str, tomorrow_str))
-            
-            # Получаем строки с данными
-            rows = cursor.fetchall()
-            
-            # Получаем заголовки колонок
-            columns = [desc[0] for desc in cursor.description]
+            ''', (today_str, tomorrow_str), with_columns=True)
             
             # Пропускаем служебные поля
             skip_columns = {'date', 'created_at'}
@@ -1012,6 +1068,12 @@ class SettingsWindow(ModalView):
             if hasattr(self, 'selected_azan_popup'):
                 self.db.save_setting('azan_popup', self.selected_azan_popup)
             
+            # Сохраняем и применяем режим энергосбережения
+            if hasattr(self, 'selected_power_mode'):
+                self.db.save_setting('power_mode', self.selected_power_mode)
+                if hasattr(self.main_window, 'apply_power_mode'):
+                    self.main_window.apply_power_mode(self.selected_power_mode)
+            
             # Выводим обновленные настройки после сохранения
             self.print_sizes(show_before_save=False)
             
@@ -1096,6 +1158,10 @@ class SettingsWindow(ModalView):
         # Вызываем оригинальный метод закрытия
         super().dismiss(*args)
     
+    def on_dismiss(self):
+        """Снимает привязки окна настроек к Window"""
+        lifecycle_manager.dispose(self)
+    
     @staticmethod
     def get_color_tuple(color_name):
         """Преобразование названия цвета в RGB"""
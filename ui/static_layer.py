@@ -0,0 +1,242 @@
+from kivy.uix.widget import Widget
+from kivy.clock import Clock
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Fbo, ClearColor, ClearBuffers, Color, Rectangle, InstructionGroup
+from kivy.properties import StringProperty, NumericProperty, ColorProperty, BooleanProperty
+
+# Зазор между областями полосы анимируемых слотов (без подмешивания соседних пикселей)
+STRIP_GAP = 1
+
+
+def _sub_coords(tex_coords, fx0, fy0, fx1, fy1):
+    """
+    Текстурные координаты части прямоугольника (доли от 0 до 1 по ширине и высоте),
+    с учётом переворота текстуры
+    """
+    u_bl, v_bl, u_br, v_br, u_tr, v_tr, u_tl, v_tl = tex_coords
+    u0 = u_bl + (u_br - u_bl) * fx0
+    u1 = u_bl + (u_br - u_bl) * fx1
+    v0 = v_bl + (v_tl - v_bl) * fy0
+    v1 = v_bl + (v_tl - v_bl) * fy1
+    return (u0, v0, u1, v0, u1, v1, u0, v1)
+
+
+class StaticSlot(Widget):
+    """
+    Место под неизменяемый текст (линия-разделитель, название молитвы).
+    Сам ничего не рисует: текст рисует StaticLayer корневого layout.
+    tinted=True - цвет и opacity слота анимируются: слой рисует его отдельной
+    областью с собственным цветом, и смена цвета не требует перерисовки слоя.
+    """
+    text = StringProperty('')
+    font_name = StringProperty('Roboto')
+    font_size = NumericProperty('15sp')
+    color = ColorProperty([1, 1, 1, 1])
+    halign = StringProperty('center')
+    tinted = BooleanProperty(False)
+
+
+class StaticLayer:
+    """
+    Слой неизменяемых элементов layout в одной текстуре.
+
+    Тексты всех StaticSlot внутри root растеризуются в одно постоянное Fbo, после
+    отрисовки (fbo.draw) текстуры отдельных надписей освобождаются. Fbo состоит из двух частей:
+    - верхняя, размером с root: все слоты без анимации, уже в своём цвете -
+      на экран выводится одним прямоугольником
+    - нижняя полоса: слоты с tinted=True, растеризованные белым и упакованные
+      по строкам - каждый выводится своим прямоугольником с цветом слота
+    Каждый слот обрезается по своим границам. Перерисовка - только при изменении
+    раскладки, текста, шрифта или цвета неанимируемых слотов; при сдвиге root
+    прямоугольники только переносятся, Fbo пересоздаётся только при смене размера.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.slots = []
+        self._fbo = None
+        self._signature = None
+        self._places = []  # (Rectangle, смещение от root)
+        self._tints = {}  # слот -> Color
+        self._group = InstructionGroup()
+        root.canvas.after.add(self._group)
+        self._render_trigger = Clock.create_trigger(self.render)
+        root.bind(pos=self._render_trigger, size=self._render_trigger)
+        # Счётчик перерисовок Fbo для отладки (растёт только при изменении layout)
+        self.renders = 0
+
+    def collect(self):
+        """Регистрирует все StaticSlot внутри root"""
+        for widget in self.root.walk(restrict=True):
+            if isinstance(widget, StaticSlot) and widget not in self.slots:
+                self.slots.append(widget)
+                widget.bind(
+                    pos=self._render_trigger,
+                    size=self._render_trigger,
+                    text=self._render_trigger,
+                    font_name=self._render_trigger,
+                    font_size=self._render_trigger,
+                    halign=self._render_trigger,
+                    tinted=self._render_trigger,
+                    color=self._on_color,
+                    opacity=self._on_color,
+                )
+        self._render_trigger()
+
+    @staticmethod
+    def _tint(slot):
+        r, g, b, a = slot.color
+        return (r, g, b, a * slot.opacity)
+
+    def _on_color(self, slot, *args):
+        tint = self._tints.get(slot)
+        if tint is not None:
+            tint.rgba = self._tint(slot)
+        elif not slot.tinted:
+            # Цвет неанимируемого слота запечён в текстуру
+            self._render_trigger()
+
+    def _slot_signature(self, slot):
+        root = self.root
+        return (
+            # В пикселях: сдвиг root даёт погрешность в дробной части координат
+            id(slot), round(slot.x - root.x), round(slot.y - root.y), round(slot.width), round(slot.height),
+            slot.text, slot.font_name, slot.font_size, slot.halign, slot.tinted,
+            None if slot.tinted else self._tint(slot),
+        )
+
+    def _rasterize(self, slot, width, height):
+        """
+        Растеризует текст слота и обрезает его по границам слота и root
+        Returns:
+            (texture, tex_coords, x, y, w, h) - видимая часть относительно root, или None
+        """
+        core = CoreLabel(
+            text=slot.text,
+            font_name=slot.font_name,
+            font_size=slot.font_size,
+            halign=slot.halign,
+            color=(1, 1, 1, 1) if slot.tinted else self._tint(slot),
+            text_size=(slot.width, None) if slot.halign != 'center' else (None, None),
+        )
+        core.refresh()
+        texture = core.texture
+        if texture is None or not texture.width or not texture.height:
+            return None
+        # Как у Label: текстура по центру виджета
+        slot_x, slot_y = slot.x - self.root.x, slot.y - self.root.y
+        x = int(slot_x + (slot.width - texture.width) / 2.0)
+        y = int(slot_y + (slot.height - texture.height) / 2.0)
+        left = max(x, int(slot_x), 0)
+        bottom = max(y, int(slot_y), 0)
+        right = min(x + texture.width, int(slot_x + slot.width), width)
+        top = min(y + texture.height, int(slot_y + slot.height), height)
+        if right <= left or top <= bottom:
+            return None
+        coords = _sub_coords(
+            texture.tex_coords,
+            (left - x) / texture.width, (bottom - y) / texture.height,
+            (right - x) / texture.width, (top - y) / texture.height,
+        )
+        return texture, coords, left, bottom, right - left, top - bottom
+
+    def _ensure_fbo(self, size):
+        if self._fbo is None:
+            self._fbo = Fbo(size=size)
+            # После потери GL-контекста содержимое Fbo нужно нарисовать заново
+            self._fbo.add_reload_observer(self._on_reload)
+        elif tuple(self._fbo.size) != size:
+            self._fbo.size = size
+        return self._fbo
+
+    def _on_reload(self, *args):
+        self._signature = None
+        self._render_trigger()
+
+    def render(self, *args):
+        """Растеризует слоты в Fbo (если раскладка изменилась) и выводит его"""
+        root = self.root
+        width, height = int(root.width), int(root.height)
+        if width <= 0 or height <= 0:
+            return
+        slots = [slot for slot in self.slots if slot.text.strip() and slot.parent is not None]
+        signature = (width, height, tuple(self._slot_signature(slot) for slot in slots))
+        if signature == self._signature:
+            self._place()
+            return
+
+        static, tinted = [], []
+        for slot in slots:
+            part = self._rasterize(slot, width, height)
+            if part is not None:
+                (tinted if slot.tinted else static).append((slot, part))
+
+        # Полоса анимируемых слотов: упаковка по строкам шириной root
+        packed = []
+        cursor_x = cursor_y = shelf = 0
+        for slot, part in tinted:
+            w, h = part[4], part[5]
+            if cursor_x and cursor_x + w > width:
+                cursor_x, cursor_y, shelf = 0, cursor_y + shelf + STRIP_GAP, 0
+            packed.append((slot, part, cursor_x, cursor_y))
+            cursor_x += w + STRIP_GAP
+            shelf = max(shelf, h)
+        strip = cursor_y + shelf + STRIP_GAP if packed else 0
+
+        fbo = self._ensure_fbo((width, height + strip))
+        fbo.clear()
+        with fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+            Color(1, 1, 1, 1)
+            for slot, (texture, coords, x, y, w, h) in static:
+                Rectangle(texture=texture, tex_coords=coords, pos=(x, strip + y), size=(w, h))
+            for slot, (texture, coords, x, y, w, h), sx, sy in packed:
+                Rectangle(texture=texture, tex_coords=coords, pos=(sx, sy), size=(w, h))
+        fbo.draw()
+        # Текстуры надписей больше не нужны - их пиксели уже в Fbo
+        fbo.clear()
+
+        full_height = float(height + strip)
+        self._group.clear()
+        self._tints = {}
+        self._places = []
+        if static:
+            self._group.add(Color(1, 1, 1, 1))
+            rect = Rectangle(
+                texture=fbo.texture, size=(width, height),
+                tex_coords=_sub_coords(fbo.texture.tex_coords, 0, strip / full_height, 1, 1),
+            )
+            self._group.add(rect)
+            self._places.append((rect, (0, 0)))
+        for slot, (texture, coords, x, y, w, h), sx, sy in packed:
+            tint = Color(rgba=self._tint(slot))
+            self._tints[slot] = tint
+            self._group.add(tint)
+            rect = Rectangle(
+                texture=fbo.texture, size=(w, h),
+                tex_coords=_sub_coords(
+                    fbo.texture.tex_coords,
+                    sx / float(width), sy / full_height,
+                    (sx + w) / float(width), (sy + h) / full_height,
+                ),
+            )
+            self._group.add(rect)
+            self._places.append((rect, (x, y)))
+        self._signature = signature
+        self._place()
+        self.renders += 1
+
+    def _place(self):
+        """Переносит прямоугольники слоя к текущему положению root"""
+        root_x, root_y = self.root.pos
+        for rect, (x, y) in self._places:
+            rect.pos = (root_x + x, root_y + y)
+
+    def stats(self):
+        """Число слотов, прямоугольников на экране, текстур и перерисовок Fbo"""
+        return {
+            'slots': len(self.slots),
+            'rects': len(self._places),
+            'textures': 1 if self._fbo is not None else 0,
+            'renders': self.renders,
+        }